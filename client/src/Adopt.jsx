@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
+import fetchAllPages from "./fetchAllPages";
 
 const Adopt = () => {
     const navigate = useNavigate();
@@ -7,9 +8,8 @@ const Adopt = () => {
     const [adoptableDogs, setAdoptableDogs] = useState([]);
 
     useEffect(() => {
-		fetch("/api/adopt")
-		.then((response) => response.json())
-        .then((data) => setAdoptableDogs([...data]));
+		// Follow the server's pagination cursor until every adoptable dog is loaded.
+		return fetchAllPages("/api/adopt", (data) => setAdoptableDogs([...data]));
 	}, []);
 
     return (
@@ -19,9 +19,16 @@ const Adopt = () => {
             </div>
             <div>
                 <h3>Currently Adoptable Dogs:</h3>
+                <div className={"adoptableDogGrid"}>
                 {
-                    adoptableDogs.map((adoptableDog) => <div><button>{adoptableDog.name} ({adoptableDog.breed})</button></div>)
+                    adoptableDogs.map((adoptableDog) => (
+                        <div key={adoptableDog.id}>
+                            {adoptableDog.thumbnail_url && <img className={"adoptableDogThumbnail"} src={adoptableDog.thumbnail_url} alt={adoptableDog.name} width={160} height={160} loading="lazy" />}
+                            <button>{adoptableDog.name} ({adoptableDog.breed})</button>
+                        </div>
+                    ))
                 }
+                </div>
             </div>
             <div className={"buttonContainer"}>
                 <input className={"inputButton"} type="button" onClick={() => navigate("/")} value="HOME" />
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
+import fetchAllPages from "./fetchAllPages";
 
 const Dashboard = () => {
     const navigate = useNavigate();
@@ -9,9 +10,8 @@ const Dashboard = () => {
     const [currentDogBreedForNewEntry, setCurrentDogBreedForNewEntry] = useState("");
 
     useEffect(() => {
-		fetch("/api/dogs")
-		.then((response) => response.json())
-        .then((data) => setAllDogs([...data]));
+		// Follow the server's pagination cursor until every dog is loaded.
+		return fetchAllPages("/api/dogs", (data) => setAllDogs([...data]));
 	}, []);
 
     const renderAdoptabilityStatus = (eachDog) => {
@@ -0,0 +1,39 @@
+// Fetches every page of a keyset-paginated list route (e.g. `/api/dogs`, `/api/adopt`).
+// The server returns at most one page per request and advertises the next page's cursor
+// through the `X-Next-After-Id` header, so pages are requested until that header is absent.
+// `onPage` receives all dogs fetched so far after each page, so lists render progressively.
+// Returns a function that stops fetching (call it when the component unmounts).
+const fetchAllPages = (path, onPage) => {
+    let cancelled = false;
+    let items = [];
+
+    const fetchPage = (afterId) => {
+        const separator = path.includes("?") ? "&" : "?";
+        const url = afterId === null ? path : `${path}${separator}after_id=${afterId}`;
+        fetch(url)
+        .then((response) => {
+            if (!response.ok) {
+                throw new Error(`Request to ${url} failed with status ${response.status}.`);
+            }
+            return response.json().then((page) => ({ page, nextAfterId: response.headers.get("X-Next-After-Id") }));
+        })
+        .then(({ page, nextAfterId }) => {
+            if (cancelled) {
+                return;
+            }
+            items = [...items, ...page];
+            onPage(items);
+            if (nextAfterId !== null) {
+                fetchPage(nextAfterId);
+            }
+        })
+        .catch((error) => console.log(error));
+    };
+
+    fetchPage(null);
+    return () => {
+        cancelled = true;
+    };
+};
+
+export default fetchAllPages;
@@ -0,0 +1,268 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Filesystem, path, and thread pool tools for scanning the image tree.
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Columnar arrays backing the manifest.
+import numpy as np
+# Image header parsing (dimensions are read without decoding pixels).
+from PIL import Image
+
+# Shared breed naming with `Dog.breed` on the server.
+# NOTE: `server/breeds.py` only uses the standard library, so importing it does not load the Flask application.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "server"))
+from breeds import BREED_CATALOG_FILENAME, parse_synset_directory, write_breed_catalog
+
+
+#######################################################
+######### CACHED DATASET MANIFEST OVERVIEW ############
+#######################################################
+
+
+"""
+The notebooks used to `os.walk()` the whole image tree and parse breed names
+from directory names on every run, which is slow on a network-mounted copy of
+the dataset. `load_manifest()` builds a columnar manifest of every image once:
+
+    breed            synset_id    path                                   size   width  height
+    "Chihuahua"      "n02085620"  "n02085620-Chihuahua/n02085620_10074.jpg"  21367   333    500
+
+Then it keeps it up to date cheaply:
+
+    - The manifest (`manifest.npz`, or `manifest.parquet` with `pyarrow`) stores
+      each breed directory's modification time next to the image rows.
+    - A refresh lists the dataset root and stats only the breed directories.
+      Only directories that are new or whose mtime changed are rescanned, with
+      a thread pool that stats and reads image headers in parallel. Rows of
+      unchanged directories are reused as they are.
+    - A `breeds.json` catalog (see `server/breeds.py`) is written next to the
+      manifest, so the server can read the breed list without `numpy`.
+
+Usage from a notebook in `research/notebooks/`:
+
+    import sys; sys.path.append("..")
+    from dataset import load_manifest
+
+    manifest = load_manifest("../data/images/")
+    manifest.breeds                 # sorted breed names
+    frame = manifest.to_frame()     # `pandas.DataFrame`
+
+NOTE: A directory's mtime changes when files are added, removed, or renamed in
+      it, not when an existing file is rewritten in place; pass `refresh="full"`
+      to rescan everything after in-place edits.
+"""
+
+
+#######################################################
+######## DATASET MANIFEST CONFIGURATION VALUES ########
+#######################################################
+
+
+# Default manifest location, relative to the dataset root (`data/images/` -> `data/manifest.npz`).
+DEFAULT_MANIFEST_NAME = "manifest.npz"
+
+# Image file extensions included in the manifest.
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
+# Default number of scanning threads (the scan waits on file I/O, not the CPU).
+DEFAULT_WORKERS = 32
+
+# Manifest columns, in order, with their array types.
+# NOTE: Unreadable images are kept with `-1` dimensions rather than dropped.
+COLUMNS = {
+    "breed": str,
+    "synset_id": str,
+    "path": str,
+    "size": np.int64,
+    "width": np.int32,
+    "height": np.int32,
+}
+
+# Manifest format version; manifests written by other versions are rebuilt from scratch.
+MANIFEST_VERSION = 1
+
+
+#######################################################
+######### EXPORTABLE DATASET MANIFEST CLASSES #########
+#######################################################
+
+
+# Columnar image manifest: one `numpy` array per column, plus the scanned directories' mtimes.
+class Manifest:
+    def __init__(self, columns, directory_mtimes):
+        self.columns = columns
+        self.directory_mtimes = directory_mtimes
+
+    def __len__(self):
+        return len(self.columns["path"])
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    # Sorted, unique breed names.
+    @property
+    def breeds(self):
+        return sorted(set(self.columns["breed"].tolist()))
+
+    # Per-breed image counts, keyed by `(synset ID, breed)`.
+    def breed_counts(self):
+        keys, counts = np.unique(np.stack([self.columns["synset_id"], self.columns["breed"]], axis=1),
+                                 axis=0, return_counts=True)
+        return {(synset_id, breed): int(count) for (synset_id, breed), count in zip(keys.tolist(), counts)}
+
+    # Rows whose `path` starts with one of the given directory names.
+    def rows_for_directories(self, directory_names):
+        directory_of_row = np.array([path.split("/", 1)[0] for path in self.columns["path"].tolist()], dtype=str)
+        return np.isin(directory_of_row, list(directory_names))
+
+    # Convert to a `pandas.DataFrame`.
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.columns)
+
+
+#######################################################
+####### EXPORTABLE DATASET MANIFEST FUNCTIONS #########
+#######################################################
+
+
+# Helper function to build an empty column set.
+def empty_columns():
+    return {name: np.array([], dtype=dtype) for name, dtype in COLUMNS.items()}
+
+# Helper function to concatenate column sets in order.
+def concatenate_columns(column_sets):
+    column_sets = [columns for columns in column_sets if len(columns["path"])]
+    if not column_sets:
+        return empty_columns()
+    return {name: np.concatenate([columns[name] for columns in column_sets]).astype(dtype)
+            for name, dtype in COLUMNS.items()}
+
+# Helper function to read one image's size and dimensions (header only).
+def describe_image(path):
+    size = os.stat(path).st_size
+    try:
+        with Image.open(path) as image:
+            width, height = image.size
+    except (OSError, ValueError):
+        width = height = -1
+    return size, width, height
+
+# Helper function to list the breed directories under the dataset root as `{name: (synset ID, breed, mtime_ns)}`.
+def list_breed_directories(root):
+    directories = {}
+    with os.scandir(root) as entries:
+        for entry in entries:
+            parsed = parse_synset_directory(entry.name)
+            if parsed is not None and entry.is_dir():
+                directories[entry.name] = (*parsed, entry.stat().st_mtime_ns)
+    return directories
+
+# Scan the given breed directories with a thread pool, returning their rows as a column set.
+def scan_directories(root, directories, workers=DEFAULT_WORKERS):
+    root = Path(root)
+
+    def list_images(directory_name):
+        with os.scandir(root / directory_name) as entries:
+            return sorted(f"{directory_name}/{entry.name}" for entry in entries
+                          if entry.is_file() and os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        directory_names = sorted(directories)
+        paths = [path for listing in executor.map(list_images, directory_names) for path in listing]
+        descriptions = list(executor.map(lambda path: describe_image(root / path), paths))
+
+    labels = [directories[path.split("/", 1)[0]] for path in paths]
+    return {
+        "breed": np.array([breed for _, breed, _ in labels], dtype=str),
+        "synset_id": np.array([synset_id for synset_id, _, _ in labels], dtype=str),
+        "path": np.array(paths, dtype=str),
+        "size": np.array([size for size, _, _ in descriptions], dtype=np.int64),
+        "width": np.array([width for _, width, _ in descriptions], dtype=np.int32),
+        "height": np.array([height for _, _, height in descriptions], dtype=np.int32),
+    }
+
+# Read a saved manifest (`.npz`, or `.parquet` with `pyarrow`), or `None` if missing or from another version.
+def read_manifest(manifest_path):
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists():
+        return None
+    if manifest_path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(manifest_path)
+        metadata = table.schema.metadata or {}
+        if int(metadata.get(b"manifest_version", 0)) != MANIFEST_VERSION:
+            return None
+        names = metadata[b"directory_names"].decode().split("\n") if metadata.get(b"directory_names") else []
+        mtimes = [int(mtime) for mtime in metadata[b"directory_mtimes"].decode().split()]
+        columns = {name: table.column(name).to_numpy(zero_copy_only=False).astype(dtype) for name, dtype in COLUMNS.items()}
+        return Manifest(columns, dict(zip(names, mtimes)))
+    with np.load(manifest_path, allow_pickle=False) as archive:
+        if int(archive["manifest_version"]) != MANIFEST_VERSION:
+            return None
+        columns = {name: archive[name].astype(dtype) for name, dtype in COLUMNS.items()}
+        return Manifest(columns, dict(zip(archive["directory_names"].tolist(), archive["directory_mtimes"].tolist())))
+
+# Write a manifest atomically (`.npz`, or `.parquet` with `pyarrow`), plus the breed catalog beside it.
+def write_manifest(manifest, manifest_path):
+    manifest_path = Path(manifest_path)
+    temporary_path = manifest_path.with_name(manifest_path.stem + ".tmp" + manifest_path.suffix)
+    directory_names = sorted(manifest.directory_mtimes)
+    directory_mtimes = [manifest.directory_mtimes[name] for name in directory_names]
+    if manifest_path.suffix == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.table(manifest.columns).replace_schema_metadata({
+            "manifest_version": str(MANIFEST_VERSION),
+            "directory_names": "\n".join(directory_names),
+            "directory_mtimes": " ".join(str(mtime) for mtime in directory_mtimes),
+        })
+        pq.write_table(table, temporary_path)
+    else:
+        with open(temporary_path, "wb") as manifest_file:
+            np.savez(manifest_file, **manifest.columns, manifest_version=np.int64(MANIFEST_VERSION),
+                     directory_names=np.array(directory_names, dtype=str),
+                     directory_mtimes=np.array(directory_mtimes, dtype=np.int64))
+    temporary_path.replace(manifest_path)
+    write_breed_catalog(manifest_path.with_name(BREED_CATALOG_FILENAME), [
+        {"synset_id": synset_id, "breed": breed, "images": count}
+        for (synset_id, breed), count in sorted(manifest.breed_counts().items())
+    ])
+
+# Load the manifest for a dataset root, rescanning only new or modified breed directories.
+# NOTE: `refresh=True` (default) checks directory mtimes; `refresh=False` trusts the saved manifest
+#       as-is (no filesystem access beyond reading it); `refresh="full"` rescans every directory.
+def load_manifest(root, manifest_path=None, refresh=True, workers=DEFAULT_WORKERS):
+    root = Path(root)
+    manifest_path = Path(manifest_path) if manifest_path else root.parent / DEFAULT_MANIFEST_NAME
+    saved = None if refresh == "full" else read_manifest(manifest_path)
+    if saved is not None and not refresh:
+        return saved
+
+    # STEP 1: Stat every breed directory and find those added, removed, or modified since the last scan.
+    directories = list_breed_directories(root)
+    previous_mtimes = saved.directory_mtimes if saved is not None else {}
+    stale = {name: directories[name] for name in directories if previous_mtimes.get(name) != directories[name][2]}
+    removed = set(previous_mtimes) - set(directories)
+    if saved is not None and not stale and not removed:
+        return saved
+
+    # STEP 2: Keep rows of unchanged directories and rescan the rest in parallel.
+    kept = empty_columns()
+    if saved is not None:
+        keep = ~saved.rows_for_directories(set(stale) | removed)
+        kept = {name: column[keep] for name, column in saved.columns.items()}
+    columns = concatenate_columns([kept, scan_directories(root, stale, workers)])
+    order = np.argsort(columns["path"], kind="stable")
+    manifest = Manifest({name: column[order] for name, column in columns.items()},
+                        {name: mtime for name, (_, _, mtime) in directories.items()})
+
+    # STEP 3: Persist the manifest and breed catalog for the next run.
+    write_manifest(manifest, manifest_path)
+    return manifest
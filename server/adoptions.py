@@ -0,0 +1,151 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Relative access to user, dog, and adoption models.
+from models import User, Dog, Adoption, live_criteria
+# Table version counters backing cached catalog responses.
+from caching import bump_table_versions
+# Incrementally maintained breed and adopter summaries.
+from stats import record_adoptions
+# Change log (outbox) behind the change feed.
+from changes import ADOPTION as ADOPTION_ENTITY, DOG as DOG_ENTITY, INSERT, UPDATE, record_changes
+# SQLAlchemy Core statement construction tools.
+from sqlalchemy import select, update, insert
+
+
+#######################################################
+######## TRANSACTIONAL ADOPTION EXPLANATION ###########
+#######################################################
+
+
+"""
+Adopting a dog used to be a read-check-write: load the dog, check `is_adoptable`,
+then set it to `False` and commit. Two concurrent requests could both pass the
+check and both adopt the same dog.
+
+`adopt_dogs()` instead claims dogs with a single conditional statement:
+
+    UPDATE dog_table SET is_adoptable = 0
+    WHERE id IN (...) AND is_adoptable = 1
+    RETURNING id, breed
+
+The database only returns the IDs whose row it actually flipped, so a dog can be
+claimed by at most one transaction no matter how many requests race for it.
+Adoption rows for the claimed dogs are then inserted with one bulk `INSERT`,
+and the caller commits everything as a single transaction.
+"""
+
+
+#######################################################
+########## ADOPTION RESULT STATUS VALUES ##############
+#######################################################
+
+
+# Per-item outcomes reported by `adopt_dogs()`.
+ADOPTED = "adopted"
+INVALID = "invalid"
+USER_NOT_FOUND = "user_not_found"
+DOG_NOT_FOUND = "dog_not_found"
+NOT_ADOPTABLE = "not_adoptable"
+DUPLICATE = "duplicate"
+
+# Maximum number of IDs bound into a single `IN (...)` clause.
+# NOTE: Keeps statements under SQLite's bound-parameter limit for very large batches.
+MAX_IN_CLAUSE_SIZE = 5000
+
+
+#######################################################
+###### EXPORTABLE ADOPTION UTILITY FUNCTION(S) ########
+#######################################################
+
+
+# Helper function to split a list of IDs into `IN`-clause-sized chunks.
+def chunked(values, size=MAX_IN_CLAUSE_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+# Helper function to find which of the given primary keys exist for a model (optionally matching extra criteria).
+def existing_ids(session, column, ids, *criteria):
+    found = set()
+    for chunk in chunked(list(ids)):
+        found.update(session.scalars(select(column).where(column.in_(chunk), *criteria)))
+    return found
+
+# Helper function to coerce a payload item into a `(user_id, dog_id)` pair, or `None` if malformed.
+def parse_adoption_item(item):
+    if not isinstance(item, dict):
+        return None
+    user_id, dog_id = item.get("user_id"), item.get("dog_id")
+    if type(user_id) is not int or type(dog_id) is not int:
+        return None
+    return user_id, dog_id
+
+# Adopt many dogs to many users inside the caller's transaction.
+# NOTE: Returns one result dictionary per input item, in input order.
+# NOTE: The caller is responsible for committing (or rolling back) the session.
+def adopt_dogs(session, items):
+    pairs = [parse_adoption_item(item) for item in items]
+    results = [{"index": index, "user_id": pair[0] if pair else None, "dog_id": pair[1] if pair else None,
+                "status": INVALID if pair is None else None}
+               for index, pair in enumerate(pairs)]
+
+    # STEP 1: Resolve every referenced user in bulk.
+    known_user_ids = existing_ids(session, User.id, {pair[0] for pair in pairs if pair})
+
+    # STEP 2: Decide which items are candidates; the first request for a dog wins within a batch.
+    candidate_results_by_dog_id = {}
+    for result in results:
+        if result["status"] is not None:
+            continue
+        if result["user_id"] not in known_user_ids:
+            result["status"] = USER_NOT_FOUND
+        elif result["dog_id"] in candidate_results_by_dog_id:
+            result["status"] = DUPLICATE
+        else:
+            candidate_results_by_dog_id[result["dog_id"]] = result
+
+    # STEP 3: Atomically claim every still-adoptable candidate dog (noting breeds for the summaries).
+    claimed_breeds_by_dog_id = {}
+    for chunk in chunked(list(candidate_results_by_dog_id)):
+        claimed_breeds_by_dog_id.update(session.execute(
+            update(Dog)
+            .where(Dog.id.in_(chunk), Dog.is_adoptable.is_(True), *live_criteria(Dog))
+            .values(is_adoptable=False)
+            .returning(Dog.id, Dog.breed)
+            .execution_options(synchronize_session=False)
+        ).all())
+    claimed_dog_ids = set(claimed_breeds_by_dog_id)
+
+    # STEP 4: Distinguish missing (or soft-deleted) dogs from dogs that were already adopted.
+    unclaimed_dog_ids = set(candidate_results_by_dog_id) - claimed_dog_ids
+    known_dog_ids = existing_ids(session, Dog.id, unclaimed_dog_ids, *live_criteria(Dog)) if unclaimed_dog_ids else set()
+    for dog_id in unclaimed_dog_ids:
+        candidate_results_by_dog_id[dog_id]["status"] = NOT_ADOPTABLE if dog_id in known_dog_ids else DOG_NOT_FOUND
+
+    # STEP 5: Bulk insert adoption rows for every claimed dog.
+    # NOTE: Returned rows are matched back by dog ID (unique within a batch) rather than by parameter order,
+    #       which SQLite could only guarantee by inserting one row per statement.
+    claimed_results = [candidate_results_by_dog_id[dog_id] for dog_id in candidate_results_by_dog_id
+                       if dog_id in claimed_dog_ids]
+    if claimed_results:
+        adoption_ids_by_dog_id = dict(row[::-1] for row in session.execute(
+            insert(Adoption).returning(Adoption.id, Adoption.dog_id),
+            [{"user_id": result["user_id"], "dog_id": result["dog_id"]} for result in claimed_results]
+        ).all())
+        for result in claimed_results:
+            result["status"] = ADOPTED
+            result["adoption_id"] = adoption_ids_by_dog_id[result["dog_id"]]
+
+        # STEP 6: Update the summaries, log the changes, and invalidate cached catalog responses in the same transaction.
+        record_adoptions(session, [(result["user_id"], claimed_breeds_by_dog_id[result["dog_id"]])
+                                   for result in claimed_results])
+        record_changes(session, [change for result in claimed_results for change in (
+            (DOG_ENTITY, UPDATE, result["dog_id"], {"id": result["dog_id"], "is_adoptable": False}),
+            (ADOPTION_ENTITY, INSERT, result["adoption_id"],
+             {"id": result["adoption_id"], "user_id": result["user_id"], "dog_id": result["dog_id"]}),
+        )])
+        bump_table_versions(session, Dog, Adoption)
+
+    return results
@@ -3,17 +3,57 @@
 #######################################################
 
 
-# Flask server request-response and session storage utilities.
-from flask import request, make_response, session
+# Flask server request-response and response streaming utilities.
+from flask import request, make_response, Response, stream_with_context
 # Configured application/server and database instances.
 from config import app, db
 # Relative access to user, dog, and adoption models.
-from models import User, Dog, Adoption
+from models import User, Dog, Adoption, BreedStats, UserAdoptionStats, normalize_username, live_criteria
 # Custom authorization decorator middleware.
-from middleware import authorization_required
-
-# Cryptographic hashing tools for user authentication.
-import bcrypt
+from middleware import authorization_required, current_principal
+# Server-side session sign-in and sign-out helpers.
+from sessions import sign_in, sign_out
+# Compact JSON/MessagePack response encoding and compression.
+# NOTE: Imported for its side effects (installs `app.json` and the compression `after_request` hook).
+import encoding  # noqa: F401
+# Request latency, SQL, serialization, and hashing metrics.
+from metrics import is_metrics_request_authorized, render_metrics, timed_phase
+# Keyset pagination, filtering, and streaming helpers for catalog routes.
+from pagination import (QueryParameterError, parse_bool, parse_positive_int, dog_filter_criteria, fetch_keyset_page,
+                        next_page_headers, parse_page, stream_json_array)
+# Precompiled flat serializers for hot list routes.
+from serializers import compiled_serializer
+# SQL query budget instrumentation for routes.
+from instrumentation import query_budget
+# Bounded password hashing service for user authentication.
+from hashing import HashingBackpressure, password_hasher
+# Version-keyed ETag and response caching for catalog reads.
+from caching import conditional_cache, bump_table_versions
+# Transactional, race-free adoption helpers.
+from adoptions import adopt_dogs, ADOPTED, USER_NOT_FOUND, DOG_NOT_FOUND, NOT_ADOPTABLE
+# Indexed prefix, substring, and fuzzy catalog search.
+from search import search_statement, breed_facets
+# Incrementally maintained breed and adopter summaries.
+from stats import adjust_breed_stats, dog_breed_delta, read_stats
+# Transactional change log and change feed helpers.
+from changes import (DOG as DOG_ENTITY, DEFAULT_CHANGE_LIMIT, MAX_CHANGE_LIMIT, INSERT, UPDATE, DELETE, latest_sequence,
+                     parse_change_entities, record_changes, stream_changes, wait_for_changes)
+# Whitelisted, single-statement partial updates.
+from updates import (DOG_PATCHABLE_FIELDS, USER_PATCHABLE_FIELDS, PatchValidationError, apply_patches, parse_patch_items,
+                     patch_dogs, patch_results, patch_users)
+# Micro-batched breed classification for dog photos.
+from inference import (ImageDecodeError, InferenceBackpressure, InferenceUnavailable, breed_classifier,
+                       record_predictions)
+# Content-addressed dog photo storage, background thumbnails, and immutable file responses.
+from photos import (PhotoStorageUnavailable, PhotoUploadError, ThumbnailUnavailable, is_photo_key, photo_store,
+                    photo_url, send_photo, thumbnail_url)
+# Vectorized dog recommendations from adoption history.
+from recommendations import DEFAULT_RECOMMENDATIONS, MAX_RECOMMENDATIONS, RecommendationsUnavailable, recommendation_index
+# Batched archival of soft-deleted dogs and old adoptions (registers `flask archive-history`).
+# NOTE: Imported for its side effects (the command registration).
+import archive  # noqa: F401
+# SQLAlchemy constraint violation errors.
+from sqlalchemy.exc import IntegrityError
 
 
 #######################################################
@@ -43,11 +83,12 @@ def api(current_user):
 
 
 # GET route to verify authentication.
+# NOTE: Answers from the server-side session (no database access) with the user's ID, username, and admin flag.
 @app.route("/check_session")
 def verify_session():
-    user = db.session.get(User, session.get("user_id"))
-    if user is not None:
-        return user.to_dict(), 200
+    principal = current_principal()
+    if principal is not None:
+        return principal.to_dict(), 200
     else:
         return {"msg": "No user logged in."}, 401
 
@@ -57,101 +98,318 @@ def verify_session():
 #######################################################
 
 
+# Helper function to build a keyset-paginated response of serialized dogs.
+# NOTE: Rows are fetched as plain column tuples and run through a precompiled serializer,
+#       so no ORM objects are built for list routes.
+# NOTE: Response bodies remain plain arrays; the cursor for the next page is
+#       advertised through the `X-Next-After-Id` and `Link` response headers.
+def paginated_dogs_response(criteria, serializer):
+    after_id, limit = parse_page(request.args)
+    statement = serializer.select().where(*criteria)
+    matching_rows, has_more = fetch_keyset_page(db.session, statement, Dog.id, after_id, limit)
+    response = make_response(serializer.serialize_rows(matching_rows), 200)
+    if has_more:
+        response.headers.update(next_page_headers(request.base_url, request.args, matching_rows[-1].id, limit))
+    return response
+
 # GET route to view all dogs.
 # NOTE: Requires user privileges. (Can use decorator middleware.)
+# NOTE: Responses carry ETags; unchanged polls are answered with `304 Not Modified`.
+# NOTE: Supports `?after_id=&limit=` pagination and `breed`, `is_adoptable`,
+#       `created_after`, and `created_before` filters.
 @app.route("/api/dogs")
+@query_budget(3)
 @authorization_required
+@conditional_cache(Dog)
 def view_all_dogs(current_user):
-    # Query all dog rows from database.
-    all_dogs = [dog.to_dict(rules=("-adoptions",)) for dog in Dog.query.all()]
-    return make_response(all_dogs, 200)
+    try:
+        criteria = dog_filter_criteria(Dog, request.args)
+        return paginated_dogs_response(criteria, compiled_serializer(Dog, rules=("-adoptions",)))
+    except QueryParameterError as error:
+        return make_response({"error": str(error)}, 400)
 
 # GET route to view all adoptable dogs.
 # NOTE: Requires user privileges. (Can use decorator middleware.)
+# NOTE: Supports the same pagination and filters as `/api/dogs`, 
+#       with adoptability always enforced in SQL.
 @app.route("/api/adopt")
+@query_budget(3)
 @authorization_required
+@conditional_cache(Dog)
 def view_adoptable_dogs(current_user):
-    # Query all dog rows from database.
-    all_dogs = Dog.query.all()
+    try:
+        criteria = [*dog_filter_criteria(Dog, request.args), Dog.is_adoptable.is_(True)]
+        return paginated_dogs_response(criteria, compiled_serializer(Dog, only=("id", "name", "breed", "thumbnail_url")))
+    except QueryParameterError as error:
+        return make_response({"error": str(error)}, 400)
 
-    # Convert all adoptable dogs to JSON-friendly object array as server output.
-    adoptable_dogs = [dog.to_dict(only=("id", "name", "breed")) for dog in all_dogs if dog.is_adoptable is True]
-    return make_response(adoptable_dogs, 200)
+# GET route to export all (optionally filtered) dogs as a single streamed JSON array.
+# NOTE: Requires user privileges. (Can use decorator middleware.)
+# NOTE: Rows are fetched in keyset batches and written out as they are serialized,
+#       so memory use stays flat regardless of catalog size.
+@app.route("/api/dogs/export")
+@authorization_required
+def export_all_dogs(current_user):
+    try:
+        criteria = dog_filter_criteria(Dog, request.args)
+    except QueryParameterError as error:
+        return make_response({"error": str(error)}, 400)
+    serializer = compiled_serializer(Dog, rules=("-adoptions",))
+    rows = stream_json_array(db.session, serializer.select().where(*criteria), Dog.id, serializer.serialize_rows)
+    return Response(stream_with_context(rows), status=200, mimetype="application/json")
+
+# GET route to search dogs by name and breed.
+# NOTE: Requires user privileges. (Can use decorator middleware.)
+# NOTE: `?q=` is matched against names and breeds with `mode=prefix` (default),
+#       `substring`, or `fuzzy`; `is_adoptable` and `created_*` filters and
+#       `after_id`/`limit` pagination work as on `/api/dogs`. `breed` is matched the same way
+#       as `q`, but against breeds only (`breed=husky` finds Siberian Huskies). With
+#       `?facets=true`, the response also counts matches per breed.
+# NOTE: Responds with `{"results": [...]}` (plus `"facets"` when requested).
+@app.route("/api/dogs/search")
+@query_budget(4)
+@authorization_required
+@conditional_cache(Dog)
+def search_dogs(current_user):
+    try:
+        after_id, limit = parse_page(request.args)
+        serializer = compiled_serializer(Dog, rules=("-adoptions",))
+        statement, key_column = search_statement(db.session, serializer, request.args.get("q"),
+                                                 request.args.get("breed"), request.args.get("mode", "prefix"))
+        statement = statement.where(*dog_filter_criteria(Dog, request.args, exact_breed=False))
+        include_facets = parse_bool(request.args, "facets")
+    except QueryParameterError as error:
+        return make_response({"error": str(error)}, 400)
+
+    matching_rows, has_more = fetch_keyset_page(db.session, statement, key_column, after_id, limit)
+    body = {"results": serializer.serialize_rows(matching_rows)}
+    if include_facets:
+        body["facets"] = {"breed": breed_facets(db.session, statement)}
+    response = make_response(body, 200)
+    if has_more:
+        response.headers.update(next_page_headers(request.base_url, request.args, matching_rows[-1].id, limit))
+    return response
 
 # GET route to view individual dog by ID.
 # NOTE: Requires user privileges. (Can use decorator middleware.)
 @app.route("/api/dogs/<int:dog_id>")
+@query_budget(4)
 @authorization_required
+@conditional_cache(Dog, Adoption, User)
 def view_dog_by_id(current_user, dog_id: int):
-    # Query and return dog from database that matches given ID.
-    matching_dog = Dog.query.filter(Dog.id == dog_id).first()
+    # Query and return (live) dog from database that matches given ID.
+    matching_dog = Dog.query.filter(Dog.id == dog_id, *live_criteria(Dog)).first()
     if not matching_dog:
         return make_response({"error": f"Dog ID `{dog_id}` not found in database."}, 404)
     return make_response(matching_dog.to_dict(), 200)
 
+# GET route to download a stored dog photo.
+# NOTE: Requires user privileges. (Can use decorator middleware.)
+# NOTE: Photos are content-addressed, so responses are cached as `immutable` and sent without
+#       re-encoding (`sendfile()` where the WSGI server supports it; see `photos.py`).
+@app.route("/api/photos/<key>")
+@authorization_required
+def view_photo(current_user, key):
+    if not is_photo_key(key) or not photo_store.original_path(key).exists():
+        return make_response({"error": "Photo not found."}, 404)
+    return send_photo(photo_store.original_path(key), key)
+
+# GET route to download a stored dog photo's thumbnail.
+# NOTE: Requires user privileges. (Can use decorator middleware.)
+# NOTE: Thumbnails are generated once in the background after upload; a request arriving
+#       before that finishes waits for the same job instead of resizing the photo again.
+# NOTE: A failed or unfinished (after `thumbnail_timeout` seconds) job answers `503`; the next request retries it.
+@app.route("/api/photos/thumbnails/<key>")
+@authorization_required
+def view_photo_thumbnail(current_user, key):
+    try:
+        path = photo_store.thumbnail(key) if is_photo_key(key) else None
+    except (PhotoStorageUnavailable, ThumbnailUnavailable) as error:
+        return make_response({"error": str(error)}, 503)
+    if path is None:
+        return make_response({"error": "Photo not found."}, 404)
+    return send_photo(path, key)
+
 
 #######################################################
 #### ADMINISTRATOR-ONLY ROUTES FOR DOGS (STANDARD) ####
 #######################################################
 
 
+# Helper function to extract an uploaded photo from a multipart `photo` field or the raw request body.
+def request_photo_data():
+    photo = request.files.get("photo")
+    return photo.read() if photo is not None else request.get_data()
+
+# Helper function to store uploaded photo bytes, returning `(key, None)` or `(None, error response)`.
+def store_photo(data):
+    try:
+        with timed_phase("photo"):
+            return photo_store.store(data), None
+    except PhotoUploadError as error:
+        return None, make_response({"error": str(error)}, 400)
+    except PhotoStorageUnavailable as error:
+        return None, make_response({"error": str(error)}, 503)
+
 # POST route to add new dog to database.
 # NOTE: Requires administrative privileges. (Can use decorator middleware.)
+# NOTE: Accepts a JSON payload, or `multipart/form-data` fields with an optional `photo` file.
 @app.route("/api/dogs", methods=["POST"])
 @authorization_required(methods=["POST"])
 def add_dog(current_user):
-    # Extract JSONified payload from request.
-    payload = request.get_json()
+    # Extract JSONified (or form) payload from request.
+    payload = request.form if request.mimetype == "multipart/form-data" else request.get_json()
+
+    # Store the uploaded photo (if any) before the dog row, so the row only ever references a stored file.
+    photo_key = None
+    if "photo" in request.files:
+        photo_key, error_response = store_photo(request.files["photo"].read())
+        if error_response is not None:
+            return error_response
 
     # Unpack payload attributes to new dog object.
     new_dog = Dog(
         name=payload["name"], 
         breed=payload["breed"],
-        is_adoptable=True
+        is_adoptable=True,
+        photo=photo_key
     )
 
-    # Add and commit new dog to database.
+    # Add and commit new dog to database (updating summaries, logging the change, and invalidating cached catalog responses in the same transaction).
     db.session.add(new_dog)
+    db.session.flush()
+    adjust_breed_stats(db.session, dog_breed_delta(new_dog.breed, new_dog.is_adoptable))
+    record_changes(db.session, [(DOG_ENTITY, INSERT, new_dog.id, {"id": new_dog.id, "name": new_dog.name,
+                                                                  "breed": new_dog.breed, "is_adoptable": new_dog.is_adoptable,
+                                                                  "photo_url": new_dog.photo_url,
+                                                                  "thumbnail_url": new_dog.thumbnail_url})])
+    bump_table_versions(db.session, Dog)
     db.session.commit()
     return make_response(new_dog.to_dict(), 201)
 
 # PATCH route to edit dog's information in database.
 # NOTE: Requires administrative privileges. (Can use decorator middleware.)
+# NOTE: Only `name`, `breed`, and `is_adoptable` may be changed; the patch is applied
+#       with a single `UPDATE ... RETURNING` (see `updates.py`).
 @app.route("/api/dogs/<int:dog_id>", methods=["PATCH"])
 @authorization_required(methods=["PATCH"])
 def update_dog(current_user, dog_id: int):
-    # Query dog from database that matches given ID.
-    matching_dog = Dog.query.filter(Dog.id == dog_id).first()
-    if not matching_dog:
+    # Validate JSONified payload against the whitelist of updatable dog fields.
+    try:
+        assignments = DOG_PATCHABLE_FIELDS.validate(request.get_json(silent=True))
+    except PatchValidationError as error:
+        return make_response({"error": str(error)}, 400)
+
+    # Update dog in place (updating summaries and invalidating cached catalog responses in the same transaction).
+    updated_dogs = patch_dogs(db.session, {dog_id: assignments}, compiled_serializer(Dog, only=("id", "name", "breed")))
+    if dog_id not in updated_dogs:
+        db.session.rollback()
         return make_response({"error": f"Dog ID `{dog_id}` not found in database."}, 404)
-    
-    # Extract JSONified payload from request.
-    payload = request.get_json()
-
-    # Iteratively update relevant dog attributes using payload data.
-    for attribute in payload:
-        setattr(matching_dog, attribute, payload[attribute])
+    db.session.commit()
+    return make_response(updated_dogs[dog_id], 200)
 
-    # Add and commit updated dog to database.
-    db.session.add(matching_dog)
+# PATCH route to edit many dogs in a single request.
+# NOTE: Requires administrative privileges. (Can use decorator middleware.)
+# NOTE: Expects `{"updates": [{"id": ..., <fields>...}, ...]}` and applies every patch in one
+#       transaction (one `UPDATE` per 500 dogs). Any invalid item rejects the whole request;
+#       results report each item (in order) as `updated` (with the dog) or `not_found`.
+@app.route("/api/dogs", methods=["PATCH"])
+@authorization_required(methods=["PATCH"])
+def update_dogs_in_bulk(current_user):
+    # Extract JSONified payload from request and validate every item before touching the database.
+    payload = request.get_json(silent=True) or {}
+    try:
+        assignments_by_id = parse_patch_items(DOG_PATCHABLE_FIELDS, payload.get("updates") if isinstance(payload, dict) else None)
+    except PatchValidationError as error:
+        return make_response({"error": str(error)}, 400)
+
+    updated_dogs = patch_dogs(db.session, assignments_by_id, compiled_serializer(Dog, only=("id", "name", "breed")))
     db.session.commit()
-    return make_response(matching_dog.to_dict(only=("id", "name", "breed")), 200)
+    return make_response({"updated": len(updated_dogs), "not_found": len(assignments_by_id) - len(updated_dogs),
+                          "results": patch_results(assignments_by_id, updated_dogs, "dog")}, 200)
 
 # DELETE route to remove dog from database.
 # NOTE: Requires administrative privileges. (Can use decorator middleware.)
+# NOTE: Dogs are soft-deleted (`deleted_at` is set), so their adoptions keep a valid `dog_id`;
+#       `flask --app app archive-history` later moves them to the archive tables (see `archive.py`).
 @app.route("/api/dogs/<int:dog_id>", methods=["DELETE"])
 @authorization_required(methods=["DELETE"])
 def remove_dog(current_user, dog_id: int):
-    # Query dog from database that matches given ID.
-    matching_dog = Dog.query.filter(Dog.id == dog_id).first()
+    # Query (live) dog from database that matches given ID.
+    matching_dog = Dog.query.filter(Dog.id == dog_id, *live_criteria(Dog)).first()
     if not matching_dog:
         return make_response({"error": f"Dog ID `{dog_id}` not found in database."}, 404)
 
-    # Remove and commit dog from database.
-    db.session.delete(matching_dog)
+    # Soft-delete and commit dog (updating summaries, logging the change, and invalidating cached catalog responses in the same transaction).
+    matching_dog.deleted_at = db.func.now()
+    adjust_breed_stats(db.session, dog_breed_delta(matching_dog.breed, matching_dog.is_adoptable, -1))
+    record_changes(db.session, [(DOG_ENTITY, DELETE, dog_id, {"id": dog_id})])
+    bump_table_versions(db.session, Dog)
     db.session.commit()
     return make_response(matching_dog.to_dict(only=("id", "name", "breed")), 204)
 
+# PUT route to upload (or replace) a dog's photo.
+# NOTE: Requires administrative privileges. (Can use decorator middleware.)
+# NOTE: Accepts a multipart `photo` field or a raw `image/*` request body. The file is stored once
+#       by content hash and its thumbnail is generated in the background (see `photos.py`).
+@app.route("/api/dogs/<int:dog_id>/photo", methods=["PUT"])
+@authorization_required(methods=["PUT"])
+def upload_dog_photo(current_user, dog_id: int):
+    # Extract and store the photo from the upload (or request body).
+    data = request_photo_data()
+    if not data:
+        return make_response({"error": "Expected a `photo` upload or an image request body."}, 400)
+    photo_key, error_response = store_photo(data)
+    if error_response is not None:
+        return error_response
+
+    # Point the (live) dog at the stored photo (logging the change and invalidating cached catalog responses in the same transaction).
+    if dog_id not in apply_patches(db.session, Dog, {dog_id: {"photo": photo_key}}, ()):
+        db.session.rollback()
+        return make_response({"error": f"Dog ID `{dog_id}` not found in database."}, 404)
+    photo_urls = {"photo_url": photo_url(photo_key), "thumbnail_url": thumbnail_url(photo_key)}
+    record_changes(db.session, [(DOG_ENTITY, UPDATE, dog_id, {"id": dog_id, **photo_urls})])
+    bump_table_versions(db.session, Dog)
+    db.session.commit()
+    return make_response({"id": dog_id, **photo_urls}, 200)
+
+# POST route to classify a dog's breed from a photo and store the prediction on the dog.
+# NOTE: Requires administrative privileges. (Can use decorator middleware.)
+# NOTE: Accepts a multipart `photo` field or a raw `image/*` request body, and otherwise classifies the
+#       dog's stored photo. The photo joins a micro-batch on the shared classifier (see `inference.py`);
+#       the admin-entered `breed` is kept.
+@app.route("/api/dogs/<int:dog_id>/classify", methods=["POST"])
+@authorization_required(methods=["POST"])
+def classify_dog(current_user, dog_id: int):
+    matching_dog = db.session.execute(db.select(Dog.id, Dog.photo).where(Dog.id == dog_id, *live_criteria(Dog))).first()
+    if matching_dog is None:
+        return make_response({"error": f"Dog ID `{dog_id}` not found in database."}, 404)
+    db.session.rollback()
+
+    # Extract the photo from the upload (or request body), falling back to the dog's stored photo.
+    data = request_photo_data()
+    if not data and matching_dog.photo:
+        data = photo_store.read(matching_dog.photo)
+    if not data:
+        return make_response({"error": "Expected a `photo` upload or an image request body."}, 400)
+
+    # Classify outside any database transaction, so waiting on the model never holds a connection's locks.
+    try:
+        with timed_phase("infer"):
+            prediction = breed_classifier.classify(data)
+    except ImageDecodeError as error:
+        return make_response({"error": str(error)}, 400)
+    except (InferenceUnavailable, InferenceBackpressure) as error:
+        return make_response({"error": str(error)}, 503)
+
+    # Store the prediction (logging the change and invalidating cached catalog responses in the same transaction).
+    if dog_id not in record_predictions(db.session, {dog_id: prediction}):
+        db.session.rollback()
+        return make_response({"error": f"Dog ID `{dog_id}` not found in database."}, 404)
+    db.session.commit()
+    return make_response({"id": dog_id, "predicted_breed": prediction["breed"],
+                          "breed_confidence": prediction["confidence"], "top": prediction["top"]}, 200)
+
 
 #######################################################
 ## ADMINISTRATOR-ONLY ROUTES FOR DOGS (ASSOCIATIONS) ##
@@ -159,55 +417,209 @@ def remove_dog(current_user, dog_id: int):
 
 
 # GET route to view all adopted dogs for a current user.
+# NOTE: Dogs are fetched with a single join through the adoption table instead of
+#       walking the `User.dogs` association proxy, so the query count stays constant
+#       no matter how many dogs a user has adopted.
+# NOTE: Ordered by `(created_at, id)` so the `(user_id, created_at)` index returns rows in order.
+#       Soft-deleted dogs and archived adoptions are not listed.
 @app.route("/api/users/<int:user_id>/dogs")
+@query_budget(3)
 @authorization_required
 def view_adopted_dogs_for_user(current_user, user_id):
-    matching_user = User.query.filter(User.id == user_id).first()
-    if not matching_user:
+    matching_user_id = db.session.execute(db.select(User.id).where(User.id == user_id)).scalar()
+    if matching_user_id is None:
         return make_response({"error": f"User ID `{user_id}` not found in database."}, 404)
-    adopted_dogs_for_user = [dog.to_dict(rules=("-adoptions",)) for dog in matching_user.dogs if dog is not None]
+    serializer = compiled_serializer(Dog, rules=("-adoptions",))
+    statement = (serializer.select()
+                 .join(Adoption, Adoption.dog_id == Dog.id)
+                 .where(Adoption.user_id == user_id, *live_criteria(Dog))
+                 .order_by(Adoption.created_at, Adoption.id))
+    adopted_dogs_for_user = serializer.serialize_rows(db.session.execute(statement))
     return make_response(adopted_dogs_for_user, 200)
 
+# GET route to recommend adoptable dogs to a user from their adoption history.
+# NOTE: Requires user privileges. (Can use decorator middleware.)
+# NOTE: Scores every adoptable dog with one product against an in-memory embedding matrix
+#       (see `recommendations.py`), then reads only the top `?limit=` (default 10) dogs.
+@app.route("/api/users/<int:user_id>/recommendations")
+@authorization_required
+@conditional_cache(Dog, Adoption)
+def view_recommendations_for_user(current_user, user_id):
+    try:
+        limit = parse_positive_int(request.args, "limit", DEFAULT_RECOMMENDATIONS)
+        if not 1 <= limit <= MAX_RECOMMENDATIONS:
+            raise QueryParameterError(f"Query parameter `limit` must be between 1 and {MAX_RECOMMENDATIONS} (received `{limit}`).")
+    except QueryParameterError as error:
+        return make_response({"error": str(error)}, 400)
+    matching_user_id = db.session.execute(db.select(User.id).where(User.id == user_id)).scalar()
+    if matching_user_id is None:
+        return make_response({"error": f"User ID `{user_id}` not found in database."}, 404)
+
+    try:
+        scored_ids = recommendation_index.recommend(db.session, user_id, limit)
+    except RecommendationsUnavailable as error:
+        return make_response({"error": str(error)}, 503)
+
+    # Read the recommended dogs in one statement and return them in score order.
+    serializer = compiled_serializer(Dog, only=("id", "name", "breed", "thumbnail_url"))
+    statement = serializer.select().where(Dog.id.in_([dog_id for dog_id, _ in scored_ids]))
+    dogs_by_id = {dog["id"]: dog for dog in serializer.serialize_rows(db.session.execute(statement))}
+    recommended_dogs = [{**dogs_by_id[dog_id], "score": score} for dog_id, score in scored_ids if dog_id in dogs_by_id]
+    return make_response(recommended_dogs, 200)
+
 # POST route to add a dog to a user's currently adopted dogs (list).
 # NOTE: Requires administrative privileges. (Can use decorator middleware.)
+# NOTE: A dog that is no longer adoptable (e.g. claimed by a concurrent request) answers `409 Conflict`.
 @app.route("/api/users/<int:user_id>/adoptions", methods=["POST"])
 @authorization_required(methods=["POST"])
 def adopt_dog_to_user(current_user, user_id):
-    # STEP 1: Find the user that matches the given ID from the URL/route.
-    matching_user = User.query.filter(User.id == user_id).first()
-
-    # STEP 2: Find the dog that matches the given ID from the request.
+    # STEP 1: Find the dog ID from the request.
     # NOTE: My request will be neither a `User()` nor a `Dog()`. 
     #       It will be an `Adoption()` with IDs for a user and a dog.
+    # NOTE: Numeric strings (e.g. `"2"`) are still accepted here, as they always were; the bulk route is strict.
     dog_id = request.get_json()["dog_id"]
-    matching_dog = Dog.query.filter(Dog.id == dog_id).first()
-    # NOTE: It's helpful to validate our matching objects before attempting to manipulate SQL tables.
-    if not matching_user:
-        return make_response({"error": f"User ID `{user_id}` not found in database."}, 404)
-    if not matching_dog:
-        return make_response({"error": f"Dog ID `{dog_id}` not found in database."}, 404)
-    
-    # STEP 3: Check that matching dog is adoptable and raise an error if not true.
-    if matching_dog.is_eligible_for_adoption() is False:
-        return make_response({"error": f"This dog (ID: `{dog_id}`) is currently not eligible for adoption. Please check back again later."}, 400) 
-    
-    # STEP 4: Link our matching user and dog using an association table: `<Adoption>`. 
-    new_adoption = Adoption(user_id=matching_user.id,
-                            dog_id=matching_dog.id)
-    
-    # STEP 5: Update dog's adoptability status.
-    setattr(matching_dog, "is_adoptable", False)
-    
-    # STEP 6: Stage and commit changes to the database.
-    db.session.add(new_adoption)
-    db.session.add(matching_dog)
+    if isinstance(dog_id, str) and dog_id.isdecimal():
+        dog_id = int(dog_id)
+
+    # STEP 2: Validate the user and atomically claim the dog if (and only if) it is still adoptable.
+    # NOTE: The claim is a conditional `UPDATE`, so two concurrent requests cannot both adopt the same dog.
+    result, = adopt_dogs(db.session, [{"user_id": user_id, "dog_id": dog_id}])
+
+    # STEP 3: Report why the adoption could not happen, if it did not.
+    if result["status"] != ADOPTED:
+        db.session.rollback()
+        if result["status"] == USER_NOT_FOUND:
+            return make_response({"error": f"User ID `{user_id}` not found in database."}, 404)
+        if result["status"] == DOG_NOT_FOUND:
+            return make_response({"error": f"Dog ID `{dog_id}` not found in database."}, 404)
+        if result["status"] == NOT_ADOPTABLE:
+            return make_response({"error": f"This dog (ID: `{dog_id}`) is currently not eligible for adoption. Please check back again later."}, 409)
+        return make_response({"error": "Invalid adoption request. Expected integer `dog_id`."}, 400)
+
+    # STEP 4: Commit the claimed dog and new adoption together.
     db.session.commit()
 
-    # STEP 7: Return acceptable value to frontend/API.
+    # STEP 5: Return acceptable value to frontend/API.
     # NOTE: Must give additional serialization rules to stop infinite cascading/recursion
     #       after accessing a user's adopted dogs. 
+    new_adoption = db.session.get(Adoption, result["adoption_id"])
     return make_response(new_adoption.to_dict(rules=("-user",)), 201)
 
+# POST route to adopt many dogs to many users in a single transaction.
+# NOTE: Requires administrative privileges. (Can use decorator middleware.)
+# NOTE: Expects `{"adoptions": [{"user_id": ..., "dog_id": ...}, ...]}` and returns one result
+#       per item (in order) with a `status` of `adopted`, `invalid`, `user_not_found`,
+#       `dog_not_found`, `not_adoptable`, or `duplicate`.
+@app.route("/api/adoptions/bulk", methods=["POST"])
+@authorization_required(methods=["POST"])
+def adopt_dogs_in_bulk(current_user):
+    # Extract JSONified payload from request.
+    payload = request.get_json(silent=True) or {}
+    items = payload.get("adoptions") if isinstance(payload, dict) else None
+    if not isinstance(items, list):
+        return make_response({"error": "Invalid bulk adoption request. Expected `adoptions` to be a list."}, 400)
+
+    # Claim every adoptable dog and record all adoptions in one transaction.
+    results = adopt_dogs(db.session, items)
+    db.session.commit()
+
+    adopted_count = sum(1 for result in results if result["status"] == ADOPTED)
+    return make_response({"adopted": adopted_count, "rejected": len(results) - adopted_count, "results": results}, 200)
+
+
+#######################################################
+######### ADMINISTRATOR-ONLY ROUTES FOR USERS #########
+#######################################################
+
+
+# PATCH route to edit user's username or administrative flag.
+# NOTE: Requires administrative privileges. (Can use decorator middleware.)
+# NOTE: Applied with a single `UPDATE ... RETURNING`; the user's cached principal and
+#       server-side sessions pick up the change when it commits.
+@app.route("/api/users/<int:user_id>", methods=["PATCH"])
+@authorization_required(methods=["PATCH"])
+def update_user(current_user, user_id: int):
+    # Validate JSONified payload against the whitelist of updatable user fields.
+    try:
+        assignments = USER_PATCHABLE_FIELDS.validate(request.get_json(silent=True))
+    except PatchValidationError as error:
+        return make_response({"error": str(error)}, 400)
+
+    try:
+        updated_users = patch_users(db.session, {user_id: assignments},
+                                    compiled_serializer(User, only=("id", "username", "is_admin", "created_at")))
+    except IntegrityError:
+        db.session.rollback()
+        return make_response({"error": "Username is already taken. Try another."}, 409)
+    if user_id not in updated_users:
+        db.session.rollback()
+        return make_response({"error": f"User ID `{user_id}` not found in database."}, 404)
+    db.session.commit()
+    return make_response(updated_users[user_id], 200)
+
+
+#######################################################
+############# DASHBOARD STATISTICS ROUTES #############
+#######################################################
+
+
+# GET route to view per-breed availability counts, totals, and the top adopters.
+# NOTE: Requires user privileges. (Can use decorator middleware.)
+# NOTE: Reads the incrementally maintained summary tables, so the cost grows with the
+#       number of breeds rather than the number of dogs. `?top_adopters=` (default 10)
+#       sets how many adopters are listed.
+@app.route("/api/stats")
+@query_budget(4)
+@authorization_required
+@conditional_cache(Dog, Adoption, BreedStats, UserAdoptionStats)
+def view_stats(current_user):
+    try:
+        top_adopters = min(parse_positive_int(request.args, "top_adopters", 10), 100)
+    except QueryParameterError as error:
+        return make_response({"error": str(error)}, 400)
+    return make_response(read_stats(db.session, top_adopters=top_adopters), 200)
+
+
+#######################################################
+################ CHANGE FEED ROUTES ###################
+#######################################################
+
+
+# GET route to follow dog and adoption changes after a sequence number.
+# NOTE: Requires user privileges. (Can use decorator middleware.)
+# NOTE: Without `?since=`, returns no changes and the current `next_since` cursor. Otherwise
+#       returns up to `?limit=` (default 100) changes after `since`, waiting up to `?wait=`
+#       seconds for one to commit. `?entity=dog,adoption` filters by entity. Clients sending
+#       `Accept: text/event-stream` receive a Server-Sent Events stream instead.
+@app.route("/api/changes")
+@authorization_required
+def view_changes(current_user):
+    try:
+        since = parse_positive_int(request.args, "since")
+        limit = parse_positive_int(request.args, "limit", DEFAULT_CHANGE_LIMIT)
+        wait = min(parse_positive_int(request.args, "wait", 0), app.config["CHANGE_FEED_MAX_WAIT"])
+        entities = parse_change_entities(request.args)
+        if not 1 <= limit <= MAX_CHANGE_LIMIT:
+            raise QueryParameterError(f"Query parameter `limit` must be between 1 and {MAX_CHANGE_LIMIT} (received `{limit}`).")
+    except QueryParameterError as error:
+        return make_response({"error": str(error)}, 400)
+
+    # Stream changes as Server-Sent Events, resuming after the browser's `Last-Event-ID` on reconnect.
+    if request.accept_mimetypes.best == "text/event-stream":
+        last_event_id = request.headers.get("Last-Event-ID", "")
+        if last_event_id.isdigit():
+            since = int(last_event_id)
+        elif since is None:
+            since = latest_sequence(db.session)
+        events = stream_changes(db.session, since, entities, duration=app.config["CHANGE_FEED_STREAM_DURATION"])
+        return Response(stream_with_context(events), status=200, mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    if since is None:
+        return make_response({"changes": [], "next_since": latest_sequence(db.session)}, 200)
+    changes = wait_for_changes(db.session, since, limit, entities, timeout=wait)
+    return make_response({"changes": changes, "next_since": changes[-1]["seq"] if changes else since}, 200)
+
 
 #######################################################
 ############# USER AUTHENTICATION ROUTING #############
@@ -225,28 +637,36 @@ def add_user():
         username = payload["username"]
         password = payload["password"]
 
-        # Generate salt for strenghening password encryption.
+        # Reject usernames that differ from an existing one only by case or surrounding whitespace.
+        # NOTE: Checked before hashing so duplicate signups never occupy the hashing pool.
+        if User.query.filter(User.username_normalized == normalize_username(username)).first() is not None:
+            return make_response({"error": "Username is already taken. Try another."}, 409)
+
+        # Hash password (with a fresh salt) on the bounded hashing pool.
         # NOTE: Salts add additional random bits to passwords prior to encryption.
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(password.encode("utf-8"), salt=salt)
+        try:
+            hashed_password = password_hasher.hash_password(password)
+        except HashingBackpressure as error:
+            return make_response({"error": str(error)}, 503, {"Retry-After": "1"})
 
         # Create new user instance using username and hashed password.
         new_user = User(
             username=username,
-            password=hashed_password.decode("utf-8")
+            password=hashed_password
         )
 
         if new_user is not None:
+
             # Add and commit newly created user to database.
             db.session.add(new_user)
             db.session.commit()
 
-            # Save created user ID to server-persistent session storage.
+            # Save created user's ID (and principal fields) to server-persistent session storage.
             # NOTE: Sessions are to servers what cookies are to clients.
             # NOTE: Server sessions are NOT THE SAME as database sessions! (`session != db.session`)
-            session["user_id"] = new_user.id
+            sign_in(new_user)
 
-            return make_response(new_user.to_dict(only=("id", "username", "created_at")), 201)
+            return make_response(compiled_serializer(User, only=("id", "username", "created_at")).serialize_instance(new_user), 201)
         else:
             return make_response({"error": "Invalid username or password. Try again."}, 401)
     else:
@@ -259,23 +679,25 @@ def user_login():
         # Retrieve POST request as JSONified payload.
         payload = request.get_json()
 
-        # Filter database by username to find matching user to potentially login.
-        matching_user = User.query.filter(User.username.like(f"%{payload['username']}%")).first()
+        # Filter database by exact (case-insensitive) username to find matching user to potentially login.
+        # NOTE: Matching on the indexed normalized column keeps this an index seek rather than a table scan.
+        matching_user = User.query.filter(User.username_normalized == normalize_username(payload["username"])).first()
 
         # Check submitted password against hashed password in database for authentication.
+        # NOTE: Verification runs on the bounded hashing pool so login bursts cannot starve other routes.
         if matching_user is not None:
-            AUTHENTICATION_IS_SUCCESSFUL = bcrypt.checkpw(
-                password=payload["password"].encode("utf-8"),
-                hashed_password=matching_user.password.encode("utf-8")
-            )
+            try:
+                AUTHENTICATION_IS_SUCCESSFUL = password_hasher.verify_password(payload["password"], matching_user.password)
+            except HashingBackpressure as error:
+                return make_response({"error": str(error)}, 503, {"Retry-After": "1"})
 
             if AUTHENTICATION_IS_SUCCESSFUL:
-                # Save authenticated user ID to server-persistent session storage.
+                # Save authenticated user's ID (and principal fields) to server-persistent session storage.
                 # NOTE: Sessions are to servers what cookies are to clients.
                 # NOTE: Server sessions are NOT THE SAME as database sessions! (`session != db.session`)
-                session["user_id"] = matching_user.id
+                sign_in(matching_user)
 
-                return make_response(matching_user.to_dict(only=("id", "username", "created_at")), 200)
+                return make_response(compiled_serializer(User, only=("id", "username", "created_at")).serialize_instance(matching_user), 200)
             else:
                 return make_response({"error": "Invalid username or password. Try again."}, 401)
         else:
@@ -287,16 +709,33 @@ def user_login():
 @app.route("/logout", methods=["DELETE"])
 def user_logout():
     if request.method == "DELETE":
-        # Clear user ID from server-persistent session storage.
+        # Delete the session from server-persistent session storage (and expire its cookie).
         # NOTE: Sessions are to servers what cookies are to clients.
         # NOTE: Server sessions are NOT THE SAME as database sessions! (`session != db.session`)
-        session["user_id"] = None
+        sign_out()
 
         return make_response({"msg": "User successfully logged out."}, 204)
     else:
         return make_response({"error": f"Invalid request type. (Expected DELETE; received {request.method}.)"}, 400)
 
 
+#######################################################
+########### OPERATIONAL MONITORING ROUTES #############
+#######################################################
+
+
+# GET route to scrape request performance metrics in the Prometheus text format.
+# NOTE: Disabled unless `METRICS_ENABLED=true`; with `METRICS_TOKEN` set, scrapers must send it as a bearer token.
+#       (Without a token, restrict the endpoint at the proxy.)
+@app.route("/metrics")
+def view_metrics():
+    if not app.config["METRICS_ENABLED"]:
+        return make_response({"error": "Page not found."}, 404)
+    if not is_metrics_request_authorized(request.headers.get("Authorization")):
+        return make_response({"error": "A valid metrics bearer token is required."}, 401)
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
 #######################################################
 ################ GLOBAL ERROR HANDLING ################
 #######################################################
@@ -314,4 +753,7 @@ def page_not_found(error):
         
         
 if __name__ == "__main__":
+    # Load the breed model (when configured) before serving, so the first classification is not delayed.
+    if breed_classifier.is_configured:
+        breed_classifier.start()
     app.run()
\ No newline at end of file
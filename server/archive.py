@@ -0,0 +1,117 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Configured application/server and database instances.
+from config import app, db
+# Relative access to dog, adoption, and archive models.
+from models import Dog, Adoption, DogArchive, AdoptionArchive
+# Table version counters backing cached catalog responses.
+from caching import bump_table_versions
+# SQLAlchemy Core statement construction tools.
+from sqlalchemy import select, insert, delete
+# Command line option parsing tools for the archival command.
+import click
+
+# Retention cutoff tools.
+from datetime import datetime, timedelta, timezone
+
+
+#######################################################
+######## SOFT DELETION AND ARCHIVAL OVERVIEW ##########
+#######################################################
+
+
+"""
+`DELETE /api/dogs/<id>` used to hard-delete the dog, leaving its adoptions with a
+dangling `dog_id`, and `adoption_table` only ever grew. Now:
+
+    - Removing a dog sets `deleted_at`. Soft-deleted dogs are excluded from every
+      read, patch, and adoption, and no longer count towards the breed summaries.
+    - `flask --app app archive-history` moves history out of the hot tables in
+      batches (one transaction per batch):
+          dogs soft-deleted more than `--deleted-dogs-after-days` ago, together
+          with all of their adoptions    -> `dog_archive`, `adoption_archive`
+          adoptions older than `--adoptions-after-days`    -> `adoption_archive`
+
+Archived rows keep their IDs and columns (plus `archived_at`), so they can be
+joined back together for reporting. Hot catalog reads keep seeking the
+`(is_adoptable, id)` / `(breed, id)` indexes, and per-user adoption reads the
+`(user_id, created_at)` index, over tables that only hold live rows.
+
+NOTE: Archived adoptions are no longer listed by `GET /api/users/<id>/dogs` or
+      nested in `GET /api/dogs/<id>`, but still count in the `/api/stats`
+      adopter totals (which `rebuild_stats()` reads from both tables).
+NOTE: Both kinds of moved rows are immutable (soft-deleted dogs cannot be
+      patched or adopted; adoptions are never updated), so copying and then
+      deleting a batch cannot lose a concurrent write.
+"""
+
+
+#######################################################
+######### EXPORTABLE ARCHIVAL UTILITY FUNCTIONS #######
+#######################################################
+
+
+# Helper function to compute a naive UTC cutoff `days` ago, comparable with `server_default=now()` timestamps.
+def cutoff_before(days):
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+
+# Helper function to copy the rows matching `criteria` into an archive table, then delete them.
+# NOTE: Returns the number of rows moved; the caller commits.
+def move_rows(session, model, archive_model, *criteria):
+    columns = list(model.__table__.columns)
+    session.execute(insert(archive_model).from_select([column.name for column in columns],
+                                                      select(*columns).where(*criteria)))
+    return session.execute(delete(model).where(*criteria).execution_options(synchronize_session=False)).rowcount
+
+# Move dogs soft-deleted before `deleted_before` (and all of their adoptions) to the archive tables.
+# NOTE: Commits once per batch of `batch_size` dogs; returns `(dogs moved, adoptions moved)`.
+def archive_deleted_dogs(session, deleted_before, batch_size):
+    dog_count = adoption_count = 0
+    while True:
+        dog_ids = session.scalars(select(Dog.id).where(Dog.deleted_at < deleted_before)
+                                  .order_by(Dog.id).limit(batch_size)).all()
+        if not dog_ids:
+            return dog_count, adoption_count
+        adoption_count += move_rows(session, Adoption, AdoptionArchive, Adoption.dog_id.in_(dog_ids))
+        dog_count += move_rows(session, Dog, DogArchive, Dog.id.in_(dog_ids))
+        bump_table_versions(session, Dog, Adoption)
+        session.commit()
+
+# Move adoptions created before `created_before` to the archive table.
+# NOTE: Commits once per batch of `batch_size` adoptions; returns the number moved.
+def archive_old_adoptions(session, created_before, batch_size):
+    adoption_count = 0
+    while True:
+        adoption_ids = session.scalars(select(Adoption.id).where(Adoption.created_at < created_before)
+                                       .order_by(Adoption.created_at, Adoption.id).limit(batch_size)).all()
+        if not adoption_ids:
+            return adoption_count
+        adoption_count += move_rows(session, Adoption, AdoptionArchive, Adoption.id.in_(adoption_ids))
+        bump_table_versions(session, Adoption)
+        session.commit()
+
+
+#######################################################
+############ ARCHIVAL COMMAND LINE INTERFACE ##########
+#######################################################
+
+
+# CLI command to move soft-deleted dogs and old adoptions out of the hot tables.
+# NOTE: Safe to run repeatedly (e.g. nightly from cron) while the server is serving traffic.
+@app.cli.command("archive-history")
+@click.option("--deleted-dogs-after-days", type=click.IntRange(min=0),
+              default=lambda: app.config["ARCHIVE_DELETED_DOGS_AFTER_DAYS"], show_default="ARCHIVE_DELETED_DOGS_AFTER_DAYS",
+              help="Archive dogs soft-deleted at least this many days ago.")
+@click.option("--adoptions-after-days", type=click.IntRange(min=0),
+              default=lambda: app.config["ARCHIVE_ADOPTIONS_AFTER_DAYS"], show_default="ARCHIVE_ADOPTIONS_AFTER_DAYS",
+              help="Archive adoptions created at least this many days ago.")
+@click.option("--batch-size", type=click.IntRange(min=1),
+              default=lambda: app.config["ARCHIVE_BATCH_SIZE"], show_default="ARCHIVE_BATCH_SIZE",
+              help="Rows moved per transaction.")
+def archive_history_command(deleted_dogs_after_days, adoptions_after_days, batch_size):
+    dog_count, dog_adoption_count = archive_deleted_dogs(db.session, cutoff_before(deleted_dogs_after_days), batch_size)
+    adoption_count = archive_old_adoptions(db.session, cutoff_before(adoptions_after_days), batch_size)
+    print(f">> Archived {dog_count} deleted dogs and {dog_adoption_count + adoption_count} adoptions.")
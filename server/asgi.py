@@ -0,0 +1,461 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Configured application/server and database instances.
+from config import app, db, apply_sqlite_tuning
+# Every Flask route, served unchanged for anything the async routes do not handle.
+import app as flask_routes
+# Relative access to user, dog, and adoption models.
+from models import User, Dog, Adoption, live_criteria
+# Principal resolution shared with `authorization_required`.
+from middleware import cached_session_principal, load_principal, principal_cache
+# Session loading shared with the Flask session interface.
+from sessions import load_session_cookie, session_store
+# Keyset pagination and filtering helpers shared with the catalog routes.
+from pagination import QueryParameterError, dog_filter_criteria, fetch_keyset_page, next_page_headers, parse_page
+# Precompiled flat serializers for hot list routes.
+from serializers import compiled_serializer
+# Version-keyed ETags and the process-wide response cache shared with the Flask routes.
+from caching import CACHED_HEADER_NAMES, current_table_versions, etag_for, response_cache
+# Media type negotiation and response compression shared with the Flask routes.
+from encoding import COMPRESSIBLE_MIMETYPES, best_content_encoding, best_mimetype, compress_body
+# Request latency histogram shared with the Flask routes.
+from metrics import REQUEST_DURATION
+# Breed classifier loaded at startup alongside the Flask routes.
+from inference import breed_classifier
+# Content-addressed photo storage and caching headers shared with the Flask photo routes.
+from photos import (PhotoStorageUnavailable, ThumbnailUnavailable, is_photo_key, photo_cache_headers, photo_digest,
+                    photo_mimetype, photo_store)
+# SQLAlchemy async engine, session, and URL tools.
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+# Werkzeug routing and request parsing tools.
+from werkzeug.datastructures import Headers
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import Map, Rule
+from werkzeug.sansio.request import Request
+
+# WSGI-to-ASGI adapter serving the Flask application.
+# NOTE: Required for ASGI mode (`pip install asgiref`), along with an async database driver
+#       (`aiosqlite`, `asyncpg`, ...) and an ASGI server such as `uvicorn`.
+from asgiref.wsgi import WsgiToAsgi
+
+# Future bridging and memory-mapped file tools for photo responses.
+import asyncio
+import mmap
+# High-resolution timing tools.
+from time import perf_counter
+
+
+#######################################################
+########### ASYNC SERVER MODE OVERVIEW ################
+#######################################################
+
+
+"""
+`asgi:application` serves the API from an ASGI server (e.g. `uvicorn asgi:application`)
+so that thousands of concurrent readers can wait on the database without holding a
+worker thread each:
+
+    GET /check_session, /api/dogs, /api/adopt, /api/dogs/<id>, /api/users/<id>/dogs
+        Served natively by coroutines below, over an async SQLAlchemy engine
+        (`aiosqlite`, `asyncpg`, or `aiomysql`) bound to the same models.
+
+    GET /api/photos/<key>, /api/photos/thumbnails/<key>
+        Served natively from the photo store: through the server's
+        `http.response.pathsend` extension when offered (the server sends the
+        file itself), and otherwise from a memory-mapped file in chunks.
+
+    Everything else (signup/login/logout, every write, exports, search, stats, metrics)
+        Served by the unchanged Flask application through `asgiref`'s WSGI adapter,
+        which runs it in a thread pool. Write semantics, transactions, and hooks are untouched.
+
+The async routes reuse the sync helpers (pagination, filters, serializers, table
+versions, principal loading) through `AsyncSession.run_sync()`: the helper runs on
+the event loop and each SQL round trip it makes is awaited on the async driver.
+They also share the Flask routes' ETag scheme and response cache, so a client can
+revalidate against either server and every write (made through Flask) invalidates both.
+Sessions in the SQLite session store are read on a worker thread, since its loads block.
+
+NOTE: Only `REQUEST_DURATION` is recorded for async routes; per-phase and per-query
+      metrics are collected inside Flask request contexts only.
+NOTE: In-memory SQLite databases cannot be shared between the two engines.
+"""
+
+
+#######################################################
+########## ASYNC DATABASE ENGINE AND SESSIONS #########
+#######################################################
+
+
+# Async drivers substituted into `DATABASE_URL` when `ASYNC_DATABASE_URL` is not set.
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "mysql": "mysql+aiomysql"}
+
+# Bytes per body message when streaming a memory-mapped photo.
+FILE_CHUNK_SIZE = 256 * 1024
+
+# Helper function to derive the async database URL from the Flask-SQLAlchemy engine's URL.
+# NOTE: Uses the engine's resolved URL, so relative SQLite paths point at the same file as Flask.
+def async_database_url():
+    if app.config["ASYNC_DATABASE_URL"]:
+        return make_url(app.config["ASYNC_DATABASE_URL"])
+    with app.app_context():
+        url = db.engine.url
+    if url.get_backend_name() not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver known for `{url.drivername}`; set `ASYNC_DATABASE_URL`.")
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+
+
+# Async engine and session factory bound to the same database (and pool settings) as Flask.
+# NOTE: `expire_on_commit=False` keeps loaded rows usable after a session closes without lazy refreshes.
+async_engine = create_async_engine(async_database_url(), **app.config["SQLALCHEMY_ENGINE_OPTIONS"])
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+# Apply the configured SQLite pragmas to async SQLite connections as well.
+if async_engine.dialect.name == "sqlite":
+    event.listen(async_engine.sync_engine, "connect", lambda dbapi_connection, _: apply_sqlite_tuning(dbapi_connection))
+
+
+#######################################################
+####### ASYNC REQUEST-RESPONSE UTILITY CLASSES ########
+#######################################################
+
+
+# Rendered response produced by an async route.
+class AsyncResponse:
+    __slots__ = ("status", "body", "mimetype", "headers")
+
+    def __init__(self, status, body=b"", mimetype=None, headers=None):
+        self.status = status
+        self.body = body
+        self.mimetype = mimetype
+        self.headers = dict(headers or {})
+
+
+# File response produced by an async photo route.
+class AsyncFileResponse:
+    __slots__ = ("status", "path", "mimetype", "headers")
+
+    def __init__(self, status, path, mimetype=None, headers=None):
+        self.status = status
+        self.path = path
+        self.mimetype = mimetype
+        self.headers = dict(headers or {})
+
+
+#######################################################
+###### ASYNC REQUEST-RESPONSE UTILITY FUNCTIONS #######
+#######################################################
+
+
+# Helper function to build a Werkzeug request (query arguments, cookies, `Accept` parsing) from an ASGI scope.
+def request_from_scope(scope):
+    headers = Headers([(name.decode("latin-1"), value.decode("latin-1")) for name, value in scope["headers"]])
+    client = scope.get("client") or (None, None)
+    return Request(method=scope["method"], scheme=scope.get("scheme", "http"), server=scope.get("server"),
+                   root_path=scope.get("root_path", ""), path=scope["path"],
+                   query_string=scope.get("query_string", b""), headers=headers, remote_addr=client[0])
+
+# Helper function to load the request's session (server-side or signed cookie) as the Flask routes would.
+# NOTE: Stores doing blocking I/O (the SQLite store) are read on the default executor, keeping the event loop free.
+async def request_session(request):
+    cookie = request.cookies.get(app.config["SESSION_COOKIE_NAME"])
+    if session_store is not None and session_store.blocking:
+        return await asyncio.to_thread(load_session_cookie, cookie)
+    return load_session_cookie(cookie)
+
+# Helper function to resolve a session's principal: from the session itself, the principal cache, or the database.
+async def resolve_principal(session, session_data):
+    user_id = session_data.get("user_id")
+    if not user_id:
+        return None
+    principal = cached_session_principal(session_data) or principal_cache.get(user_id)
+    if principal is None:
+        principal = await session.run_sync(lambda sync_session: load_principal(user_id, sync_session))
+    return principal
+
+# Helper function to encode a JSON-friendly object as a response in the negotiated media type.
+def encoded_response(request, obj, status, headers=None):
+    mimetype = best_mimetype(request.accept_mimetypes)
+    return AsyncResponse(status, app.json.encode(obj, mimetype), mimetype, headers)
+
+# Helper function to answer an async route with an error body.
+def error_response(request, message, status):
+    return encoded_response(request, {"error": message}, status)
+
+# Helper function to resolve the session's principal (cache first) or produce the `401` a Flask route would.
+async def authorize(request, session):
+    session_data = await request_session(request)
+    if not session_data.get("user_id"):
+        return None, error_response(request, "User account not authenticated. Please log in or sign up to continue using the application.", 401)
+    principal = await resolve_principal(session, session_data)
+    if principal is None:
+        return None, error_response(request, "Invalid username or password. Try again.", 401)
+    return principal, None
+
+# Helper function to serve a read through version-keyed ETags and the shared response cache.
+# NOTE: The async counterpart of `caching.conditional_cache`; `render` is only awaited on a cache miss.
+async def conditional_response(request, session, models, render):
+    versions = await session.run_sync(current_table_versions, *models)
+    mimetype = best_mimetype(request.accept_mimetypes)
+    etag = etag_for(request.path, request.args, versions, mimetype)
+    cache_headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+
+    if request.if_none_match.contains_weak(etag):
+        return AsyncResponse(304, headers=cache_headers)
+
+    cached_entry = response_cache.get(etag)
+    if cached_entry is not None:
+        body, mimetype, headers = cached_entry
+        return AsyncResponse(200, body, mimetype, {**headers, **cache_headers})
+
+    response = await render()
+    if response.status == 200:
+        preserved_headers = {name: response.headers[name] for name in CACHED_HEADER_NAMES if name in response.headers}
+        response_cache.put(etag, (response.body, response.mimetype, preserved_headers))
+        response.headers.update(cache_headers)
+    return response
+
+# Helper function to write a file response to the ASGI server without reading it into memory.
+# NOTE: Uses `http.response.pathsend` when the server offers it; otherwise the file is memory-mapped
+#       and sent in `FILE_CHUNK_SIZE` slices, so pages come straight from the page cache.
+async def send_file_response(send, request, response, extensions):
+    headers = Headers(response.headers)
+    headers["Content-Type"] = response.mimetype
+    if "Origin" in request.headers:
+        headers["Access-Control-Allow-Origin"] = "*"
+    headers["Vary"] = "Cookie"
+    size = response.path.stat().st_size if response.status == 200 else 0
+    headers["Content-Length"] = str(size)
+    await send({"type": "http.response.start", "status": response.status,
+                "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]})
+
+    if request.method == "HEAD" or response.status != 200 or size == 0:
+        await send({"type": "http.response.body", "body": b""})
+    elif "http.response.pathsend" in extensions:
+        await send({"type": "http.response.pathsend", "path": str(response.path)})
+    else:
+        with open(response.path, "rb") as photo_file, mmap.mmap(photo_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in range(0, size, FILE_CHUNK_SIZE):
+                await send({"type": "http.response.body", "body": mapped[offset:offset + FILE_CHUNK_SIZE],
+                            "more_body": offset + FILE_CHUNK_SIZE < size})
+
+# Helper function to write a response to the ASGI server, compressing it as `encoding.compress_response` would.
+async def send_response(send, request, response, extensions=None):
+    if isinstance(response, AsyncFileResponse):
+        return await send_file_response(send, request, response, extensions or {})
+    body = response.body
+    headers = Headers(response.headers)
+    vary = ["Accept"]
+    if response.mimetype is not None:
+        headers["Content-Type"] = response.mimetype
+
+    if (app.config["RESPONSE_COMPRESSION"] and response.status == 200 and response.mimetype in COMPRESSIBLE_MIMETYPES
+            and len(body) >= app.config["COMPRESSION_MIN_SIZE"]):
+        content_encoding = best_content_encoding(request.accept_encodings)
+        if content_encoding is not None:
+            body = compress_body(body, content_encoding)
+            headers["Content-Encoding"] = content_encoding
+            vary.append("Accept-Encoding")
+            if headers.get("ETag", "").startswith('"'):
+                headers["ETag"] = "W/" + headers["ETag"]
+
+    # Match Flask-CORS, which exposes the pagination cursor headers to browser clients from `CORS_ORIGINS`.
+    cors_origins = app.config["CORS_ORIGINS"]
+    if cors_origins:
+        origin = request.headers.get("Origin")
+        if origin is not None and cors_origins == ["*"]:
+            headers["Access-Control-Allow-Origin"] = "*"
+        elif origin in cors_origins:
+            headers["Access-Control-Allow-Origin"] = origin
+            vary.append("Origin")
+        headers["Access-Control-Expose-Headers"] = ", ".join(sorted(CACHED_HEADER_NAMES))
+    # Every async route reads the session cookie, as Flask records when a view touches `session`.
+    headers["Vary"] = ", ".join([*vary, "Cookie"])
+    headers["Content-Length"] = str(len(body) if response.status != 304 else 0)
+
+    await send({"type": "http.response.start", "status": response.status,
+                "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]})
+    await send({"type": "http.response.body", "body": b"" if request.method == "HEAD" or response.status == 304 else body})
+
+
+#######################################################
+############ ASYNC READ ROUTES FOR THE API ############
+#######################################################
+
+
+# Helper function to fetch one keyset page of serialized dogs and its next-page headers.
+# NOTE: Runs inside `AsyncSession.run_sync()`; the body matches `app.paginated_dogs_response()`.
+def dog_page(sync_session, request, criteria, serializer):
+    after_id, limit = parse_page(request.args)
+    statement = serializer.select().where(*criteria)
+    matching_rows, has_more = fetch_keyset_page(sync_session, statement, Dog.id, after_id, limit)
+    headers = next_page_headers(request.base_url, request.args, matching_rows[-1].id, limit) if has_more else {}
+    return serializer.serialize_rows(matching_rows), headers
+
+# Async counterpart of `GET /check_session`.
+async def verify_session(request, session):
+    principal = await resolve_principal(session, await request_session(request))
+    if principal is None:
+        return encoded_response(request, {"msg": "No user logged in."}, 401)
+    return encoded_response(request, principal.to_dict(), 200)
+
+# Async counterpart of `GET /api/dogs`.
+async def view_all_dogs(request, session, current_user):
+    async def render():
+        try:
+            criteria = dog_filter_criteria(Dog, request.args)
+            body, headers = await session.run_sync(dog_page, request, criteria, compiled_serializer(Dog, rules=("-adoptions",)))
+        except QueryParameterError as error:
+            return error_response(request, str(error), 400)
+        return encoded_response(request, body, 200, headers)
+    return await conditional_response(request, session, (Dog,), render)
+
+# Async counterpart of `GET /api/adopt`.
+async def view_adoptable_dogs(request, session, current_user):
+    async def render():
+        try:
+            criteria = [*dog_filter_criteria(Dog, request.args), Dog.is_adoptable.is_(True)]
+            body, headers = await session.run_sync(dog_page, request, criteria,
+                                                   compiled_serializer(Dog, only=("id", "name", "breed", "thumbnail_url")))
+        except QueryParameterError as error:
+            return error_response(request, str(error), 400)
+        return encoded_response(request, body, 200, headers)
+    return await conditional_response(request, session, (Dog,), render)
+
+# Async counterpart of `GET /api/dogs/<id>`.
+async def view_dog_by_id(request, session, current_user, dog_id):
+    def serialize_dog(sync_session):
+        matching_dog = sync_session.execute(db.select(Dog).where(Dog.id == dog_id, *live_criteria(Dog))).scalar()
+        return matching_dog.to_dict() if matching_dog is not None else None
+
+    async def render():
+        body = await session.run_sync(serialize_dog)
+        if body is None:
+            return error_response(request, f"Dog ID `{dog_id}` not found in database.", 404)
+        return encoded_response(request, body, 200)
+    return await conditional_response(request, session, (Dog, Adoption, User), render)
+
+# Async counterpart of `GET /api/users/<id>/dogs`.
+async def view_adopted_dogs_for_user(request, session, current_user, user_id):
+    def serialize_adopted_dogs(sync_session):
+        if sync_session.execute(db.select(User.id).where(User.id == user_id)).scalar() is None:
+            return None
+        serializer = compiled_serializer(Dog, rules=("-adoptions",))
+        statement = (serializer.select()
+                     .join(Adoption, Adoption.dog_id == Dog.id)
+                     .where(Adoption.user_id == user_id, *live_criteria(Dog))
+                     .order_by(Adoption.created_at, Adoption.id))
+        return serializer.serialize_rows(sync_session.execute(statement))
+
+    body = await session.run_sync(serialize_adopted_dogs)
+    if body is None:
+        return error_response(request, f"User ID `{user_id}` not found in database.", 404)
+    return encoded_response(request, body, 200)
+
+
+# Helper function to answer a photo request from a stored file (or with `304`/`404`).
+def photo_file_response(request, path, key):
+    if path is None or not path.exists():
+        return error_response(request, "Photo not found.", 404)
+    headers = photo_cache_headers(key)
+    if request.if_none_match.contains_weak(photo_digest(key)):
+        return AsyncFileResponse(304, path, photo_mimetype(key), headers)
+    return AsyncFileResponse(200, path, photo_mimetype(key), headers)
+
+# Async counterpart of `GET /api/photos/<key>`.
+async def view_photo(request, session, current_user, key):
+    return photo_file_response(request, photo_store.original_path(key) if is_photo_key(key) else None, key)
+
+# Async counterpart of `GET /api/photos/thumbnails/<key>`.
+# NOTE: A thumbnail still being generated is awaited on the photo store's thread pool, not on the event loop.
+async def view_photo_thumbnail(request, session, current_user, key):
+    if not is_photo_key(key):
+        return error_response(request, "Photo not found.", 404)
+    try:
+        future = photo_store.thumbnail_future(key)
+        path = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), photo_store.thumbnail_timeout) if future else None
+    except (PhotoStorageUnavailable, ThumbnailUnavailable) as error:
+        return error_response(request, str(error), 503)
+    except TimeoutError:
+        return error_response(request, "The thumbnail is still being generated. Please retry shortly.", 503)
+    return photo_file_response(request, path, key)
+
+
+# Routes served natively by the async server, keyed by the same rules as their Flask counterparts.
+# NOTE: `authorized` routes resolve the session's principal first, as `authorization_required` does.
+ASYNC_ROUTES = Map([
+    Rule("/check_session", endpoint=(verify_session, False), methods=["GET"]),
+    Rule("/api/dogs", endpoint=(view_all_dogs, True), methods=["GET"]),
+    Rule("/api/adopt", endpoint=(view_adoptable_dogs, True), methods=["GET"]),
+    Rule("/api/dogs/<int:dog_id>", endpoint=(view_dog_by_id, True), methods=["GET"]),
+    Rule("/api/users/<int:user_id>/dogs", endpoint=(view_adopted_dogs_for_user, True), methods=["GET"]),
+    Rule("/api/photos/<key>", endpoint=(view_photo, True), methods=["GET"]),
+    Rule("/api/photos/thumbnails/<key>", endpoint=(view_photo_thumbnail, True), methods=["GET"]),
+])
+
+
+#######################################################
+############ ASGI APPLICATION ENTRYPOINT ##############
+#######################################################
+
+
+# The Flask application, adapted to ASGI for every request without a native async route.
+flask_application = WsgiToAsgi(flask_routes.app)
+
+# Helper function to serve one request through a native async route.
+async def serve_async_route(send, request, rule, values, extensions):
+    handler, authorized = rule.endpoint
+    started = perf_counter()
+    async with AsyncSessionLocal() as session:
+        try:
+            if authorized:
+                current_user, response = await authorize(request, session)
+                if response is None:
+                    response = await handler(request, session, current_user, **values)
+            else:
+                response = await handler(request, session, **values)
+        except Exception as error:
+            response = encoded_response(request, {"error": "Something went wrong.", "details": str(error)}, 500)
+    await send_response(send, request, response, extensions)
+    REQUEST_DURATION.observe(perf_counter() - started, method=request.method, route=rule.rule, status=response.status)
+
+# ASGI application: native async read routes first, the Flask application for everything else.
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                # Load the breed model (when configured) before serving, so the first classification is not delayed.
+                if breed_classifier.is_configured:
+                    breed_classifier.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await async_engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope["type"] == "http":
+        adapter = ASYNC_ROUTES.bind("", path_info=scope["path"])
+        try:
+            rule, values = adapter.match(method=scope["method"], return_rule=True)
+        except HTTPException:
+            rule = None
+        if rule is not None:
+            return await serve_async_route(send, request_from_scope(scope), rule, values, scope.get("extensions") or {})
+
+    return await flask_application(scope, receive, send)
+
+
+#######################################################
+######### ASGI SERVER BOILERPLATE FOR EXECUTION #######
+#######################################################
+
+
+if __name__ == "__main__":
+    # OPTIONAL: Development ASGI server. (Production: `uvicorn asgi:application --workers N`.)
+    import uvicorn
+    uvicorn.run("asgi:application", port=5555)
@@ -0,0 +1,207 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Make server modules (`config`, `models`, ...) importable when run from any directory.
+import os
+import sys
+SERVER_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, SERVER_DIRECTORY)
+
+# HTTP client and cookie session tools for driving the servers under test.
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+# Benchmark process, timing, randomness, and argument parsing tools.
+from argparse import ArgumentParser
+from random import Random
+from statistics import quantiles
+from tempfile import TemporaryDirectory
+from time import perf_counter, sleep
+import json
+import subprocess
+import threading
+
+
+#######################################################
+############ BENCHMARK SCENARIO DEFINITIONS ###########
+#######################################################
+
+
+# Database modes compared when no `--database-url` is given.
+SQLITE_MODES = [
+    ("sqlite-default", {"SQLITE_TUNING": "false"}),
+    ("sqlite-tuned", {"SQLITE_TUNING": "true"}),
+]
+
+# Sample administrator account created by `seed.py`.
+ADMIN_CREDENTIALS = {"username": "amazing_administrator", "password": "abcde12345"}
+
+
+#######################################################
+########## SERVER-SIDE BENCHMARK ROLE(S) ##############
+#######################################################
+
+
+# Create the schema and seed synthetic dogs in the configured (scratch) database.
+def prepare_database(dog_count):
+    from config import app, db
+    import seed
+    with app.app_context():
+        db.create_all()
+        seed.seed_database(seed.parse_arguments(["--dogs", str(dog_count), "--users", "100", "--fast-pragmas"]))
+
+# Serve the application with a threaded WSGI server, as one "worker" process.
+def serve(port):
+    from werkzeug.serving import make_server
+    from app import app
+    make_server("127.0.0.1", port, app, threaded=True).serve_forever()
+
+
+#######################################################
+########## CLIENT-SIDE BENCHMARK FUNCTION(S) ##########
+#######################################################
+
+
+# Helper function to start a server subprocess for the given role and environment.
+def spawn(role, environment, *arguments):
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__), "--role", role, *arguments],
+                            cwd=SERVER_DIRECTORY, env=environment,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+# Helper function to wait until a server accepts HTTP requests.
+def wait_for_server(base_url, timeout=30):
+    deadline = perf_counter() + timeout
+    while perf_counter() < deadline:
+        try:
+            build_opener().open(base_url + "/", timeout=1)
+            return
+        except (URLError, ConnectionError):
+            sleep(0.1)
+    raise SystemExit(f"Server at {base_url} did not start.")
+
+# Helper function to issue a JSON request and return its status code.
+def send(opener, method, url, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    request = Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with opener.open(request, timeout=30) as response:
+            response.read()
+            return response.status
+    except HTTPError as error:
+        return error.code
+
+# Drive mixed read/write traffic from concurrent clients against every worker.
+def drive_traffic(base_urls, clients, duration, write_ratio, dog_count, seed):
+    stop = threading.Event()
+    lock = threading.Lock()
+    samples = {"read": [], "write": []}
+    errors = {"read": 0, "write": 0}
+
+    def client(index):
+        rng = Random(seed + index)
+        base_url = base_urls[index % len(base_urls)]
+        opener = build_opener(HTTPCookieProcessor(CookieJar()))
+        send(opener, "POST", base_url + "/login", ADMIN_CREDENTIALS)
+        while not stop.is_set():
+            kind = "write" if rng.random() < write_ratio else "read"
+            dog_id = rng.randint(1, dog_count)
+            start = perf_counter()
+            if kind == "read" and rng.random() < 0.5:
+                status = send(opener, "GET", f"{base_url}/api/adopt?limit=20&after_id={dog_id}")
+            elif kind == "read":
+                status = send(opener, "GET", f"{base_url}/api/dogs/{dog_id}")
+            elif rng.random() < 0.5:
+                status = send(opener, "POST", base_url + "/api/dogs", {"name": f"Bench {dog_id}", "breed": "Beagle"})
+            else:
+                status = send(opener, "PATCH", f"{base_url}/api/dogs/{dog_id}", {"name": f"Renamed {dog_id}"})
+            elapsed = perf_counter() - start
+            with lock:
+                samples[kind].append(elapsed)
+                if status >= 500:
+                    errors[kind] += 1
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    for thread in threads:
+        thread.start()
+    sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    report = {}
+    for kind, latencies in samples.items():
+        percentiles = quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+        report[kind] = {"requests_per_second": round(len(latencies) / duration, 1), "errors": errors[kind],
+                        "p50_ms": round(percentiles[49] * 1000, 2), "p99_ms": round(percentiles[98] * 1000, 2)}
+    return report
+
+# Run one database mode end to end: prepare a database, start workers, drive traffic, and stop workers.
+def run_mode(environment, options):
+    prepare = spawn("prepare", environment, "--dogs", str(options.dogs))
+    if prepare.wait() != 0:
+        raise SystemExit("Database preparation failed.")
+
+    ports = [options.port + index for index in range(options.workers)]
+    workers = [spawn("serve", environment, "--port", str(port)) for port in ports]
+    try:
+        base_urls = [f"http://127.0.0.1:{port}" for port in ports]
+        for base_url in base_urls:
+            wait_for_server(base_url)
+        return drive_traffic(base_urls, options.clients, options.duration, options.write_ratio, options.dogs, options.seed)
+    finally:
+        for worker in workers:
+            worker.terminate()
+            worker.wait()
+
+# Benchmark each database mode and print a throughput report per mode.
+def run_benchmark(options):
+    with TemporaryDirectory() as scratch_directory:
+        if options.database_url:
+            modes = [("custom", {"DATABASE_URL": options.database_url})]
+        else:
+            modes = [(label, {**settings, "DATABASE_URL": f"sqlite:///{os.path.join(scratch_directory, label + '.db')}"})
+                     for label, settings in SQLITE_MODES]
+
+        print(f">> {options.workers} worker process(es), {options.clients} clients, {options.duration:.0f}s per mode, "
+              f"{options.write_ratio:.0%} writes, {options.dogs} seeded dogs.\n")
+        results = {}
+        for label, settings in modes:
+            environment = {**os.environ, "SECRET_KEY": "benchmark", "BCRYPT_ROUNDS": "4", **settings}
+            results[label] = run_mode(environment, options)
+            total = sum(kind["requests_per_second"] for kind in results[label].values())
+            print(f"\t{label:<15} total: {total:8.1f} req/s"
+                  + "".join(f" | {kind}: {stats['requests_per_second']:7.1f} req/s, {stats['errors']} errors,"
+                            f" p50 {stats['p50_ms']:7.2f} ms, p99 {stats['p99_ms']:8.2f} ms"
+                            for kind, stats in results[label].items()))
+        if options.output:
+            with open(options.output, "w") as output_file:
+                json.dump(results, output_file, indent=2)
+
+
+#######################################################
+######### BENCHMARK BOILERPLATE FOR EXECUTION #########
+#######################################################
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compare database modes under concurrent mixed read/write traffic.")
+    parser.add_argument("--role", choices=["benchmark", "prepare", "serve"], default="benchmark", help="Process role (`prepare` and `serve` are spawned internally).")
+    parser.add_argument("--database-url", default=None, help="Benchmark this database URL instead of the SQLite modes.")
+    parser.add_argument("--dogs", type=int, default=50000, help="Number of synthetic dogs to seed.")
+    parser.add_argument("--workers", type=int, default=4, help="Number of server processes (like gunicorn workers).")
+    parser.add_argument("--clients", type=int, default=32, help="Number of concurrent HTTP clients.")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of traffic per mode.")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="Fraction of requests that write.")
+    parser.add_argument("--port", type=int, default=5100, help="First port for worker processes.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for client traffic.")
+    parser.add_argument("--output", default=None, help="Optional path for a JSON report.")
+    options = parser.parse_args()
+
+    if options.role == "prepare":
+        prepare_database(options.dogs)
+    elif options.role == "serve":
+        serve(options.port)
+    else:
+        run_benchmark(options)
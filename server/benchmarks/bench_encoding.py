@@ -0,0 +1,89 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Make server modules (`config`, `models`, ...) importable when run from any directory.
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+# Configured application/server instance.
+from config import app
+# Response encoders and compressors under benchmark.
+from encoding import orjson, msgpack, brotli, compress_body
+
+# Standard library JSON encoder used as the baseline.
+import json
+
+# Benchmark timing and argument parsing tools.
+from argparse import ArgumentParser
+from time import perf_counter
+
+
+#######################################################
+########### DEFINING BENCHMARK FUNCTION(S) ############
+#######################################################
+
+
+# Helper function to build a catalog page shaped like `GET /api/dogs` output.
+def build_payload(rows):
+    return [{"breed": f"Breed {index % 120}", "created_at": "2024-01-01 12:00:00", "id": index,
+             "is_adoptable": index % 3 != 0, "name": f"Dog {index}"} for index in range(rows)]
+
+# Helper function to time a callable over several repetitions and keep the best run.
+def best_of(repeat, func):
+    best_time, result = float("inf"), None
+    for _ in range(repeat):
+        start = perf_counter()
+        result = func()
+        best_time = min(best_time, perf_counter() - start)
+    return best_time, result
+
+# Helper function to list the available encoders as `(label, encode)` pairs.
+# NOTE: Optional encoders that are not installed are skipped.
+def available_encoders():
+    encoders = [
+        ("json (indented)", lambda payload: json.dumps(payload, indent=2, sort_keys=True).encode("utf-8")),
+        ("json (compact)", lambda payload: json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")),
+    ]
+    if orjson is not None:
+        encoders.append(("orjson", lambda payload: orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)))
+    if msgpack is not None:
+        encoders.append(("msgpack", lambda payload: msgpack.packb(payload, use_bin_type=True)))
+    return encoders
+
+# Helper function to list the available content codings.
+def available_content_encodings():
+    return [None, "gzip"] + (["br"] if brotli is not None else [])
+
+# Benchmark every encoder and content coding over the same payload.
+def run_benchmark(rows, repeat):
+    payload = build_payload(rows)
+    print(f">> Encoding {rows} catalog rows per combination (best of {repeat}).\n")
+    with app.app_context():
+        for label, encode in available_encoders():
+            encode_time, body = best_of(repeat, lambda: encode(payload))
+            for content_encoding in available_content_encodings():
+                if content_encoding is None:
+                    compress_time, wire_body = 0.0, body
+                else:
+                    compress_time, wire_body = best_of(repeat, lambda: compress_body(body, content_encoding))
+                print(f"\t{label:<16} {content_encoding or 'identity':<9}"
+                      f" | bytes: {len(wire_body):>10,}"
+                      f" | encode: {encode_time * 1000:7.1f} ms"
+                      f" | compress: {compress_time * 1000:7.1f} ms"
+                      f" | total: {(encode_time + compress_time) * 1000:7.1f} ms")
+
+
+#######################################################
+######### BENCHMARK BOILERPLATE FOR EXECUTION #########
+#######################################################
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compare response body size and encoding cost across encoders and codings.")
+    parser.add_argument("--rows", type=int, default=10000, help="Number of catalog rows in the payload.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement.")
+    arguments = parser.parse_args()
+    run_benchmark(arguments.rows, arguments.repeat)
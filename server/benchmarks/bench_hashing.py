@@ -0,0 +1,131 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Make server modules (`config`, `models`, ...) importable when run from any directory.
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+# Configured application/server and database instances.
+from config import app, db
+# Relative access to user model.
+from models import User
+# Full route table for the application under benchmark.
+import app as routes
+# Bounded password hashing service under benchmark.
+from hashing import PasswordHasher, bcrypt_verify
+
+# Benchmark timing, threading, and argument parsing tools.
+from argparse import ArgumentParser
+from statistics import quantiles
+from time import perf_counter, sleep
+import threading
+
+
+#######################################################
+########### DEFINING BENCHMARK FUNCTION(S) ############
+#######################################################
+
+
+# Prefix for throwaway benchmark accounts (removed again after the run).
+BENCHMARK_USERNAME_PREFIX = "bench_hashing_user_"
+BENCHMARK_PASSWORD = "benchmark-password"
+
+
+# Inline stand-in for `PasswordHasher` that reproduces the previous on-request-thread hashing.
+class InlineHasher:
+    def verify_password(self, password, hashed_password):
+        return bcrypt_verify(password, hashed_password)
+
+# Helper function to create benchmark accounts sharing one precomputed hash.
+def create_benchmark_users(count, hasher):
+    hashed_password = hasher.hash_password(BENCHMARK_PASSWORD)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([User(username=f"{BENCHMARK_USERNAME_PREFIX}{index}", password=hashed_password)
+                            for index in range(count)])
+        db.session.commit()
+
+# Helper function to remove benchmark accounts.
+def remove_benchmark_users():
+    with app.app_context():
+        User.query.filter(User.username.startswith(BENCHMARK_USERNAME_PREFIX)).delete(synchronize_session=False)
+        db.session.commit()
+
+# Run one hashing storm: login threads hammer `/login` while probe threads time an unrelated route.
+def run_storm(hasher, login_threads, probe_threads, duration):
+    routes.password_hasher = hasher
+    stop = threading.Event()
+    login_statuses, probe_latencies = [], []
+    lock = threading.Lock()
+
+    def login_worker(index):
+        client = app.test_client()
+        payload = {"username": f"{BENCHMARK_USERNAME_PREFIX}{index}", "password": BENCHMARK_PASSWORD}
+        while not stop.is_set():
+            status = client.post("/login", json=payload).status_code
+            with lock:
+                login_statuses.append(status)
+
+    def probe_worker():
+        client = app.test_client()
+        while not stop.is_set():
+            start = perf_counter()
+            client.get("/")
+            with lock:
+                probe_latencies.append(perf_counter() - start)
+            sleep(0.005)
+
+    threads = [threading.Thread(target=login_worker, args=(index,)) for index in range(login_threads)]
+    threads += [threading.Thread(target=probe_worker) for _ in range(probe_threads)]
+    for thread in threads:
+        thread.start()
+    sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    percentiles = quantiles(probe_latencies, n=100) if len(probe_latencies) > 1 else [0.0] * 99
+    return {
+        "logins_per_second": login_statuses.count(200) / duration,
+        "rejected_logins": login_statuses.count(503),
+        "probe_p50_ms": percentiles[49] * 1000,
+        "probe_p99_ms": percentiles[98] * 1000,
+    }
+
+# Compare inline hashing against the bounded pool under the same login storm.
+def run_benchmark(login_threads, probe_threads, duration, rounds, workers, queue_size):
+    pooled_hasher = PasswordHasher(rounds=rounds, max_workers=workers, max_pending=queue_size)
+    create_benchmark_users(login_threads, pooled_hasher)
+    try:
+        print(f">> {login_threads} login threads, {probe_threads} probe threads on `GET /`, "
+              f"{duration:.0f}s per mode, bcrypt cost {rounds}.\n")
+        for label, hasher in [("inline", InlineHasher()), (f"pool({workers}+{queue_size})", pooled_hasher)]:
+            result = run_storm(hasher, login_threads, probe_threads, duration)
+            print(f"\t{label:<14} logins/sec: {result['logins_per_second']:7.1f}"
+                  f" | rejected (503): {result['rejected_logins']:5d}"
+                  f" | probe p50: {result['probe_p50_ms']:7.2f} ms"
+                  f" | probe p99: {result['probe_p99_ms']:7.2f} ms")
+    finally:
+        pooled_hasher.shutdown()
+        remove_benchmark_users()
+
+
+#######################################################
+######### BENCHMARK BOILERPLATE FOR EXECUTION #########
+#######################################################
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Measure login throughput and unrelated-route latency during a hashing storm.")
+    parser.add_argument("--login-threads", type=int, default=32, help="Concurrent clients posting to `/login`.")
+    parser.add_argument("--probe-threads", type=int, default=4, help="Concurrent clients timing `GET /`.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per mode.")
+    parser.add_argument("--rounds", type=int, default=app.config["BCRYPT_ROUNDS"], help="bcrypt cost factor.")
+    parser.add_argument("--workers", type=int, default=app.config["PASSWORD_HASH_WORKERS"], help="Hashing pool size.")
+    parser.add_argument("--queue-size", type=int, default=app.config["PASSWORD_HASH_QUEUE_SIZE"], help="Hashing queue size.")
+    arguments = parser.parse_args()
+    run_benchmark(arguments.login_threads, arguments.probe_threads, arguments.duration,
+                  arguments.rounds, arguments.workers, arguments.queue_size)
@@ -0,0 +1,135 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Make server modules (`config`, `models`, ...) importable when run from any directory.
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+# Configured application/server and database instances.
+from config import app, db
+# Relative access to dog and adoption models.
+from models import Dog, Adoption
+# Recommendation index under benchmark.
+from recommendations import POPULARITY_WEIGHT, RecommendationIndex
+
+# Array math for the per-dog baseline's breed embeddings.
+import numpy as np
+# SQLAlchemy standalone engine and session tools.
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+# Benchmark timing, randomness, and argument parsing tools.
+from argparse import ArgumentParser
+from random import Random
+from statistics import median, quantiles
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+
+#######################################################
+############ BENCHMARK SCENARIO DEFINITIONS ###########
+#######################################################
+
+
+# Breeds assigned to synthetic dogs, in groups that synthetic users tend to adopt together.
+BREED_GROUPS = [[f"Group {group} Breed {index}" for index in range(8)] for group in range(15)]
+BREEDS = [breed for group in BREED_GROUPS for breed in group]
+
+
+#######################################################
+########### DEFINING BENCHMARK FUNCTION(S) ############
+#######################################################
+
+
+# Helper function to populate a throwaway SQLite database with synthetic dogs and grouped adoptions.
+def build_database(path, rows, users, adoptions_per_user, seed):
+    engine = create_engine(f"sqlite:///{path}")
+    db.metadata.create_all(engine)
+    rng = Random(seed)
+    batch_size = 50000
+    with engine.begin() as connection:
+        for start in range(1, rows + 1, batch_size):
+            connection.execute(insert(Dog), [{"id": dog_id, "name": f"Dog {dog_id}", "breed": rng.choice(BREEDS),
+                                              "is_adoptable": rng.random() < 0.7}
+                                             for dog_id in range(start, min(start + batch_size, rows + 1))])
+        # NOTE: Adopted dogs are picked from each user's favorite breed group (foreign keys are not enforced).
+        breed_dog_ids = {}
+        for dog_id, breed in connection.execute(select(Dog.id, Dog.breed)):
+            breed_dog_ids.setdefault(breed, []).append(dog_id)
+        connection.execute(insert(Adoption), [{"user_id": user_id,
+                                               "dog_id": rng.choice(breed_dog_ids[rng.choice(favorite_group)])}
+                                              for user_id in range(1, users + 1)
+                                              for favorite_group in [rng.choice(BREED_GROUPS)]
+                                              for _ in range(adoptions_per_user)])
+    return engine
+
+# Helper function to summarize timings as `(p50, p99)` in milliseconds.
+def percentiles(timings):
+    return median(timings) * 1000, quantiles(timings, n=100)[98] * 1000
+
+# Score every adoptable dog one at a time in Python, the way a naive route would.
+def recommend_per_dog(session, index, user_id, limit=10):
+    embeddings = index.embeddings
+    adopted = session.execute(select(Dog.breed).join(Adoption, Adoption.dog_id == Dog.id)
+                              .where(Adoption.user_id == user_id)).scalars().all()
+    user_vector = np.mean([embeddings.vectors[embeddings.index[breed]] for breed in adopted], axis=0).tolist()
+    scored = []
+    for dog_id, breed in session.execute(select(Dog.id, Dog.breed).where(Dog.is_adoptable.is_(True))):
+        position = embeddings.index[breed]
+        vector = embeddings.vectors[position].tolist()
+        score = sum(left * right for left, right in zip(user_vector, vector))
+        scored.append((score + POPULARITY_WEIGHT * float(embeddings.popularity[position]), dog_id))
+    return sorted(scored, reverse=True)[:limit]
+
+# Build the index over a freshly built database and time recommendations for random users.
+def run_benchmark(rows, users, adoptions_per_user, dimensions, repeat, seed):
+    rng = Random(seed)
+    with TemporaryDirectory() as scratch_directory:
+        print(f">> Building {rows} dogs and {users * adoptions_per_user} adoptions...")
+        start = perf_counter()
+        engine = build_database(os.path.join(scratch_directory, "recommendations.db"), rows, users,
+                                adoptions_per_user, seed)
+        print(f"\t>> Built in {perf_counter() - start:.1f}s.\n")
+
+        with app.app_context(), Session(engine) as session:
+            index = RecommendationIndex(dimensions=dimensions, rebuild_interval=float("inf"))
+            start = perf_counter()
+            index.rebuild(session)
+            matrix, ids, size = index._snapshot
+            print(f">> Index rebuilt in {perf_counter() - start:.2f}s: {size} adoptable dogs, "
+                  f"{matrix.shape[0]} features, {matrix[:, :size].nbytes / 1024 / 1024:.0f} MiB.\n")
+
+            print(f">> Timing recommendations (top 10, {repeat} random users).\n")
+            user_ids = [rng.randint(1, users) for _ in range(repeat)]
+            index.recommend(session, user_ids[0])
+            timings = []
+            for user_id in user_ids:
+                start = perf_counter()
+                index.recommend(session, user_id)
+                timings.append(perf_counter() - start)
+            print("\t{:<26} p50 {:8.2f} ms | p99 {:8.2f} ms".format("vectorized (index)", *percentiles(timings)))
+
+            start = perf_counter()
+            recommend_per_dog(session, index, user_ids[0])
+            print(f"\t{'per-dog Python scoring':<26} {(perf_counter() - start) * 1000:12.2f} ms (one request)")
+
+
+#######################################################
+######### BENCHMARK BOILERPLATE FOR EXECUTION #########
+#######################################################
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Time vectorized dog recommendations on a large synthetic dog table.")
+    parser.add_argument("--rows", type=int, default=1000000, help="Number of synthetic dogs.")
+    parser.add_argument("--users", type=int, default=5000, help="Number of synthetic adopters.")
+    parser.add_argument("--adoptions-per-user", type=int, default=4, help="Adoptions per synthetic adopter.")
+    parser.add_argument("--dimensions", type=int, default=16, help="Breed embedding dimensions.")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed requests.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for synthetic data.")
+    arguments = parser.parse_args()
+    run_benchmark(arguments.rows, arguments.users, arguments.adoptions_per_user, arguments.dimensions,
+                  arguments.repeat, arguments.seed)
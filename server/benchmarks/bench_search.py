@@ -0,0 +1,119 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Make server modules (`config`, `models`, ...) importable when run from any directory.
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+# Configured application/server and database instances.
+from config import app, db
+# Relative access to the dog model.
+from models import Dog
+# Precompiled flat serializers used by the search route.
+from serializers import compiled_serializer
+# Search statement builders under benchmark.
+from search import search_statement, breed_facets
+# Keyset pagination helper used by the search route.
+from pagination import fetch_keyset_page
+# Synthetic name stems shared with the seeder.
+from seed import SYNTHETIC_DOG_NAMES
+
+# SQLAlchemy standalone engine and session tools.
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+# Benchmark timing, randomness, and argument parsing tools.
+from argparse import ArgumentParser
+from random import Random
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+
+#######################################################
+############ BENCHMARK SCENARIO DEFINITIONS ###########
+#######################################################
+
+
+# Breeds assigned to synthetic dogs.
+BREEDS = ["Beagle", "Basenji", "Irish Wolfhound", "Rottweiler", "Malamute", "Viszla", "Pomeranian",
+          "Siberian Husky"] + [f"Mixed Breed {index}" for index in range(112)]
+
+# Search requests timed per run: (label, q, breed, mode, after_id fraction, facets).
+SCENARIOS = [
+    ("common prefix", "ma", None, "prefix", 0.0, False),
+    ("common prefix, deep page", "ma", None, "prefix", 0.95, False),
+    ("two-word breed", "siberian husky", None, "prefix", 0.0, False),
+    ("rare name", "luna 4242", None, "prefix", 0.0, False),
+    ("breed facet filter", "max", "Beagle", "prefix", 0.0, False),
+    ("substring", "asenj", None, "substring", 0.0, False),
+    ("fuzzy typo", "beagel", None, "fuzzy", 0.0, False),
+    ("rare name + facets", "luna 42", None, "prefix", 0.0, True),
+]
+
+
+#######################################################
+########### DEFINING BENCHMARK FUNCTION(S) ############
+#######################################################
+
+
+# Helper function to populate a throwaway SQLite database (with search indexes) with synthetic dogs.
+def build_database(path, rows, seed):
+    engine = create_engine(f"sqlite:///{path}")
+    db.metadata.create_all(engine)
+    rng = Random(seed)
+    batch_size = 50000
+    with engine.begin() as connection:
+        for start in range(1, rows + 1, batch_size):
+            connection.execute(insert(Dog), [{"id": dog_id, "name": f"{rng.choice(SYNTHETIC_DOG_NAMES)} {dog_id}",
+                                              "breed": rng.choice(BREEDS), "is_adoptable": rng.random() < 0.7}
+                                             for dog_id in range(start, min(start + batch_size, rows + 1))])
+    return engine
+
+# Run one search request the way `GET /api/dogs/search` does.
+def run_search(session, serializer, query, breed, mode, after_id, include_facets, limit=20):
+    statement, key_column = search_statement(session, serializer, query, breed, mode)
+    if breed:
+        statement = statement.where(Dog.breed == breed)
+    rows, _ = fetch_keyset_page(session, statement, key_column, after_id, limit)
+    facets = breed_facets(session, statement) if include_facets else None
+    return rows, facets
+
+# Time every scenario against a freshly built database.
+def run_benchmark(rows, repeat, seed):
+    serializer = compiled_serializer(Dog, rules=("-adoptions",))
+    with TemporaryDirectory() as scratch_directory:
+        print(f">> Building {rows} dogs with search indexes...")
+        start = perf_counter()
+        engine = build_database(os.path.join(scratch_directory, "search.db"), rows, seed)
+        print(f"\t>> Built in {perf_counter() - start:.1f}s.\n")
+
+        print(f">> Timing searches (median of {repeat}, first page of 20).\n")
+        with app.app_context(), Session(engine) as session:
+            for label, query, breed, mode, after_fraction, include_facets in SCENARIOS:
+                after_id = int(rows * after_fraction)
+                run_search(session, serializer, query, breed, mode, after_id, include_facets)
+                timings = []
+                for _ in range(repeat):
+                    start = perf_counter()
+                    matching_rows, facets = run_search(session, serializer, query, breed, mode, after_id, include_facets)
+                    timings.append(perf_counter() - start)
+                print(f"\t{label:<26} {median(timings) * 1000:8.2f} ms | rows: {len(matching_rows):>3}"
+                      + (f" | facets: {len(facets)}" if facets is not None else ""))
+
+
+#######################################################
+######### BENCHMARK BOILERPLATE FOR EXECUTION #########
+#######################################################
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Time indexed catalog searches on a large synthetic dog table.")
+    parser.add_argument("--rows", type=int, default=1000000, help="Number of synthetic dogs.")
+    parser.add_argument("--repeat", type=int, default=20, help="Repetitions per scenario.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for synthetic data.")
+    arguments = parser.parse_args()
+    run_benchmark(arguments.rows, arguments.repeat, arguments.seed)
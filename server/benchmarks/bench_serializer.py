@@ -0,0 +1,106 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Make server modules (`config`, `models`, ...) importable when run from any directory.
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+# Configured application/server and database instances.
+from config import app, db
+# Relative access to user, dog, and adoption models.
+from models import User, Dog
+# Precompiled flat serializers under benchmark.
+from serializers import compiled_serializer
+
+# SQLAlchemy standalone engine and session tools.
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+# Benchmark timing and argument parsing tools.
+from argparse import ArgumentParser
+from time import perf_counter
+
+
+#######################################################
+############ BENCHMARK SCENARIO DEFINITIONS ###########
+#######################################################
+
+
+# Serialization specs currently used by hot routes in `app.py`.
+SCENARIOS = [
+    ("GET /api/dogs", Dog, (), ("-adoptions",)),
+    ("GET /api/adopt", Dog, ("id", "name", "breed"), ()),
+    ("POST /login", User, ("id", "username", "created_at"), ()),
+]
+
+
+#######################################################
+########### DEFINING BENCHMARK FUNCTION(S) ############
+#######################################################
+
+
+# Helper function to populate a throwaway in-memory database with synthetic rows.
+def build_database(rows):
+    engine = create_engine("sqlite://")
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Dog), [{"name": f"Dog {index}", "breed": f"Breed {index % 120}",
+                                          "is_adoptable": index % 3 != 0} for index in range(rows)])
+        connection.execute(insert(User), [{"username": f"user_{index}", "username_normalized": f"user_{index}", "password": "x",
+                                           "is_admin": index % 50 == 0} for index in range(rows)])
+    return engine
+
+# Helper function to time a callable over several repetitions and keep the best run.
+def best_of(repeat, func):
+    best_time, result = float("inf"), None
+    for _ in range(repeat):
+        start = perf_counter()
+        result = func()
+        best_time = min(best_time, perf_counter() - start)
+    return best_time, result
+
+# Benchmark `to_dict()` over ORM instances against compiled serializers over row tuples.
+# NOTE: Both paths include the time spent fetching rows from the database.
+def run_benchmark(rows, repeat):
+    engine = build_database(rows)
+    print(f">> Serializing {rows} rows per scenario (best of {repeat}).\n")
+    for label, model, only, rules in SCENARIOS:
+        serializer = compiled_serializer(model, only=only, rules=rules)
+
+        def with_to_dict():
+            with Session(engine) as session:
+                return [instance.to_dict(only=only, rules=rules) for instance in session.scalars(select(model))]
+
+        def with_compiled_serializer():
+            with Session(engine) as session:
+                return serializer.serialize_rows(session.execute(serializer.select()))
+
+        to_dict_time, expected = best_of(repeat, with_to_dict)
+        compiled_time, actual = best_of(repeat, with_compiled_serializer)
+
+        # Compare the exact bytes the application would send over the wire.
+        with app.app_context():
+            is_identical = app.json.dumps(expected).encode() == app.json.dumps(actual).encode()
+
+        print(f"\t{label:<16} to_dict: {to_dict_time * 1000:9.1f} ms"
+              f" | compiled: {compiled_time * 1000:9.1f} ms"
+              f" | speedup: {to_dict_time / compiled_time:5.1f}x"
+              f" | byte-identical: {is_identical}")
+        if not is_identical:
+            raise SystemExit(f"Compiled serializer output differs from `to_dict()` for {label}.")
+
+
+#######################################################
+######### BENCHMARK BOILERPLATE FOR EXECUTION #########
+#######################################################
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compare `SerializerMixin.to_dict()` with precompiled serializers.")
+    parser.add_argument("--rows", type=int, default=10000, help="Number of rows per model.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement.")
+    arguments = parser.parse_args()
+    run_benchmark(arguments.rows, arguments.repeat)
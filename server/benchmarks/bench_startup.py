@@ -0,0 +1,109 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Child interpreter, path, and environment tools.
+import os
+import subprocess
+import sys
+
+# Benchmark timing, parsing, and argument parsing tools.
+from argparse import ArgumentParser
+from statistics import median
+from time import perf_counter
+
+
+#######################################################
+############ BENCHMARK SCENARIO DEFINITIONS ###########
+#######################################################
+
+
+# Directory holding the server modules (child interpreters import from here).
+SERVER_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+# Optional components that worker boot should not import (see `config.py` and `lazy.py`).
+DEFERRED_MODULES = ["alembic", "flask_migrate", "seed", "numpy", "PIL.Image", "onnxruntime"]
+
+# Child interpreter script: time importing the target, then report which deferred modules were loaded.
+CHILD_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {target}
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(name for name in {deferred!r} if name in sys.modules and name != "{target}"))
+"""
+
+
+#######################################################
+########### DEFINING BENCHMARK FUNCTION(S) ############
+#######################################################
+
+
+# Helper function to run one fresh interpreter, returning `(import seconds, process seconds, loaded deferred modules, stderr)`.
+def boot_once(target, importtime=False):
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c",
+               CHILD_SCRIPT.format(target=target, deferred=DEFERRED_MODULES)]
+    start = perf_counter()
+    completed = subprocess.run(command, cwd=SERVER_DIRECTORY, capture_output=True, text=True,
+                               env={"SECRET_KEY": "bench-startup", **os.environ})
+    process_seconds = perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing `{target}` failed:\n{completed.stderr}")
+    import_seconds, _, loaded = completed.stdout.strip().splitlines()[-1].partition(" ")
+    return float(import_seconds), process_seconds, [name for name in loaded.split(",") if name], completed.stderr
+
+# Helper function to parse `-X importtime` output into the target's direct imports, as `(cumulative µs, name)`.
+# NOTE: Lines look like `import time:   self [us] | cumulative | <indented module name>`.
+def slowest_imports(importtime_output, top):
+    imports = []
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth <= 2:
+            imports.append((int(cumulative), name.strip()))
+    return sorted(imports, reverse=True)[:top]
+
+# Time boots of every target, and list the slowest imports of each.
+def run_benchmark(targets, repeat, top, budget_ms):
+    over_budget = []
+    for target in targets:
+        print(f">> Booting `{target}` in {repeat} fresh interpreters...")
+        boot_once(target)
+        boots = [boot_once(target) for _ in range(repeat)]
+        import_ms = median(import_seconds for import_seconds, _, _, _ in boots) * 1000
+        process_ms = median(process_seconds for _, process_seconds, _, _ in boots) * 1000
+        print(f"\t{'import time (p50)':<26} {import_ms:8.1f} ms")
+        print(f"\t{'process start + import':<26} {process_ms:8.1f} ms")
+        print(f"\t{'deferred modules loaded':<26} {', '.join(boots[0][2]) or 'none'}")
+
+        _, _, _, importtime_output = boot_once(target, importtime=True)
+        print("\n\t>> Slowest imports (cumulative, `-X importtime`):")
+        for cumulative, name in slowest_imports(importtime_output, top):
+            print(f"\t\t{cumulative / 1000:8.1f} ms  {name}")
+        print()
+        if budget_ms is not None and import_ms > budget_ms:
+            over_budget.append(target)
+
+    if over_budget:
+        print(f">> Over the {budget_ms:.0f} ms budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+#######################################################
+######### BENCHMARK BOILERPLATE FOR EXECUTION #########
+#######################################################
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Time worker boot (module import) and list the slowest imports.")
+    parser.add_argument("--targets", nargs="+", default=["app", "asgi", "seed"],
+                        help="Modules to import, each in fresh interpreters.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per target.")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports listed per target.")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Exit with status 1 when a target's median import time exceeds this many milliseconds.")
+    arguments = parser.parse_args()
+    run_benchmark(arguments.targets, arguments.repeat, arguments.top, arguments.budget_ms)
@@ -0,0 +1,352 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Make server modules (`config`, `models`, ...) importable when run from any directory.
+import os
+import sys
+SERVER_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, SERVER_DIRECTORY)
+
+# HTTP client and cookie session tools for driving the server under test.
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+# Benchmark process, timing, randomness, and argument parsing tools.
+from argparse import ArgumentParser
+from random import Random
+from statistics import mean, quantiles
+from tempfile import TemporaryDirectory
+from time import perf_counter, sleep
+import json
+import re
+import subprocess
+import threading
+
+
+#######################################################
+############ LOAD TEST HARNESS EXPLANATION ############
+#######################################################
+
+
+"""
+`loadtest.py` measures the API end to end, the way clients see it:
+
+1.  Seed a scratch database of the requested size with `seed.py`.
+2.  Start one or more server processes running `app.py` with `SERVER_TIMING`
+    enabled, so every response reports how many SQL queries it issued.
+3.  Drive a weighted mix of scenarios from concurrent clients for a fixed
+    duration (after a warm-up period that is not measured).
+4.  Report throughput, p50/p95/p99 latency, errors, and query counts per
+    scenario as JSON, and optionally compare them against a stored baseline.
+
+With `--baseline`, the process exits with status `1` when any scenario is slower
+or issues more queries than the baseline allows, so it can gate changes locally:
+
+    python benchmarks/loadtest.py --output baseline.json             # on main
+    python benchmarks/loadtest.py --baseline baseline.json           # on a branch
+"""
+
+
+#######################################################
+############ LOAD TEST SCENARIO DEFINITIONS ###########
+#######################################################
+
+
+# Default scenario weights (relative request frequencies).
+DEFAULT_MIX = {"browse": 40, "view": 30, "login": 10, "signup": 5, "adopt": 10, "patch": 5}
+
+# Sample administrator account created by `seed.py`.
+ADMIN_CREDENTIALS = {"username": "amazing_administrator", "password": "abcde12345"}
+# Password shared by the synthetic users created by `seed.py`.
+SYNTHETIC_PASSWORD = "synthetic-password"
+# Number of sample users (and dogs) that `seed.py` inserts before synthetic ones.
+SAMPLE_USER_COUNT = 3
+SAMPLE_DOG_COUNT = 8
+
+# Status codes that count as expected outcomes per scenario (e.g. adopting an already adopted dog).
+EXPECTED_STATUSES = {
+    "browse": {200},
+    "view": {200},
+    "login": {200},
+    "signup": {201},
+    "adopt": {201, 409},
+    "patch": {200},
+}
+
+# Pattern extracting the SQL query count from a `Server-Timing` header.
+QUERY_COUNT_PATTERN = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+#######################################################
+########## SERVER-SIDE LOAD TEST ROLE(S) ##############
+#######################################################
+
+
+# Create the schema and seed synthetic users and dogs in the configured (scratch) database.
+def prepare_database(options):
+    from config import app, db
+    import seed
+    with app.app_context():
+        db.create_all()
+        seed.seed_database(seed.parse_arguments([
+            "--users", str(options.users), "--dogs", str(options.dogs), "--seed", str(options.seed),
+            "--adoption-ratio", str(options.adoption_ratio), "--password-rounds", str(options.bcrypt_rounds),
+            "--fast-pragmas",
+        ]))
+
+# Serve the application with a threaded WSGI server, as one "worker" process.
+def serve(port):
+    from werkzeug.serving import make_server
+    from app import app
+    make_server("127.0.0.1", port, app, threaded=True).serve_forever()
+
+
+#######################################################
+########## CLIENT-SIDE LOAD TEST FUNCTION(S) ##########
+#######################################################
+
+
+# Helper function to parse `scenario=weight` pairs into a scenario mix.
+def parse_mix(raw_mix):
+    mix = {}
+    for pair in raw_mix.split(","):
+        scenario, _, weight = pair.partition("=")
+        scenario = scenario.strip()
+        if scenario not in DEFAULT_MIX:
+            raise ValueError(f"Unknown scenario `{scenario}` (expected one of {', '.join(DEFAULT_MIX)}).")
+        mix[scenario] = float(weight or 1)
+    return mix
+
+# Helper function to start a server subprocess for the given role and environment.
+def spawn(role, environment, *arguments):
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__), "--role", role, *arguments],
+                            cwd=SERVER_DIRECTORY, env=environment,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+# Helper function to wait until a server accepts HTTP requests.
+def wait_for_server(base_url, timeout=30):
+    deadline = perf_counter() + timeout
+    while perf_counter() < deadline:
+        try:
+            build_opener().open(base_url + "/", timeout=1)
+            return
+        except (URLError, ConnectionError):
+            sleep(0.1)
+    raise SystemExit(f"Server at {base_url} did not start.")
+
+# Helper function to issue a JSON request and return its status code and SQL query count.
+# NOTE: The query count is `None` when the server did not report one (e.g. `SERVER_TIMING` disabled).
+def send(opener, method, url, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    request = Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with opener.open(request, timeout=30) as response:
+            response.read()
+            status, server_timing = response.status, response.headers.get("Server-Timing")
+    except HTTPError as error:
+        status, server_timing = error.code, error.headers.get("Server-Timing")
+    if server_timing is None:
+        return status, None
+    match = QUERY_COUNT_PATTERN.search(server_timing)
+    return status, int(match.group(1)) if match else 0
+
+# Helper function to build a logged-in HTTP client.
+def logged_in_opener(base_url, credentials):
+    opener = build_opener(HTTPCookieProcessor(CookieJar()))
+    status, _ = send(opener, "POST", base_url + "/login", credentials)
+    if status != 200:
+        raise SystemExit(f"Could not log in as `{credentials['username']}` (status {status}).")
+    return opener
+
+# Helper function to issue one request for a scenario.
+def run_scenario(scenario, rng, base_url, user_opener, admin_opener, options, client_index, request_index):
+    dog_count = SAMPLE_DOG_COUNT + options.dogs
+    user_id = SAMPLE_USER_COUNT + rng.randint(1, options.users) if options.users else 1
+    dog_id = rng.randint(1, dog_count)
+
+    if scenario == "browse":
+        return send(user_opener, "GET", f"{base_url}/api/adopt?limit={options.page_size}&after_id={rng.randrange(dog_count)}")
+    if scenario == "view":
+        return send(user_opener, "GET", f"{base_url}/api/dogs/{dog_id}")
+    if scenario == "login":
+        credentials = ({"username": f"synthetic_user_{user_id}", "password": SYNTHETIC_PASSWORD} if options.users
+                       else ADMIN_CREDENTIALS)
+        return send(build_opener(HTTPCookieProcessor(CookieJar())), "POST", base_url + "/login", credentials)
+    if scenario == "signup":
+        username = f"loadtest_{options.seed}_{client_index}_{request_index}_{rng.getrandbits(32):08x}"
+        return send(build_opener(HTTPCookieProcessor(CookieJar())), "POST", base_url + "/signup",
+                    {"username": username, "password": SYNTHETIC_PASSWORD})
+    if scenario == "adopt":
+        return send(admin_opener, "POST", f"{base_url}/api/users/{user_id}/adoptions", {"dog_id": dog_id})
+    return send(admin_opener, "PATCH", f"{base_url}/api/dogs/{dog_id}", {"name": f"Renamed {dog_id}"})
+
+# Drive the scenario mix from concurrent clients against every worker.
+# NOTE: Requests issued during the warm-up period are not recorded.
+def drive_traffic(base_urls, options):
+    scenarios, weights = list(options.mix), list(options.mix.values())
+    stop, measuring = threading.Event(), threading.Event()
+    lock = threading.Lock()
+    samples = {scenario: [] for scenario in scenarios}
+
+    def client(index):
+        rng = Random(options.seed + index)
+        base_url = base_urls[index % len(base_urls)]
+        user_credentials = ({"username": f"synthetic_user_{SAMPLE_USER_COUNT + 1 + index % options.users}",
+                             "password": SYNTHETIC_PASSWORD} if options.users else ADMIN_CREDENTIALS)
+        user_opener = logged_in_opener(base_url, user_credentials)
+        admin_opener = logged_in_opener(base_url, ADMIN_CREDENTIALS)
+        request_index = 0
+        while not stop.is_set():
+            scenario = rng.choices(scenarios, weights)[0]
+            start = perf_counter()
+            status, query_count = run_scenario(scenario, rng, base_url, user_opener, admin_opener,
+                                               options, index, request_index)
+            elapsed = perf_counter() - start
+            request_index += 1
+            if measuring.is_set():
+                with lock:
+                    samples[scenario].append((elapsed, status, query_count))
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(options.clients)]
+    for thread in threads:
+        thread.start()
+    sleep(options.warmup)
+    measuring.set()
+    sleep(options.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return samples
+
+# Helper function to summarize the samples of one scenario.
+def summarize(scenario, scenario_samples, duration):
+    latencies = [elapsed for elapsed, _, _ in scenario_samples]
+    statuses = {}
+    for _, status, _ in scenario_samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    query_counts = [query_count for _, _, query_count in scenario_samples if query_count is not None]
+    percentiles = quantiles(latencies, n=100) if len(latencies) > 1 else (latencies or [0.0]) * 99
+    return {
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / duration, 1),
+        "errors": sum(1 for _, status, _ in scenario_samples if status not in EXPECTED_STATUSES[scenario]),
+        "statuses": statuses,
+        "p50_ms": round(percentiles[49] * 1000, 2),
+        "p95_ms": round(percentiles[94] * 1000, 2),
+        "p99_ms": round(percentiles[98] * 1000, 2),
+        "mean_queries": round(mean(query_counts), 2) if query_counts else None,
+        "max_queries": max(query_counts) if query_counts else None,
+    }
+
+# Helper function to compare a report against a baseline report and list regressions.
+# NOTE: Latency and throughput may drift by `tolerance` (a fraction); query counts may not grow at all.
+def compare_to_baseline(report, baseline, tolerance):
+    regressions = []
+    for scenario, current in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario)
+        if previous is None or not current["requests"] or not previous["requests"]:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{scenario}: p95 {previous['p95_ms']} ms -> {current['p95_ms']} ms")
+        if current["requests_per_second"] < previous["requests_per_second"] * (1 - tolerance):
+            regressions.append(f"{scenario}: throughput {previous['requests_per_second']} -> "
+                               f"{current['requests_per_second']} req/s")
+        if None not in (current["max_queries"], previous["max_queries"]) and current["max_queries"] > previous["max_queries"]:
+            regressions.append(f"{scenario}: max queries {previous['max_queries']} -> {current['max_queries']}")
+    return regressions
+
+# Run the load test end to end: prepare a database, start workers, drive traffic, and stop workers.
+def run_load_test(options):
+    with TemporaryDirectory() as scratch_directory:
+        database_url = options.database_url or f"sqlite:///{os.path.join(scratch_directory, 'loadtest.db')}"
+        environment = {**os.environ, "SECRET_KEY": os.getenv("SECRET_KEY", "loadtest"), "DATABASE_URL": database_url,
+                       "BCRYPT_ROUNDS": str(options.bcrypt_rounds), "SERVER_TIMING": "true"}
+
+        if not options.skip_prepare:
+            print(f">> Seeding {options.users} users and {options.dogs} dogs...")
+            prepare = spawn("prepare", environment, "--users", str(options.users), "--dogs", str(options.dogs),
+                            "--seed", str(options.seed), "--adoption-ratio", str(options.adoption_ratio),
+                            "--bcrypt-rounds", str(options.bcrypt_rounds))
+            if prepare.wait() != 0:
+                raise SystemExit("Database preparation failed.")
+
+        ports = [options.port + index for index in range(options.workers)]
+        workers = [spawn("serve", environment, "--port", str(port)) for port in ports]
+        try:
+            base_urls = [f"http://127.0.0.1:{port}" for port in ports]
+            for base_url in base_urls:
+                wait_for_server(base_url)
+            print(f">> {options.workers} worker process(es), {options.clients} clients, "
+                  f"{options.warmup:.0f}s warm-up + {options.duration:.0f}s measured.\n")
+            samples = drive_traffic(base_urls, options)
+        finally:
+            for worker in workers:
+                worker.terminate()
+                worker.wait()
+
+    report = {
+        "configuration": {"users": options.users, "dogs": options.dogs, "workers": options.workers,
+                          "clients": options.clients, "duration": options.duration, "mix": options.mix,
+                          "seed": options.seed},
+        "scenarios": {scenario: summarize(scenario, scenario_samples, options.duration)
+                      for scenario, scenario_samples in samples.items()},
+    }
+    report["total_requests_per_second"] = round(sum(stats["requests_per_second"]
+                                                    for stats in report["scenarios"].values()), 1)
+
+    for scenario, stats in report["scenarios"].items():
+        print(f"\t{scenario:<8} {stats['requests_per_second']:8.1f} req/s | {stats['errors']:>4} errors"
+              f" | p50 {stats['p50_ms']:8.2f} ms | p95 {stats['p95_ms']:8.2f} ms | p99 {stats['p99_ms']:8.2f} ms"
+              f" | queries (mean/max): {stats['mean_queries']}/{stats['max_queries']}")
+    print(f"\n\ttotal    {report['total_requests_per_second']:8.1f} req/s")
+
+    if options.output:
+        with open(options.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if options.baseline:
+        with open(options.baseline) as baseline_file:
+            regressions = compare_to_baseline(report, json.load(baseline_file), options.tolerance)
+        if regressions:
+            print(f"\n>> {len(regressions)} regression(s) against `{options.baseline}`:")
+            for regression in regressions:
+                print(f"\t{regression}")
+            raise SystemExit(1)
+        print(f"\n>> No regressions against `{options.baseline}` (tolerance {options.tolerance:.0%}).")
+
+
+#######################################################
+######### LOAD TEST BOILERPLATE FOR EXECUTION #########
+#######################################################
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Drive a realistic scenario mix against the API and report per-scenario performance.")
+    parser.add_argument("--role", choices=["benchmark", "prepare", "serve"], default="benchmark", help="Process role (`prepare` and `serve` are spawned internally).")
+    parser.add_argument("--database-url", default=None, help="Database URL to use instead of a scratch SQLite file (seeding replaces its data).")
+    parser.add_argument("--skip-prepare", action="store_true", help="Reuse an already seeded `--database-url` instead of reseeding it.")
+    parser.add_argument("--users", type=int, default=1000, help="Number of synthetic users to seed.")
+    parser.add_argument("--dogs", type=int, default=20000, help="Number of synthetic dogs to seed.")
+    parser.add_argument("--adoption-ratio", type=float, default=0.3, help="Fraction of seeded dogs that start out adopted.")
+    parser.add_argument("--bcrypt-rounds", type=int, default=4, help="bcrypt cost factor for seeded and signed-up users.")
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX), help="Comma-separated `scenario=weight` pairs (scenarios: " + ", ".join(DEFAULT_MIX) + ").")
+    parser.add_argument("--page-size", type=int, default=20, help="Page size for `browse` requests.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of server processes (like gunicorn workers).")
+    parser.add_argument("--clients", type=int, default=16, help="Number of concurrent HTTP clients.")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds of unmeasured traffic before measuring.")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of measured traffic.")
+    parser.add_argument("--port", type=int, default=5200, help="First port for worker processes.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for seeding and client traffic.")
+    parser.add_argument("--output", default=None, help="Optional path for the JSON report (e.g. to store a baseline).")
+    parser.add_argument("--baseline", default=None, help="JSON report to compare against; exits with status 1 on regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed fractional latency/throughput regression.")
+    options = parser.parse_args()
+
+    if options.role == "prepare":
+        prepare_database(options)
+    elif options.role == "serve":
+        serve(options.port)
+    else:
+        run_load_test(options)
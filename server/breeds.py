@@ -0,0 +1,79 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Breed catalog file reading tools.
+import json
+import re
+from pathlib import Path
+
+
+#######################################################
+######### SHARED BREED NAME SOURCE OVERVIEW ###########
+#######################################################
+
+
+"""
+The breed image dataset stores one directory per breed, named after its WordNet
+synset (`n02085620-Chihuahua`, `n02110185-Siberian_husky`). This module is the
+one place that turns those directory names into the display names stored in
+`Dog.breed` ("Chihuahua", "Siberian Husky"), so the research manifest
+(`research/dataset.py`), the seed script, and the server agree on spelling.
+
+It only uses the standard library, so the research code can import it without
+loading the Flask application.
+
+`research/dataset.py` writes a small `breeds.json` catalog next to its image
+manifest. `load_breed_catalog()` reads it in well under a millisecond:
+
+    [{"synset_id": "n02085620", "breed": "Chihuahua", "images": 152}, ...]
+"""
+
+
+#######################################################
+########### BREED NAME CONFIGURATION VALUES ###########
+#######################################################
+
+
+# Dataset directory names: a WordNet noun synset ID, a dash, and the underscore-separated breed name.
+SYNSET_DIRECTORY_PATTERN = re.compile(r"^(n\d{8})-(.+)$")
+
+# File name of the breed catalog written next to the dataset manifest.
+BREED_CATALOG_FILENAME = "breeds.json"
+
+
+#######################################################
+######## EXPORTABLE BREED NAME UTILITY FUNCTIONS ######
+#######################################################
+
+
+# Helper function to format a raw dataset breed label (`Siberian_husky`) as a `Dog.breed` name (`Siberian Husky`).
+# NOTE: Hyphenated labels keep their hyphens (`Shih-Tzu`, `German Short-Haired Pointer`).
+def format_breed_name(raw_name):
+    return " ".join("-".join(part.capitalize() for part in token.split("-"))
+                    for token in raw_name.split("_") if token)
+
+# Helper function to split a dataset directory name into `(synset ID, breed name)`, or `None` for other entries.
+def parse_synset_directory(directory_name):
+    match = SYNSET_DIRECTORY_PATTERN.match(directory_name)
+    if match is None:
+        return None
+    return match.group(1), format_breed_name(match.group(2))
+
+# Read the breed catalog (a file, or a directory containing `breeds.json`) as a list of dictionaries.
+def load_breed_catalog(path):
+    path = Path(path)
+    if path.is_dir():
+        path = path / BREED_CATALOG_FILENAME
+    with open(path, encoding="utf-8") as catalog_file:
+        return json.load(catalog_file)
+
+# Helper function to write the breed catalog atomically, so readers never see a partial file.
+def write_breed_catalog(path, entries):
+    path = Path(path)
+    temporary_path = path.with_name(path.name + ".tmp")
+    with open(temporary_path, "w", encoding="utf-8") as catalog_file:
+        json.dump(entries, catalog_file, indent=1)
+        catalog_file.write("\n")
+    temporary_path.replace(path)
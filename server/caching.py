@@ -0,0 +1,195 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Flask request-response utilities.
+from flask import request, make_response, Response
+# Configured application/server and database instances.
+from config import app, db
+# Relative access to the table version counter model (and single-statement counter upserts).
+from models import TableVersion, increment_counters
+# Negotiated response media type (JSON or MessagePack).
+from encoding import negotiated_mimetype
+# SQLAlchemy Core statement construction and DDL event tools.
+from sqlalchemy import DDL, event, select
+
+# Additional tools for extending decorator function logic.
+from functools import wraps
+# Cache bookkeeping and ETag hashing tools.
+from collections import OrderedDict
+from hashlib import sha1
+import threading
+
+
+#######################################################
+######### CONDITIONAL RESPONSE CACHING OVERVIEW #######
+#######################################################
+
+
+"""
+Catalog routes are polled far more often than the catalog changes. Each table
+that a cached route reads from has a row in `table_version` holding a counter
+that every write bumps *in the same transaction* as the write itself.
+
+For a cached route, a request then costs:
+
+1.  One primary-key read of the relevant version counters.
+2.  An ETag derived from (path, query arguments, versions).
+3.  If the client's `If-None-Match` matches, an empty `304 Not Modified`.
+4.  Otherwise, if this process already rendered that ETag, the stored body.
+5.  Only otherwise, the route itself (query + serialization), whose body is stored.
+
+Counters live in the database rather than in process memory so that a write
+handled by one worker invalidates the cached responses of every other worker.
+
+On SQLite and PostgreSQL, triggers on every versioned table bump its counter
+too, so writers that bypass the routes (`seed.py`, `flask rebuild-stats`, a
+manual `UPDATE`) can never leave a cached response behind. Routes still call
+`bump_table_versions()`, which keeps other databases correct; on SQLite and
+PostgreSQL a routed write simply bumps its counter twice.
+"""
+
+
+#######################################################
+######## TABLE VERSION TRIGGER SCHEMA DEFINITIONS #####
+#######################################################
+
+
+# Tables whose writes invalidate cached responses.
+VERSIONED_TABLES = ("dog_table", "user_table", "adoption_table", "breed_stats", "user_adoption_stats")
+
+# Helper function to build the SQLite triggers bumping a table's version counter after every row write.
+def sqlite_version_trigger_ddl(table_name):
+    bump = (f"INSERT INTO table_version (name, version) VALUES ('{table_name}', 1) "
+            f"ON CONFLICT (name) DO UPDATE SET version = version + 1;")
+    return [f"CREATE TRIGGER IF NOT EXISTS {table_name}_version_after_{operation.lower()} "
+            f"AFTER {operation} ON {table_name} BEGIN {bump} END"
+            for operation in ("INSERT", "UPDATE", "DELETE")]
+
+# Helper function to build the PostgreSQL trigger bumping a table's version counter once per write statement.
+# NOTE: Statement-level triggers also fire for `TRUNCATE` and for statements that touch no rows.
+def postgresql_version_trigger_ddl(table_name):
+    return [f"CREATE OR REPLACE TRIGGER {table_name}_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table_name} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"]
+
+# DDL statements creating the version counter triggers, per dialect.
+# NOTE: Mirrored by the `add table version triggers` migration; keep the two in step.
+VERSION_TRIGGER_DDL = {
+    "sqlite": [statement for table_name in VERSIONED_TABLES for statement in sqlite_version_trigger_ddl(table_name)],
+    "postgresql": [
+        "CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$ BEGIN "
+        "INSERT INTO table_version (name, version) VALUES (TG_TABLE_NAME, 1) "
+        "ON CONFLICT (name) DO UPDATE SET version = table_version.version + 1; "
+        "RETURN NULL; END; $$ LANGUAGE plpgsql",
+        *(statement for table_name in VERSIONED_TABLES for statement in postgresql_version_trigger_ddl(table_name)),
+    ],
+}
+
+
+# Create the version triggers whenever `create_all()` creates the schema (tests, benchmarks).
+for dialect_name, statements in VERSION_TRIGGER_DDL.items():
+    for statement in statements:
+        event.listen(db.metadata, "after_create", DDL(statement).execute_if(dialect=dialect_name))
+
+
+#######################################################
+####### EXPORTABLE RESPONSE CACHE UTILITY CLASSES #####
+#######################################################
+
+
+# Thread-safe, size-bounded LRU store of rendered response bodies keyed by ETag.
+class ResponseCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag):
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is not None:
+                self._entries.move_to_end(etag)
+            return entry
+
+    def put(self, etag, entry):
+        with self._lock:
+            self._entries[etag] = entry
+            self._entries.move_to_end(etag)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide cache of rendered catalog responses.
+response_cache = ResponseCache(max_size=app.config["RESPONSE_CACHE_SIZE"])
+
+# Response headers preserved alongside cached bodies (e.g. pagination cursors).
+CACHED_HEADER_NAMES = ("X-Next-After-Id", "Link")
+
+
+#######################################################
+###### EXPORTABLE RESPONSE CACHE UTILITY FUNCTIONS ####
+#######################################################
+
+
+# Helper function to bump the version counters of the given models' tables.
+# NOTE: Executes inside the caller's transaction, so the bump commits (or rolls back) with the write.
+# NOTE: Upserted like the triggers' bumps, so concurrent first writes to a table cannot collide on its row.
+def bump_table_versions(session, *models):
+    for model in models:
+        increment_counters(session, TableVersion, {"name": model.__tablename__}, {"version": 1})
+
+# Helper function to read the current version counters for the given models' tables.
+# NOTE: Tables that have never been written report version `0`.
+def current_table_versions(session, *models):
+    table_names = [model.__tablename__ for model in models]
+    versions = dict(session.execute(
+        select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(table_names))
+    ).all())
+    return tuple(versions.get(table_name, 0) for table_name in table_names)
+
+# Helper function to derive a strong (unquoted) ETag from a path, its query arguments, table versions, and media type.
+# NOTE: The negotiated media type is part of the fingerprint, since JSON and MessagePack bodies differ.
+# NOTE: Shared with the ASGI read routes, so both servers agree on (and can revalidate) each other's ETags.
+def etag_for(path, args, versions, mimetype):
+    arguments = sorted(args.items(multi=True))
+    fingerprint = f"{path}?{arguments}@{versions}:{mimetype}"
+    return sha1(fingerprint.encode("utf-8")).hexdigest()
+
+# Helper function to derive a strong (unquoted) ETag for the current request from table versions.
+def compute_etag(versions):
+    return etag_for(request.path, request.args, versions, negotiated_mimetype())
+
+# Decorator that serves a read-only route through version-keyed ETags and the response cache.
+# NOTE: Apply below `@authorization_required` so authentication is still enforced on every request.
+# NOTE: Only `200` responses are cached; errors always run the route.
+def conditional_cache(*models):
+    def decorator(func):
+        @wraps(func)
+        def cached_view(*args, **kwargs):
+            etag = compute_etag(current_table_versions(db.session, *models))
+            cache_headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+
+            # Answer revalidation requests for unchanged data with an empty body.
+            # NOTE: `If-None-Match` uses weak comparison, so compressed (weak) variants also match.
+            if request.if_none_match.contains_weak(etag):
+                return Response(status=304, headers=cache_headers)
+
+            # Serve an identical, previously rendered response without touching the tables.
+            cached_entry = response_cache.get(etag)
+            if cached_entry is not None:
+                body, mimetype, headers = cached_entry
+                return Response(body, status=200, mimetype=mimetype, headers={**headers, **cache_headers})
+
+            response = make_response(func(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                preserved_headers = {name: response.headers[name] for name in CACHED_HEADER_NAMES if name in response.headers}
+                response_cache.put(etag, (response.get_data(), response.mimetype, preserved_headers))
+                response.headers.update(cache_headers)
+            return response
+        return cached_view
+    return decorator
@@ -0,0 +1,198 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Configured application/server instance.
+from config import app
+# Relative access to the change log model.
+from models import ChangeLog
+# Query string validation errors shared with catalog routes.
+from pagination import QueryParameterError
+# Timestamp format shared with serialized models.
+from sqlalchemy_serializer import SerializerMixin
+# SQLAlchemy Core statement construction, ORM session, and event tools.
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.orm import Session
+
+# JSON encoding tools for event stream payloads.
+import json
+# Change notification and timing tools.
+import threading
+from time import monotonic
+
+
+#######################################################
+######### CHANGE LOG (OUTBOX) FEED OVERVIEW ###########
+#######################################################
+
+
+"""
+Every dog and adoption write appends rows to `change_log` *in the same
+transaction*, so the log holds exactly the committed changes, in commit order:
+
+    seq   entity     entity_id   operation   data
+    41    dog        7           insert      {"id": 7, "name": "Rex", "breed": "Pug", "is_adoptable": true}
+    42    dog        7           update      {"id": 7, "is_adoptable": false}
+    43    adoption   12          insert      {"id": 12, "user_id": 3, "dog_id": 7}
+    44    dog        5           delete      {"id": 5}
+
+`update` rows carry only the fields that changed. Clients take a cursor with
+`GET /api/changes` (no `since`), load the catalog once, then follow
+`GET /api/changes?since=<next_since>` instead of re-polling lists:
+
+    - Plain requests return immediately (`?limit=`, default 100).
+    - `?wait=<seconds>` long-polls until a change arrives or the wait ends.
+    - `Accept: text/event-stream` streams changes as Server-Sent Events, resuming
+      from `Last-Event-ID` after a reconnect.
+
+Waiting requests are woken as soon as a write commits in the same process and
+otherwise re-check every `CHANGE_FEED_POLL_INTERVAL` seconds (one primary-key
+range read), so writes made by other workers are delivered within that interval.
+
+NOTE: Each waiting request or open stream holds a server thread.
+NOTE: On SQLite, writers commit one at a time, so `seq` order is commit order.
+      With concurrent writers (e.g. PostgreSQL), a smaller `seq` can commit after a
+      larger one; consumers there should re-read a short window behind their cursor.
+"""
+
+
+#######################################################
+########## CHANGE LOG CONFIGURATION VALUES ############
+#######################################################
+
+
+# Entities and operations recorded in the change log.
+DOG = "dog"
+ADOPTION = "adoption"
+ENTITIES = (DOG, ADOPTION)
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+# Default and maximum number of changes returned per request.
+DEFAULT_CHANGE_LIMIT = 100
+MAX_CHANGE_LIMIT = 1000
+
+
+#######################################################
+######### EXPORTABLE CHANGE LOG UTILITY CLASSES #######
+#######################################################
+
+
+# Process-wide signal that wakes waiting change feed requests when a write commits.
+class ChangeNotifier:
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._generation = 0
+
+    def notify(self):
+        with self._condition:
+            self._generation += 1
+            self._condition.notify_all()
+
+    # Block until the next notification or `timeout` seconds, whichever comes first.
+    def wait(self, timeout):
+        with self._condition:
+            generation = self._generation
+            self._condition.wait_for(lambda: self._generation != generation, timeout=timeout)
+
+
+# Process-wide notifier shared by every change feed request.
+change_notifier = ChangeNotifier()
+
+
+#######################################################
+####### EXPORTABLE CHANGE LOG WRITE FUNCTIONS #########
+#######################################################
+
+
+# Append `(entity, operation, entity_id, data)` changes to the log inside the caller's transaction.
+def record_changes(session, changes):
+    if not changes:
+        return
+    session.execute(insert(ChangeLog), [
+        {"entity": entity, "operation": operation, "entity_id": entity_id, "data": data}
+        for entity, operation, entity_id, data in changes
+    ])
+    session.info["recorded_changes"] = True
+
+# Wake waiting feed requests once logged changes commit.
+@event.listens_for(Session, "after_commit")
+def notify_committed_changes(session):
+    if session.info.pop("recorded_changes", False):
+        change_notifier.notify()
+
+@event.listens_for(Session, "after_rollback")
+def discard_rolled_back_changes(session):
+    session.info.pop("recorded_changes", None)
+
+
+#######################################################
+######## EXPORTABLE CHANGE LOG READ FUNCTIONS #########
+#######################################################
+
+
+# Helper function to parse an optional comma-separated `?entity=` filter.
+def parse_change_entities(args):
+    raw_value = args.get("entity")
+    if raw_value is None or raw_value == "":
+        return None
+    entities = [entity.strip() for entity in raw_value.split(",") if entity.strip()]
+    unknown_entities = sorted(set(entities) - set(ENTITIES))
+    if unknown_entities:
+        raise QueryParameterError(f"Query parameter `entity` must name {' or '.join(ENTITIES)} "
+                                  f"(received `{raw_value}`).")
+    return entities
+
+# Helper function to serialize one change log row.
+def serialize_change(row):
+    return {"seq": row.seq, "entity": row.entity, "id": row.entity_id, "operation": row.operation,
+            "data": row.data,
+            "created_at": row.created_at.strftime(SerializerMixin.datetime_format) if row.created_at else None}
+
+# Read up to `limit` changes after sequence number `since`, optionally for some entities only.
+# NOTE: Ends the read transaction, so the next read (e.g. of a long poll) sees newly committed rows.
+def read_changes(session, since, limit, entities=None):
+    statement = (select(ChangeLog.seq, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.operation,
+                        ChangeLog.data, ChangeLog.created_at)
+                 .where(ChangeLog.seq > since)
+                 .order_by(ChangeLog.seq)
+                 .limit(limit))
+    if entities:
+        statement = statement.where(ChangeLog.entity.in_(entities))
+    changes = [serialize_change(row) for row in session.execute(statement)]
+    session.rollback()
+    return changes
+
+# Helper function to read the latest sequence number (`0` for an empty log).
+def latest_sequence(session):
+    sequence = session.scalar(select(func.max(ChangeLog.seq))) or 0
+    session.rollback()
+    return sequence
+
+# Read changes after `since`, waiting up to `timeout` seconds for at least one to commit.
+def wait_for_changes(session, since, limit, entities=None, timeout=0):
+    deadline = monotonic() + timeout
+    while True:
+        changes = read_changes(session, since, limit, entities)
+        remaining = deadline - monotonic()
+        if changes or remaining <= 0:
+            return changes
+        change_notifier.wait(min(remaining, app.config["CHANGE_FEED_POLL_INTERVAL"]))
+
+# Generator function to stream changes after `since` as Server-Sent Events for up to `duration` seconds.
+# NOTE: Idle streams send a comment every `heartbeat` seconds so proxies keep the connection open;
+#       clients reconnect afterwards and resume from the `Last-Event-ID` their browser sends.
+def stream_changes(session, since, entities=None, duration=300, heartbeat=15):
+    deadline = monotonic() + duration
+    yield f"retry: {int(app.config['CHANGE_FEED_POLL_INTERVAL'] * 1000)}\n\n"
+    while monotonic() < deadline:
+        changes = wait_for_changes(session, since, MAX_CHANGE_LIMIT, entities,
+                                   timeout=min(heartbeat, max(0, deadline - monotonic())))
+        if not changes:
+            yield ": keep-alive\n\n"
+            continue
+        for change in changes:
+            yield f"id: {change['seq']}\nevent: change\ndata: {json.dumps(change, separators=(',', ':'))}\n\n"
+        since = changes[-1]["seq"]
@@ -0,0 +1,166 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Flask request context and JSON provider tools.
+from flask import request, has_request_context
+from flask.json.provider import DefaultJSONProvider
+# Configured application/server instance.
+from config import app
+# Request phase timing for performance metrics.
+from metrics import timed_phase
+
+# Response compression tools.
+import gzip
+
+# OPTIONAL: Fast JSON encoding. (Falls back to the standard library when not installed.)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+# OPTIONAL: MessagePack encoding for machine clients. (Disabled when not installed.)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+# OPTIONAL: Brotli compression. (Falls back to gzip when not installed.)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+#######################################################
+######### RESPONSE ENCODING CONFIGURATION VALUES ######
+#######################################################
+
+
+# Media types the API can produce.
+JSON_MIMETYPE = "application/json"
+MSGPACK_MIMETYPE = "application/msgpack"
+
+# Media types worth compressing.
+COMPRESSIBLE_MIMETYPES = (JSON_MIMETYPE, MSGPACK_MIMETYPE, "text/html", "text/plain", "text/event-stream")
+
+# `json.dumps()` keyword arguments that the fast encoder reproduces exactly.
+# NOTE: Any other argument (e.g. `indent`, `default`) falls back to the standard library encoder.
+ORJSON_COMPATIBLE_ARGUMENTS = {"separators", "sort_keys", "ensure_ascii"}
+# NOTE: Dates are passed through to Flask's own `default()` so both encoders format them identically.
+ORJSON_OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson is not None else 0
+
+
+#######################################################
+####### EXPORTABLE RESPONSE ENCODING UTILITY CLASSES ##
+#######################################################
+
+
+# JSON provider that emits compact JSON (via `orjson` when available) and negotiates MessagePack.
+# NOTE: Installed as `app.json`, so it applies to every `make_response(dict_or_list)` and `flask.json.dumps()`.
+class FastJSONProvider(DefaultJSONProvider):
+    compact = True
+
+    # Serialize an object to a JSON string.
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and set(kwargs) <= ORJSON_COMPATIBLE_ARGUMENTS:
+            return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode("utf-8")
+        kwargs.setdefault("separators", (",", ":") if self.compact else None)
+        return super().dumps(obj, **kwargs)
+
+    # Serialize an object to compact JSON bytes without an intermediate string.
+    def dumps_bytes(self, obj):
+        if orjson is not None:
+            return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS)
+        return super().dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    # Build a response in the media type negotiated from the request's `Accept` header.
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        with timed_phase("encode"):
+            mimetype = negotiated_mimetype()
+            return self._app.response_class(self.encode(obj, mimetype), mimetype=mimetype)
+
+    # Serialize an object to response bytes in the given (negotiated) media type.
+    # NOTE: With `JSON_COMPACT=false`, JSON is indented exactly as Flask's default provider does.
+    def encode(self, obj, mimetype):
+        if mimetype == MSGPACK_MIMETYPE:
+            return msgpack.packb(obj, default=self.default, use_bin_type=True)
+        if not self.compact:
+            return f"{self.dumps(obj, indent=2)}\n".encode("utf-8")
+        return self.dumps_bytes(obj)
+
+
+#######################################################
+###### EXPORTABLE RESPONSE ENCODING UTILITY FUNCTIONS #
+#######################################################
+
+
+# Helper function to choose the response media type for the current request.
+# NOTE: Clients that do not explicitly prefer MessagePack (including browsers sending `*/*`) get JSON.
+def negotiated_mimetype():
+    if not has_request_context():
+        return JSON_MIMETYPE
+    return best_mimetype(request.accept_mimetypes)
+
+# Helper function to choose the response media type from parsed `Accept` header values.
+def best_mimetype(accepted):
+    if msgpack is None:
+        return JSON_MIMETYPE
+    return accepted.best_match([JSON_MIMETYPE, MSGPACK_MIMETYPE], default=JSON_MIMETYPE)
+
+# Helper function to choose a content coding for the current request, or `None`.
+def negotiated_content_encoding():
+    return best_content_encoding(request.accept_encodings)
+
+# Helper function to choose a content coding from parsed `Accept-Encoding` header values, or `None`.
+def best_content_encoding(accepted):
+    if brotli is not None and accepted["br"] and accepted["br"] >= accepted["gzip"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+# Helper function to compress a response body with the given content coding.
+def compress_body(body, content_encoding):
+    if content_encoding == "br":
+        return brotli.compress(body, quality=app.config["BROTLI_QUALITY"])
+    return gzip.compress(body, compresslevel=app.config["GZIP_LEVEL"])
+
+
+#######################################################
+####### RESPONSE ENCODING APPLICATION HOOK(S) #########
+#######################################################
+
+
+# Install the fast JSON provider as the application's JSON encoder.
+app.json = FastJSONProvider(app)
+app.json.compact = app.config["JSON_COMPACT"]
+
+# Compress sufficiently large, compressible responses after every request.
+# NOTE: Streamed responses (e.g. exports) are left untouched so they keep flowing incrementally.
+@app.after_request
+def compress_response(response):
+    response.vary.add("Accept")
+    if not app.config["RESPONSE_COMPRESSION"] or response.direct_passthrough or response.is_streamed:
+        return response
+    if not 200 <= response.status_code < 300 or response.status_code in (204, 206):
+        return response
+    if "Content-Encoding" in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    if response.content_length is not None and response.content_length < app.config["COMPRESSION_MIN_SIZE"]:
+        return response
+
+    content_encoding = negotiated_content_encoding()
+    if content_encoding is None:
+        return response
+
+    with timed_phase("compress"):
+        response.set_data(compress_body(response.get_data(), content_encoding))
+    response.headers["Content-Encoding"] = content_encoding
+    response.vary.add("Accept-Encoding")
+
+    # A compressed body is a different byte sequence, so a strong validator becomes weak.
+    etag, is_weak = response.get_etag()
+    if etag is not None and not is_weak:
+        response.set_etag(etag, weak=True)
+    return response
@@ -0,0 +1,170 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Configured application/server instance.
+from config import app
+# Password hashing timing for performance metrics.
+from metrics import record_password_hash
+
+# Cryptographic hashing tools for user authentication.
+import bcrypt
+
+# Bounded worker pool and synchronization tools.
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import threading
+# Hashing wait timing tools.
+from time import perf_counter
+
+
+#######################################################
+########## PASSWORD HASHING SERVICE OVERVIEW ##########
+#######################################################
+
+
+"""
+bcrypt is deliberately slow (~250 ms per hash at the default cost factor), so
+running it inline on every request thread lets a burst of logins occupy every
+worker thread at once and starves unrelated routes of CPU.
+
+`PasswordHasher` moves hashing and verification onto a dedicated, bounded pool:
+
+1.  At most `max_workers` hashes run at once, no matter how many requests arrive.
+2.  At most `max_pending` further hashes may wait for a free worker.
+3.  Requests beyond that wait up to `acquire_timeout` seconds for a slot and then
+    fail fast with `HashingBackpressure`, which routes turn into `503` responses.
+
+Backends are pluggable through `PASSWORD_HASH_BACKENDS`; each backend exposes
+module-level `hash`/`verify` functions so they also work with a process pool.
+"""
+
+
+#######################################################
+####### PASSWORD HASHING BACKEND IMPLEMENTATIONS ######
+#######################################################
+
+
+# Backend hashing function for bcrypt with an explicit cost factor.
+def bcrypt_hash(password, rounds):
+    salt = bcrypt.gensalt(rounds=rounds)
+    return bcrypt.hashpw(password.encode("utf-8"), salt=salt).decode("utf-8")
+
+# Backend verification function for bcrypt.
+# NOTE: The cost factor is read from the stored hash, so verification is unaffected by config changes.
+def bcrypt_verify(password, hashed_password):
+    return bcrypt.checkpw(password=password.encode("utf-8"), hashed_password=hashed_password.encode("utf-8"))
+
+
+# Registry of available password hashing backends, selected by `PASSWORD_HASH_BACKEND`.
+PASSWORD_HASH_BACKENDS = {
+    "bcrypt": (bcrypt_hash, bcrypt_verify),
+}
+
+# Registry of available worker pool types, selected by `PASSWORD_HASH_EXECUTOR`.
+# NOTE: bcrypt releases the GIL while hashing, so threads are usually sufficient.
+PASSWORD_HASH_EXECUTORS = {
+    "thread": ThreadPoolExecutor,
+    "process": ProcessPoolExecutor,
+}
+
+
+#######################################################
+####### EXPORTABLE PASSWORD HASHING UTILITY CLASSES ###
+#######################################################
+
+
+# Error raised when the hashing pool and its queue are both full.
+# NOTE: Routes catch this and convert it into a `503 Service Unavailable` response.
+class HashingBackpressure(RuntimeError):
+    pass
+
+
+# Bounded, pluggable password hashing service.
+class PasswordHasher:
+    def __init__(self, backend="bcrypt", rounds=12, max_workers=2, max_pending=8,
+                 acquire_timeout=1.0, executor="thread"):
+        if backend not in PASSWORD_HASH_BACKENDS:
+            raise ValueError(f"Unknown password hash backend `{backend}`.")
+        if executor not in PASSWORD_HASH_EXECUTORS:
+            raise ValueError(f"Unknown password hash executor `{executor}`.")
+        self.hash_function, self.verify_function = PASSWORD_HASH_BACKENDS[backend]
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.acquire_timeout = acquire_timeout
+        self.executor_type = executor
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    # Lazily start the worker pool so importing this module never spawns threads or processes.
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = PASSWORD_HASH_EXECUTORS[self.executor_type](max_workers=self.max_workers)
+        return self._executor
+
+    # Reserve a pool slot and schedule `func(*args)`, releasing the slot when it finishes.
+    # NOTE: `block=True` waits indefinitely instead of raising (used by offline jobs such as seeding).
+    def _submit(self, func, *args, block=False):
+        acquired = self._slots.acquire() if block else self._slots.acquire(timeout=self.acquire_timeout)
+        if not acquired:
+            raise HashingBackpressure("Password hashing capacity exceeded. Please retry shortly.")
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    # Hash a plaintext password with the configured backend and cost factor.
+    def hash_password(self, password):
+        started = perf_counter()
+        hashed_password = self._submit(self.hash_function, password, self.rounds).result()
+        record_password_hash("hash", perf_counter() - started)
+        return hashed_password
+
+    # Verify a plaintext password against a stored hash.
+    def verify_password(self, password, hashed_password):
+        started = perf_counter()
+        is_verified = self._submit(self.verify_function, password, hashed_password).result()
+        record_password_hash("verify", perf_counter() - started)
+        return is_verified
+
+    # Hash many passwords in parallel, waiting for capacity rather than failing.
+    # NOTE: `rounds` overrides the configured cost factor (e.g. cheap hashes for synthetic data).
+    def hash_many(self, passwords, rounds=None):
+        futures = [self._submit(self.hash_function, password, rounds or self.rounds, block=True)
+                   for password in passwords]
+        return [future.result() for future in futures]
+
+    # Stop the worker pool (e.g. at the end of a benchmark or seeding run).
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+#######################################################
+####### EXPORTABLE PASSWORD HASHING CONSTRUCTORS ######
+#######################################################
+
+
+# Helper function to build a password hasher from application configuration.
+def password_hasher_from_config(config):
+    return PasswordHasher(
+        backend=config["PASSWORD_HASH_BACKEND"],
+        rounds=config["BCRYPT_ROUNDS"],
+        max_workers=config["PASSWORD_HASH_WORKERS"],
+        max_pending=config["PASSWORD_HASH_QUEUE_SIZE"],
+        acquire_timeout=config["PASSWORD_HASH_TIMEOUT"],
+        executor=config["PASSWORD_HASH_EXECUTOR"],
+    )
+
+
+# Process-wide password hasher shared by authentication routes and the seeder.
+password_hasher = password_hasher_from_config(app.config)
@@ -0,0 +1,410 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Configured application/server and database instances.
+from config import app, db
+# Relative access to the dog model.
+from models import Dog
+# Dataset breed catalog shared with the research manifest (class labels).
+from breeds import BREED_CATALOG_FILENAME, load_breed_catalog
+# Inference batch size and latency metrics.
+from metrics import record_inference
+# Table version counters backing cached catalog responses.
+from caching import bump_table_versions
+# Change log (outbox) behind the change feed.
+from changes import DOG as DOG_ENTITY, UPDATE, record_changes
+# Single-statement bulk updates for writing predictions.
+from updates import apply_patches
+# Stored dog photos (the default back-fill source).
+from photos import photo_store
+# Command line option parsing tools for the back-fill command.
+import click
+
+# Deferred imports of optional dependencies (imported on first use, `None` when not installed).
+from lazy import lazy_import
+
+# OPTIONAL: Array math for preprocessing and the `.npz` linear model backend. (Inference is disabled when not installed.)
+np = lazy_import("numpy")
+# OPTIONAL: Image decoding and resizing. (Inference is disabled when not installed.)
+Image = lazy_import("PIL.Image")
+# OPTIONAL: ONNX Runtime for `.onnx` models. (Only `.npz` models load when not installed.)
+onnxruntime = lazy_import("onnxruntime")
+
+# Request queue, worker thread, and timing tools.
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+import queue
+import threading
+from time import monotonic, perf_counter
+
+
+#######################################################
+######### BATCHED BREED INFERENCE OVERVIEW ############
+#######################################################
+
+
+"""
+The breed model trained in `research/notebooks/modeling.ipynb` is served by a
+per-process `BreedClassifier`:
+
+1.  The model (`BREED_MODEL_PATH`) and its labels are loaded once, when the
+    server starts (`python app.py`, or the ASGI lifespan), or otherwise on the
+    first classification.
+2.  Request threads decode and resize their photo, then enqueue the pixel array
+    on a bounded queue.
+3.  `BREED_CLASSIFIER_WORKERS` worker threads each take the first waiting
+    image, gather more for up to `BREED_CLASSIFIER_BATCH_DELAY_MS` milliseconds
+    (or until `BREED_CLASSIFIER_BATCH_SIZE` images), and run one forward pass
+    for the whole batch. Under load, many concurrent requests share each pass.
+4.  When the queue is full, requests wait up to `BREED_CLASSIFIER_TIMEOUT`
+    seconds and then fail fast with `InferenceBackpressure` (a `503`), as do
+    requests whose prediction takes longer than `BREED_CLASSIFIER_RESULT_TIMEOUT`.
+
+Model formats are chosen by file extension (`BREED_MODEL_BACKENDS`):
+
+    .onnx   Any exported image classifier taking `(N, 3, H, W)` float input.
+            Requires `onnxruntime`. Labels are read from `BREED_LABELS_PATH`
+            (default: the `breeds.json` catalog next to the model, in order).
+    .npz    A linear classifier over normalized pixels (`weights`, `bias`,
+            `input_size`, optional `mean`/`std`/`labels` arrays), e.g. a
+            scikit-learn `LogisticRegression` saved from the notebook.
+
+`POST /api/dogs/<id>/classify` classifies one photo and stores the prediction
+on the dog (`predicted_breed`, `breed_confidence`); without an upload it uses
+the dog's stored photo (see `photos.py`). `flask --app app classify-dogs`
+back-fills predictions from stored photos (or from `<dog id>.jpg` files with
+`--photos DIR`) and reports throughput in images/sec.
+
+NOTE: Predictions never overwrite the admin-entered `breed`; they sit beside it.
+"""
+
+
+#######################################################
+######### BREED INFERENCE CONFIGURATION VALUES ########
+#######################################################
+
+
+# Default per-channel normalization (ImageNet statistics, used by most pretrained backbones).
+DEFAULT_MEAN = (0.485, 0.456, 0.406)
+DEFAULT_STD = (0.229, 0.224, 0.225)
+
+# Default model input size when the model does not declare one.
+DEFAULT_INPUT_SIZE = 224
+
+# Number of alternative breeds returned with each prediction.
+TOP_PREDICTIONS = 3
+
+
+#######################################################
+######## EXPORTABLE BREED INFERENCE ERROR CLASSES #####
+#######################################################
+
+
+# Error raised when no model is configured or its dependencies are missing.
+# NOTE: Routes catch this and convert it into a `503 Service Unavailable` response.
+class InferenceUnavailable(RuntimeError):
+    pass
+
+
+# Error raised when the inference queue stays full for longer than the configured timeout.
+# NOTE: Routes catch this and convert it into a `503 Service Unavailable` response.
+class InferenceBackpressure(RuntimeError):
+    pass
+
+
+# Error raised when uploaded bytes are not a decodable image.
+class ImageDecodeError(ValueError):
+    pass
+
+
+#######################################################
+######### BREED MODEL BACKEND IMPLEMENTATIONS #########
+#######################################################
+
+
+# ONNX Runtime backend for exported image classifiers.
+class OnnxBreedModel:
+    def __init__(self, path, threads):
+        if onnxruntime is None:
+            raise InferenceUnavailable("`.onnx` breed models require the `onnxruntime` package.")
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        height, width = model_input.shape[2:4]
+        self.input_size = (width if isinstance(width, int) else DEFAULT_INPUT_SIZE,
+                           height if isinstance(height, int) else DEFAULT_INPUT_SIZE)
+        self.mean, self.std = DEFAULT_MEAN, DEFAULT_STD
+        self.labels = None
+        classes = self.session.get_outputs()[0].shape[-1]
+        self.classes = classes if isinstance(classes, int) else None
+
+    # Run one forward pass over an `(N, 3, H, W)` batch, returning `(N, classes)` logits.
+    def predict(self, batch):
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+# NumPy backend for linear classifiers over normalized, flattened pixels.
+class LinearBreedModel:
+    def __init__(self, path, threads):
+        with np.load(path, allow_pickle=False) as archive:
+            self.weights = archive["weights"].astype(np.float32)
+            self.bias = archive["bias"].astype(np.float32)
+            width, height = (int(size) for size in np.broadcast_to(archive["input_size"], (2,)))
+            self.input_size = (width, height)
+            self.mean = tuple(archive["mean"].tolist()) if "mean" in archive else DEFAULT_MEAN
+            self.std = tuple(archive["std"].tolist()) if "std" in archive else DEFAULT_STD
+            self.labels = archive["labels"].tolist() if "labels" in archive else None
+        self.classes = self.weights.shape[1]
+        if self.weights.shape[0] != 3 * width * height:
+            raise ValueError(f"Linear breed model expects {self.weights.shape[0]} features, "
+                             f"but `input_size` gives {3 * width * height}.")
+
+    # Run one forward pass over an `(N, 3, H, W)` batch, returning `(N, classes)` logits.
+    def predict(self, batch):
+        return batch.reshape(len(batch), -1) @ self.weights + self.bias
+
+
+# Registry of available breed model backends, selected by the model file's extension.
+BREED_MODEL_BACKENDS = {
+    ".onnx": OnnxBreedModel,
+    ".npz": LinearBreedModel,
+}
+
+
+#######################################################
+######## EXPORTABLE BREED INFERENCE UTILITY CLASSES ###
+#######################################################
+
+
+# Per-process, micro-batching breed classification service.
+class BreedClassifier:
+    def __init__(self, model_path=None, labels_path=None, workers=2, max_batch_size=32, max_batch_delay=0.005,
+                 max_pending=256, enqueue_timeout=5.0, result_timeout=30.0, threads=1, max_pixels=40_000_000):
+        self.model_path = Path(model_path) if model_path else None
+        self.labels_path = Path(labels_path) if labels_path else None
+        self.workers = workers
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.enqueue_timeout = enqueue_timeout
+        self.result_timeout = result_timeout
+        self.threads = threads
+        self.max_pixels = max_pixels
+        self.model = None
+        self.labels = None
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._worker_threads = []
+        self._start_lock = threading.Lock()
+
+    @property
+    def is_configured(self):
+        return self.model_path is not None
+
+    # Load the model and labels, and start the batching workers (once per process).
+    # NOTE: A label list that does not match the model's classes is rejected here, not on the first prediction.
+    def start(self):
+        if self._worker_threads:
+            return self
+        with self._start_lock:
+            if self._worker_threads:
+                return self
+            if not self.is_configured:
+                raise InferenceUnavailable("Breed classification is not configured (set `BREED_MODEL_PATH`).")
+            if np is None or Image is None:
+                raise InferenceUnavailable("Breed classification requires the `numpy` and `Pillow` packages.")
+            backend = BREED_MODEL_BACKENDS.get(self.model_path.suffix)
+            if backend is None:
+                raise InferenceUnavailable(f"Unsupported breed model format `{self.model_path.suffix}`.")
+            model = backend(self.model_path, self.threads)
+            labels = model.labels or [entry["breed"] for entry in load_breed_catalog(
+                self.labels_path or self.model_path.with_name(BREED_CATALOG_FILENAME))]
+            if model.classes is not None and len(labels) != model.classes:
+                raise InferenceUnavailable(f"Breed model predicts {model.classes} classes, "
+                                           f"but {len(labels)} breed labels were given.")
+            self.model, self.labels = model, labels
+            self._mean = np.array(self.model.mean, dtype=np.float32).reshape(3, 1, 1)
+            self._std = np.array(self.model.std, dtype=np.float32).reshape(3, 1, 1)
+            for index in range(self.workers):
+                worker = threading.Thread(target=self._run_worker, name=f"breed-classifier-{index}", daemon=True)
+                worker.start()
+                self._worker_threads.append(worker)
+        return self
+
+    # Decode, resize, and normalize one photo into a `(3, H, W)` float array.
+    # NOTE: `draft()` lets the JPEG decoder downscale while decoding, so large photos decode quickly.
+    # NOTE: Images over `max_pixels` are rejected from their header, before anything is decoded.
+    def prepare(self, data):
+        self.start()
+        try:
+            with Image.open(BytesIO(data)) as image:
+                pixels = None
+                if image.width * image.height <= self.max_pixels:
+                    image.draft("RGB", self.model.input_size)
+                    pixels = np.asarray(image.convert("RGB").resize(self.model.input_size, Image.Resampling.BILINEAR),
+                                        dtype=np.float32)
+        except Image.DecompressionBombError:
+            pixels = None
+        except (Image.UnidentifiedImageError, OSError, ValueError) as error:
+            raise ImageDecodeError("Expected a JPEG or PNG image.") from error
+        if pixels is None:
+            raise ImageDecodeError(f"Images must be at most {self.max_pixels} pixels.")
+        return (pixels.transpose(2, 0, 1) / 255.0 - self._mean) / self._std
+
+    # Queue one prepared image for the batching workers, returning a `Future` of its prediction.
+    # NOTE: `block=True` waits indefinitely instead of raising (used by the offline back-fill).
+    def submit(self, pixels, block=False):
+        self.start()
+        future = Future()
+        try:
+            self._queue.put((pixels, future), timeout=None if block else self.enqueue_timeout)
+        except queue.Full:
+            raise InferenceBackpressure("Breed classification capacity exceeded. Please retry shortly.")
+        return future
+
+    # Classify one photo, waiting (up to `result_timeout` seconds) for its batch to run.
+    def classify(self, data):
+        try:
+            return self.submit(self.prepare(data)).result(timeout=self.result_timeout)
+        except TimeoutError:
+            raise InferenceBackpressure("Breed classification timed out. Please retry shortly.")
+
+    # Worker loop: gather a micro-batch, run one forward pass, and resolve every waiting future.
+    # NOTE: Any error fails the batch's unresolved futures instead of the worker thread, which keeps serving.
+    def _run_worker(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = monotonic() + self.max_batch_delay
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            started = perf_counter()
+            try:
+                probabilities = softmax(self.model.predict(np.stack([pixels for pixels, _ in batch])))
+                predictions = [self.describe(row) for row in probabilities]
+                record_inference(len(batch), perf_counter() - started)
+                for (_, future), prediction in zip(batch, predictions):
+                    future.set_result(prediction)
+            except Exception as error:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+
+    # Helper function to turn one row of class probabilities into a prediction dictionary.
+    def describe(self, probabilities):
+        top = np.argsort(probabilities)[::-1][:TOP_PREDICTIONS]
+        return {
+            "breed": self.labels[top[0]],
+            "confidence": round(float(probabilities[top[0]]), 4),
+            "top": [{"breed": self.labels[index], "confidence": round(float(probabilities[index]), 4)} for index in top],
+        }
+
+
+#######################################################
+####### EXPORTABLE BREED INFERENCE UTILITY FUNCTIONS ##
+#######################################################
+
+
+# Helper function to convert `(N, classes)` logits into probabilities.
+def softmax(logits):
+    shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+# Write `{dog_id: prediction}` onto live dogs inside the caller's transaction, returning the IDs updated.
+def record_predictions(session, predictions_by_dog_id):
+    assignments_by_id = {dog_id: {"predicted_breed": prediction["breed"], "breed_confidence": prediction["confidence"]}
+                         for dog_id, prediction in predictions_by_dog_id.items()}
+    updated_ids = set(apply_patches(session, Dog, assignments_by_id, ()))
+    if updated_ids:
+        record_changes(session, [(DOG_ENTITY, UPDATE, dog_id, {"id": dog_id, **assignments_by_id[dog_id]})
+                                 for dog_id in sorted(updated_ids)])
+        bump_table_versions(session, Dog)
+    return updated_ids
+
+# Helper function to build a breed classifier from application configuration.
+def breed_classifier_from_config(config):
+    return BreedClassifier(
+        model_path=config["BREED_MODEL_PATH"],
+        labels_path=config["BREED_LABELS_PATH"],
+        workers=config["BREED_CLASSIFIER_WORKERS"],
+        max_batch_size=config["BREED_CLASSIFIER_BATCH_SIZE"],
+        max_batch_delay=config["BREED_CLASSIFIER_BATCH_DELAY_MS"] / 1000,
+        max_pending=config["BREED_CLASSIFIER_QUEUE_SIZE"],
+        enqueue_timeout=config["BREED_CLASSIFIER_TIMEOUT"],
+        result_timeout=config["BREED_CLASSIFIER_RESULT_TIMEOUT"],
+        threads=config["BREED_CLASSIFIER_THREADS"],
+        max_pixels=config["PHOTO_MAX_PIXELS"],
+    )
+
+
+# Process-wide breed classifier shared by the classify route and the back-fill command.
+breed_classifier = breed_classifier_from_config(app.config)
+
+
+#######################################################
+######### BREED PREDICTION BACK-FILL COMMAND ##########
+#######################################################
+
+
+# CLI command to classify dogs in bulk from their stored photos (or a directory of `<dog id>.<ext>` photos).
+# NOTE: Photos are decoded by a thread pool and classified through the same micro-batching
+#       workers as the API; predictions are written with one `UPDATE` per chunk.
+@app.cli.command("classify-dogs")
+@click.option("--photos", "photo_directory", type=click.Path(exists=True, file_okay=False, path_type=Path),
+              help="Directory of `<dog id>.jpg` (or `.jpeg`/`.png`) photos, used instead of stored photos.")
+@click.option("--all", "reclassify", is_flag=True, help="Also reclassify dogs that already have a prediction.")
+@click.option("--chunk-size", type=click.IntRange(min=1), default=512, show_default=True,
+              help="Photos decoded and written per transaction.")
+@click.option("--decoders", type=click.IntRange(min=1), default=8, show_default=True,
+              help="Threads decoding photos.")
+def classify_dogs_command(photo_directory, reclassify, chunk_size, decoders):
+    try:
+        breed_classifier.start()
+    except InferenceUnavailable as error:
+        raise click.ClickException(str(error))
+
+    # STEP 1: Match photos (stored, or files in the given directory) to live dogs still needing a prediction.
+    statement = db.select(Dog.id, Dog.photo).where(Dog.deleted_at.is_(None))
+    if not reclassify:
+        statement = statement.where(Dog.predicted_breed.is_(None))
+    if photo_directory is None:
+        photos_by_dog_id = {dog_id: photo_store.original_path(photo_key)
+                            for dog_id, photo_key in db.session.execute(statement.where(Dog.photo.is_not(None)))}
+    else:
+        photo_files = {int(path.stem): path for path in photo_directory.iterdir()
+                       if path.stem.isdigit() and path.suffix.lower() in (".jpg", ".jpeg", ".png")}
+        photos_by_dog_id = {dog_id: photo_files[dog_id] for dog_id, _ in db.session.execute(statement)
+                            if dog_id in photo_files}
+    dog_ids = sorted(photos_by_dog_id)
+    db.session.rollback()
+
+    # STEP 2: Decode and classify each chunk in parallel, then write its predictions in one transaction.
+    started = perf_counter()
+    classified = unreadable = 0
+
+    def prepare(dog_id):
+        try:
+            return breed_classifier.prepare(photos_by_dog_id[dog_id].read_bytes())
+        except (ImageDecodeError, FileNotFoundError):
+            return None
+
+    with ThreadPoolExecutor(max_workers=decoders) as executor:
+        for start in range(0, len(dog_ids), chunk_size):
+            chunk = dog_ids[start:start + chunk_size]
+            futures = {dog_id: breed_classifier.submit(pixels, block=True)
+                       for dog_id, pixels in zip(chunk, executor.map(prepare, chunk)) if pixels is not None}
+            unreadable += len(chunk) - len(futures)
+            classified += len(record_predictions(db.session, {dog_id: future.result() for dog_id, future in futures.items()}))
+            db.session.commit()
+            elapsed = perf_counter() - started
+            print(f">> {start + len(chunk)}/{len(dog_ids)} photos, {classified / elapsed:.1f} images/sec")
+
+    elapsed = perf_counter() - started
+    print(f">> Classified {classified} dogs in {elapsed:.1f}s ({classified / elapsed if elapsed else 0:.1f} images/sec); "
+          f"{unreadable} unreadable photos skipped.")
@@ -0,0 +1,120 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Flask request-scoped storage and application context utilities.
+from flask import current_app, g, has_request_context
+# SQLAlchemy engine event hooks.
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Additional tools for extending decorator function logic.
+from functools import wraps
+# Context manager construction tools.
+from contextlib import contextmanager
+# Thread-safe bookkeeping tools for active query counters.
+import threading
+# Statement start timestamps (read by `metrics.py`).
+from time import perf_counter
+
+
+#######################################################
+####### EXPORTABLE INSTRUMENTATION UTILITY CLASSES ####
+#######################################################
+
+
+# Error raised when a route issues more SQL statements than its declared budget.
+# NOTE: Subclasses `AssertionError` so test runners report it as a failed assertion.
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+# Running tally of SQL statements executed while a counter is active.
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+    def record(self, statement):
+        self.count += 1
+        self.statements.append(statement)
+
+
+#######################################################
+######## SQL STATEMENT EXECUTION EVENT HANDLING #######
+#######################################################
+
+
+# Counters opened with `count_queries()` on the current thread.
+_local_counters = threading.local()
+
+
+# Engine-wide hook invoked before every SQL statement reaches the database driver.
+# NOTE: Listening on the `Engine` class covers every engine, including test and benchmark engines.
+# NOTE: The single statement hook of the application; it also stamps each statement's start time,
+#       which the `after_cursor_execute` hook in `metrics.py` turns into a duration.
+@event.listens_for(Engine, "before_cursor_execute")
+def record_statement(connection, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.query_started = perf_counter()
+    for counter in getattr(_local_counters, "active", ()):
+        counter.record(statement)
+    if has_request_context():
+        for counter in g.get("query_counters", ()):
+            counter.record(statement)
+
+
+#######################################################
+###### EXPORTABLE INSTRUMENTATION UTILITY FUNCTIONS ###
+#######################################################
+
+
+# Context manager that counts SQL statements executed on the current thread.
+# NOTE: Intended for tests and benchmarks, e.g.:
+#       with count_queries() as counter:
+#           client.get("/api/users/1/dogs")
+#       assert counter.count <= 3
+@contextmanager
+def count_queries():
+    counter = QueryCounter()
+    if not hasattr(_local_counters, "active"):
+        _local_counters.active = []
+    _local_counters.active.append(counter)
+    try:
+        yield counter
+    finally:
+        _local_counters.active.remove(counter)
+
+# Helper function to open a counter of the SQL statements executed for the rest of the current request.
+# NOTE: Used by `metrics.py` for per-request query counts; `query_budget()` opens its own around the view.
+def start_request_counter():
+    counter = QueryCounter()
+    if "query_counters" not in g:
+        g.query_counters = []
+    g.query_counters.append(counter)
+    return counter
+
+# Decorator that declares the maximum number of SQL statements a view may issue.
+# NOTE: Apply between `@app.route` and `@authorization_required` so authentication
+#       queries are included in the budget.
+# NOTE: Overruns raise `QueryBudgetExceeded` when `ENFORCE_QUERY_BUDGETS` is enabled
+#       (as it is under `app.testing`), and are logged as warnings otherwise.
+def query_budget(max_queries):
+    def decorator(func):
+        @wraps(func)
+        def budgeted_view(*args, **kwargs):
+            counter = start_request_counter()
+            try:
+                response = func(*args, **kwargs)
+            finally:
+                g.query_counters.remove(counter)
+            if counter.count > max_queries:
+                message = (f"Route `{func.__name__}` issued {counter.count} SQL queries "
+                           f"(budget: {max_queries}).")
+                if current_app.config.get("ENFORCE_QUERY_BUDGETS") or current_app.testing:
+                    raise QueryBudgetExceeded(message + "\n\n" + "\n\n".join(counter.statements))
+                current_app.logger.warning(message)
+            return response
+        return budgeted_view
+    return decorator
@@ -0,0 +1,79 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Module lookup and import tools.
+import importlib
+import importlib.util
+# First-use import locking tools.
+import threading
+
+
+#######################################################
+########### DEFERRED OPTIONAL IMPORTS OVERVIEW ########
+#######################################################
+
+
+"""
+Optional heavy dependencies (`numpy`, `Pillow`, `onnxruntime`) are only needed
+by a few routes, but importing them at module level made every worker pay for
+them at boot (`numpy` alone is tens of milliseconds). `lazy_import()` replaces
+
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+with
+
+    np = lazy_import("numpy")
+
+It checks that the module is installed without importing it, and returns a
+proxy that imports the real module on first attribute access (e.g. `np.zeros`).
+Modules that are not installed are still `None`, so `if np is None:` checks
+keep working.
+
+NOTE: Run `python benchmarks/bench_startup.py` to see what a worker imports at boot.
+"""
+
+
+#######################################################
+######## EXPORTABLE DEFERRED IMPORT CLASSES ###########
+#######################################################
+
+
+# Stand-in for a module that is imported on first attribute access.
+# NOTE: The lock makes concurrent first accesses (e.g. from request threads) import once.
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, attribute):
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+                module = self._module
+        return getattr(module, attribute)
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r}{'' if self._module is None else ' (loaded)'}>"
+
+
+#######################################################
+####### EXPORTABLE DEFERRED IMPORT FUNCTIONS ##########
+#######################################################
+
+
+# Return a `LazyModule` for an installed module, or `None` if it is not installed.
+# NOTE: Finding a submodule (`PIL.Image`) imports its parent package (`PIL`), which is cheap.
+def lazy_import(name):
+    try:
+        spec = importlib.util.find_spec(name)
+    except ImportError:
+        spec = None
+    return LazyModule(name) if spec is not None else None
@@ -0,0 +1,290 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Flask request-scoped storage and request context utilities.
+from flask import request, g, has_request_context
+# Configured application/server instance.
+from config import app
+# Per-request SQL statement counters (shared with query budgets).
+from instrumentation import start_request_counter
+# SQLAlchemy engine event hooks.
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Context manager construction tools.
+from contextlib import contextmanager
+# Thread-safe metric bookkeeping tools.
+import threading
+# High-resolution timing tools.
+from time import perf_counter
+# Constant-time token comparison for the metrics endpoint.
+from hmac import compare_digest
+
+
+#######################################################
+######### REQUEST PERFORMANCE METRICS OVERVIEW ########
+#######################################################
+
+
+"""
+Every request is timed end to end and broken down into named *phases*:
+
+    auth        Resolving the session's principal in `authorization_required`.
+    db          Executing SQL statements (measured around every cursor execution).
+    serialize   Turning rows/instances into dictionaries (`to_dict()` and compiled serializers).
+    encode      Turning dictionaries into JSON/MessagePack bytes.
+    compress    Compressing the response body.
+    hash        Waiting on the password hashing pool (bcrypt).
+
+Phases may overlap (e.g. `auth` includes the `db` time of a cold principal
+lookup), so they explain where time went rather than summing to the total.
+
+Measurements feed process-wide histograms rendered in the Prometheus text
+format at `GET /metrics`. With `SERVER_TIMING` enabled, each response also
+carries a `Server-Timing` header with its own breakdown, which browser dev
+tools display next to the request.
+
+NOTE: Metrics are kept per process; scrape every worker (or aggregate upstream).
+NOTE: Streamed responses are measured up to the point streaming begins.
+"""
+
+
+#######################################################
+######### METRIC HISTOGRAM CONFIGURATION VALUES #######
+#######################################################
+
+
+# Upper bounds (in seconds) of latency histogram buckets.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds of per-request SQL statement count histogram buckets.
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Histogram buckets for images per inference batch.
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+# Route label used for requests that did not match any route.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+#######################################################
+########## EXPORTABLE METRICS UTILITY CLASSES #########
+#######################################################
+
+
+# Thread-safe, labelled histogram rendered in the Prometheus text exposition format.
+class Histogram:
+    def __init__(self, name, documentation, label_names=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    # Record one observation for the given label values.
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0, 0.0]
+            bucket_counts = series[0]
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    bucket_counts[index] += 1
+                    break
+            series[1] += 1
+            series[2] += value
+
+    # Render every labelled series as Prometheus text lines.
+    # NOTE: Buckets are stored non-cumulatively and accumulated here, as the format requires.
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series_items = sorted((key, ([*bucket_counts], count, total))
+                                  for key, (bucket_counts, count, total) in self._series.items())
+        for key, (bucket_counts, count, total) in series_items:
+            labels = [f'{name}="{escape_label_value(value)}"' for name, value in zip(self.label_names, key)]
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                bucket_labels = format_labels([*labels, 'le="%s"' % upper_bound])
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            infinity_labels = format_labels([*labels, 'le="+Inf"'])
+            lines.append(f"{self.name}_bucket{infinity_labels} {count}")
+            label_set = format_labels(labels)
+            lines.append(f"{self.name}_sum{label_set} {total}")
+            lines.append(f"{self.name}_count{label_set} {count}")
+        return lines
+
+    # Forget every recorded observation (e.g. between benchmark runs).
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+# Per-request accumulator of phase durations and SQL statement counts, stored on `g`.
+# NOTE: Statements are counted by `instrumentation.py`, into the `QueryCounter` passed in.
+class RequestMetrics:
+    def __init__(self, queries):
+        self.started = perf_counter()
+        self.phases = {}
+        self.active_phases = set()
+        self.queries = queries
+
+    @property
+    def query_count(self):
+        return self.queries.count
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+
+#######################################################
+########## PROCESS-WIDE METRIC DEFINITIONS ############
+#######################################################
+
+
+REQUEST_DURATION = Histogram("http_request_duration_seconds", "Time spent handling a request.",
+                             ("method", "route", "status"))
+REQUEST_PHASE_DURATION = Histogram("http_request_phase_duration_seconds",
+                                   "Time spent per request in each phase (auth, db, serialize, ...).",
+                                   ("route", "phase"))
+REQUEST_QUERY_COUNT = Histogram("http_request_sql_queries", "SQL statements executed per request.",
+                                ("route",), buckets=QUERY_COUNT_BUCKETS)
+SQL_QUERY_DURATION = Histogram("db_query_duration_seconds", "Time spent executing a single SQL statement.",
+                               ("operation",))
+PASSWORD_HASH_DURATION = Histogram("password_hash_duration_seconds",
+                                   "Time a request spent waiting on the password hashing pool.",
+                                   ("operation",))
+INFERENCE_BATCH_SIZE = Histogram("breed_inference_batch_size", "Images per breed classification forward pass.",
+                                 buckets=BATCH_SIZE_BUCKETS)
+INFERENCE_DURATION = Histogram("breed_inference_duration_seconds", "Time spent in one breed classification forward pass.")
+
+# Every histogram exposed at `GET /metrics`, in rendering order.
+METRICS = [REQUEST_DURATION, REQUEST_PHASE_DURATION, REQUEST_QUERY_COUNT, SQL_QUERY_DURATION, PASSWORD_HASH_DURATION,
+           INFERENCE_BATCH_SIZE, INFERENCE_DURATION]
+
+
+#######################################################
+######### EXPORTABLE METRICS UTILITY FUNCTIONS ########
+#######################################################
+
+
+# Helper function to escape a Prometheus label value.
+def escape_label_value(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+# Helper function to join rendered `name="value"` pairs into a Prometheus label set.
+def format_labels(labels):
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+# Helper function to fetch the current request's metrics accumulator, or `None` outside a request.
+def current_request_metrics():
+    if has_request_context():
+        return g.get("request_metrics")
+    return None
+
+# Context manager (or decorator) that attributes the enclosed time to a phase of the current request.
+# NOTE: Nested use of the same phase (e.g. `to_dict()` recursing into relationships) is counted once.
+@contextmanager
+def timed_phase(phase):
+    request_metrics = current_request_metrics()
+    if request_metrics is None or phase in request_metrics.active_phases:
+        yield
+        return
+    request_metrics.active_phases.add(phase)
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        request_metrics.active_phases.discard(phase)
+        request_metrics.add(phase, perf_counter() - started)
+
+# Helper function to record time spent waiting on the password hashing pool.
+def record_password_hash(operation, seconds):
+    PASSWORD_HASH_DURATION.observe(seconds, operation=operation)
+    request_metrics = current_request_metrics()
+    if request_metrics is not None:
+        request_metrics.add("hash", seconds)
+
+# Helper function to record one breed classification forward pass (called from inference worker threads).
+def record_inference(batch_size, seconds):
+    INFERENCE_BATCH_SIZE.observe(batch_size)
+    INFERENCE_DURATION.observe(seconds)
+
+# Helper function to render every metric in the Prometheus text exposition format.
+def render_metrics():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+# Helper function to check a `/metrics` request's `Authorization` header against `METRICS_TOKEN` (if set).
+def is_metrics_request_authorized(authorization):
+    token = app.config["METRICS_TOKEN"]
+    if not token:
+        return True
+    return compare_digest((authorization or "").encode("utf-8"), f"Bearer {token}".encode("utf-8"))
+
+# Helper function to format a request's phase breakdown as a `Server-Timing` header value.
+def server_timing_header(request_metrics, total_seconds):
+    entries = [f"total;dur={total_seconds * 1000:.2f}"]
+    for phase, seconds in sorted(request_metrics.phases.items()):
+        entries.append(f"{phase};dur={seconds * 1000:.2f}"
+                       + (f';desc="{request_metrics.query_count} queries"' if phase == "db" else ""))
+    return ", ".join(entries)
+
+
+#######################################################
+######## SQL STATEMENT EXECUTION EVENT HANDLING #######
+#######################################################
+
+
+# Engine-wide hook that records the duration of every completed SQL statement.
+# NOTE: Listening on the `Engine` class covers the `db` engine from `config.py` (and any other engine).
+# NOTE: Start times are stamped by the statement hook in `instrumentation.py`, which also counts statements.
+@event.listens_for(Engine, "after_cursor_execute")
+def record_statement_duration(connection, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "query_started", None)
+    if started is None:
+        return
+    seconds = perf_counter() - started
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+    SQL_QUERY_DURATION.observe(seconds, operation=operation)
+    request_metrics = current_request_metrics()
+    if request_metrics is not None:
+        request_metrics.add("db", seconds)
+
+
+#######################################################
+######## REQUEST METRICS APPLICATION HOOK(S) ##########
+#######################################################
+
+
+# Start timing every request.
+@app.before_request
+def start_request_metrics():
+    g.request_metrics = RequestMetrics(start_request_counter())
+
+# Record every finished request and optionally attach its `Server-Timing` breakdown.
+# NOTE: Registered before the other modules' `after_request` hooks (e.g. response encoding), so it runs after
+#       them and includes their time. The CORS hook is registered earlier, by `build_app()`, so it runs
+#       later and its (header-only) time is not included.
+@app.after_request
+def record_request_metrics(response):
+    request_metrics = current_request_metrics()
+    if request_metrics is None:
+        return response
+    total_seconds = perf_counter() - request_metrics.started
+    route = request.url_rule.rule if request.url_rule is not None else UNMATCHED_ROUTE
+
+    REQUEST_DURATION.observe(total_seconds, method=request.method, route=route, status=response.status_code)
+    REQUEST_QUERY_COUNT.observe(request_metrics.query_count, route=route)
+    for phase, seconds in request_metrics.phases.items():
+        REQUEST_PHASE_DURATION.observe(seconds, route=route, phase=phase)
+
+    if app.config["SERVER_TIMING"]:
+        response.headers["Server-Timing"] = server_timing_header(request_metrics, total_seconds)
+    return response
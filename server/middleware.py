@@ -5,19 +5,166 @@
 
 # Flask server request-response and session storage utilities.
 from flask import make_response, session
-# Configured application/server instance.
-from config import app
+# Configured application/server and database instances.
+from config import app, db
 # Relative access to user model.
 from models import User
+# Server-side sessions, which carry the principal's fields.
+from sessions import ServerSession
+# Request phase timing for performance metrics.
+from metrics import timed_phase
+# SQLAlchemy ORM event hooks and session tools.
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 
 # Additional tools for extending decorator function logic.
 from functools import partial, wraps
+# Cache bookkeeping tools for authenticated principals.
+from collections import OrderedDict
+from time import monotonic
+import threading
+
+
+#######################################################
+######## EXPORTABLE MIDDLEWARE UTILITY CLASSES ########
+#######################################################
+
+
+# Lightweight, immutable view of an authenticated user passed to views as `current_user`.
+# NOTE: Supports `current_user["id"]`-style access so views written against
+#       the previous serialized-dict interface keep working.
+class Principal:
+    __slots__ = ("id", "username", "is_admin")
+
+    def __init__(self, id, username, is_admin):
+        self.id = id
+        self.username = username
+        self.is_admin = bool(is_admin)
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def is_administrator(self):
+        return self.is_admin
+
+    def to_dict(self):
+        return {"id": self.id, "username": self.username, "is_admin": self.is_admin}
+
+
+# Thread-safe, size-bounded cache of principals keyed by session user ID.
+# NOTE: Entries expire after `ttl` seconds and the least recently used entry is
+#       evicted once `max_size` entries are held.
+# NOTE: The cache is per-process; the TTL bounds how long another worker's write can go unseen.
+class PrincipalCache:
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            principal, expires_at = entry
+            if expires_at <= monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def put(self, principal):
+        with self._lock:
+            self._entries[principal.id] = (principal, monotonic() + self.ttl)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide principal cache used by `authorization_required`.
+principal_cache = PrincipalCache(max_size=app.config["PRINCIPAL_CACHE_SIZE"], 
+                                 ttl=app.config["PRINCIPAL_CACHE_TTL"])
+
+
+#######################################################
+####### PRINCIPAL CACHE INVALIDATION EVENT HOOKS ######
+#######################################################
+
+
+# Invalidate cached principals whenever a user row is updated or deleted through the ORM.
+# NOTE: Invalidation happens at flush time and again after commit, so a concurrent
+#       request cannot re-cache the pre-commit row for the rest of the TTL.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_changed_principal(mapper, connection, target):
+    invalidate_principal(object_session(target), target.id)
+
+# Helper function to invalidate a user's cached principal now and again once the database session commits.
+# NOTE: Also called by Core `UPDATE` paths (e.g. `updates.patch_users()`) that bypass the ORM events above.
+def invalidate_principal(database_session, user_id):
+    principal_cache.invalidate(user_id)
+    if database_session is not None:
+        database_session.info.setdefault("changed_user_ids", set()).add(user_id)
+
+@event.listens_for(Session, "after_commit")
+def invalidate_committed_principals(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        principal_cache.invalidate(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def discard_rolled_back_principals(session):
+    session.info.pop("changed_user_ids", None)
 
 
 #######################################################
 ###### EXPORTABLE MIDDLEWARE UTILITY FUNCTION(S) ######
 #######################################################
 
+
+# Helper function to resolve a session user ID into a principal, consulting the cache first.
+# NOTE: Cache misses load only the three columns a principal needs (no relationships).
+# NOTE: Pass `session` to load through a session other than Flask-SQLAlchemy's (e.g. the ASGI server's).
+def load_principal(user_id, session=None):
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    row = (session or db.session).execute(
+        db.select(User.id, User.username, User.is_admin).where(User.id == user_id)
+    ).first()
+    if row is None:
+        return None
+
+    principal = Principal(id=row.id, username=row.username, is_admin=row.is_admin)
+    principal_cache.put(principal)
+    return principal
+
+# Helper function to build the principal cached in a server-side session, or `None`.
+# NOTE: Cookie sessions (`SESSION_BACKEND=cookie`) cannot be revoked, so their fields are never trusted.
+def cached_session_principal(session_data):
+    if not isinstance(session_data, ServerSession) or not session_data.get("user_id") or "is_admin" not in session_data:
+        return None
+    return Principal(id=session_data["user_id"], username=session_data.get("username"), is_admin=session_data["is_admin"])
+
+# Helper function to resolve the current request's principal, or `None` when logged out.
+# NOTE: Server-side sessions need no database access; cookie sessions consult the principal cache first.
+def current_principal():
+    user_id = session.get("user_id")
+    if not user_id:
+        return None
+    return cached_session_principal(session) or load_principal(user_id)
+
 def authorization_required(func=None, methods=["GET"]):
     # Applied operations to handle optional `methods` argument for decorator.
     if func is None:
@@ -36,13 +183,14 @@ def authorization_required(func=None, methods=["GET"]):
         if not user_id:
             return make_response({"error": "User account not authenticated. Please log in or sign up to continue using the application."}, 401)
         try:
-            # Query users from database where authorized user exists (has matching ID).
-            authorized_user = User.query.filter(User.id == user_id).first()
+            # Resolve authorized user (has matching ID) from the session, the principal cache, or the database.
+            with timed_phase("auth"):
+                authorized_user = cached_session_principal(session) or load_principal(user_id)
             if authorized_user is None:
                 return make_response({"error": "Invalid username or password. Try again."}, 401)
             
             # Define methods authorized only for administrative access.
-            UNAUTHORIZED_METHODS = ["POST", "PATCH", "DELETE"]
+            UNAUTHORIZED_METHODS = ["POST", "PUT", "PATCH", "DELETE"]
             # Check if any decorator-submitted methods are unauthorized to non-administrative users.
             if any(method in methods for method in UNAUTHORIZED_METHODS):
                 # If so, check if currently authorized user is an administrator.
@@ -52,6 +200,6 @@ def authorization_required(func=None, methods=["GET"]):
         except Exception as error:
             return make_response({"error": "Something went wrong.", "details": str(error)}, 500)
         
-        # Invoke wrapped view function with administrative access as output.
-        return func(authorized_user.to_dict(), *args, **kwargs)
+        # Invoke wrapped view function with the lightweight authorized principal as output.
+        return func(authorized_user, *args, **kwargs)
     return decorated_authorizer
\ No newline at end of file
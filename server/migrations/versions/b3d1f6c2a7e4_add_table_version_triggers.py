@@ -0,0 +1,59 @@
+"""add table version triggers
+
+Revision ID: b3d1f6c2a7e4
+Revises: 8f3cf9635222
+Create Date: 2026-10-18 09:12:40.518305
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3d1f6c2a7e4'
+down_revision = '8f3cf9635222'
+branch_labels = None
+depends_on = None
+
+
+# Tables whose writes invalidate cached responses (a snapshot of `caching.VERSIONED_TABLES`).
+VERSIONED_TABLES = ('dog_table', 'user_table', 'adoption_table', 'breed_stats', 'user_adoption_stats')
+
+# Triggers bumping `table_version` on every write (a snapshot of `caching.VERSION_TRIGGER_DDL`).
+SQLITE_OPERATIONS = ('INSERT', 'UPDATE', 'DELETE')
+SQLITE_TRIGGER_DDL = [
+    f"CREATE TRIGGER IF NOT EXISTS {table_name}_version_after_{operation.lower()} "
+    f"AFTER {operation} ON {table_name} BEGIN "
+    f"INSERT INTO table_version (name, version) VALUES ('{table_name}', 1) "
+    f"ON CONFLICT (name) DO UPDATE SET version = version + 1; END"
+    for table_name in VERSIONED_TABLES for operation in SQLITE_OPERATIONS
+]
+POSTGRESQL_TRIGGER_DDL = [
+    "CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$ BEGIN "
+    "INSERT INTO table_version (name, version) VALUES (TG_TABLE_NAME, 1) "
+    "ON CONFLICT (name) DO UPDATE SET version = table_version.version + 1; "
+    "RETURN NULL; END; $$ LANGUAGE plpgsql",
+    *(f"CREATE OR REPLACE TRIGGER {table_name}_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table_name} "
+      f"FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()" for table_name in VERSIONED_TABLES),
+]
+
+
+def upgrade():
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == 'sqlite':
+        for statement in SQLITE_TRIGGER_DDL:
+            op.execute(statement)
+    elif dialect_name == 'postgresql':
+        for statement in POSTGRESQL_TRIGGER_DDL:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == 'sqlite':
+        for table_name in VERSIONED_TABLES:
+            for operation in SQLITE_OPERATIONS:
+                op.execute(f"DROP TRIGGER IF EXISTS {table_name}_version_after_{operation.lower()}")
+    elif dialect_name == 'postgresql':
+        for table_name in VERSIONED_TABLES:
+            op.execute(f"DROP TRIGGER IF EXISTS {table_name}_version ON {table_name}")
+        op.execute("DROP FUNCTION IF EXISTS bump_table_version()")
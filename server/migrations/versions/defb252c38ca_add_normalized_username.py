@@ -0,0 +1,45 @@
+"""add normalized username
+
+Revision ID: defb252c38ca
+Revises: 4c16be5e7cb8
+Create Date: 2026-10-17 23:26:13.724045
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'defb252c38ca'
+down_revision = '4c16be5e7cb8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Add the column as nullable first so existing rows can be backfilled.
+    with op.batch_alter_table('user_table', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('username_normalized', sa.String(), nullable=True))
+
+    # Backfill with the same normalization the `User` model applies on assignment.
+    # NOTE: Normalization happens in Python because SQLite's `lower()` only folds ASCII.
+    connection = op.get_bind()
+    user_table = sa.table('user_table', sa.column('id', sa.Integer), sa.column('username', sa.String),
+                          sa.column('username_normalized', sa.String))
+    rows = connection.execute(sa.select(user_table.c.id, user_table.c.username)).all()
+    if rows:
+        connection.execute(
+            user_table.update().where(user_table.c.id == sa.bindparam('user_id'))
+                               .values(username_normalized=sa.bindparam('normalized')),
+            [{'user_id': row.id, 'normalized': row.username.strip().casefold()} for row in rows]
+        )
+
+    with op.batch_alter_table('user_table', schema=None) as batch_op:
+        batch_op.alter_column('username_normalized', existing_type=sa.String(), nullable=False)
+        batch_op.create_index(batch_op.f('ix_user_table_username_normalized'), ['username_normalized'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('user_table', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_table_username_normalized'))
+        batch_op.drop_column('username_normalized')
@@ -0,0 +1,62 @@
+"""add dog search indexes
+
+Revision ID: f270e53547bb
+Revises: 9a18366d623d
+Create Date: 2026-10-17 23:42:35.931844
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f270e53547bb'
+down_revision = '9a18366d623d'
+branch_labels = None
+depends_on = None
+
+
+# Full-text search indexes over `dog_table` and the triggers that keep them in sync.
+# NOTE: A snapshot of `search.SEARCH_INDEX_DDL` at the time of this revision.
+# NOTE: FTS5 is SQLite-only; other databases use the unindexed fallback in `search.py`.
+SEARCH_INDEX_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS dog_search USING fts5("
+    "name, breed, content='dog_table', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS dog_search_trigram USING fts5("
+    "name, breed, content='dog_table', content_rowid='id', tokenize='trigram')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS dog_search_vocab USING fts5vocab(dog_search, 'row')",
+    "CREATE TRIGGER IF NOT EXISTS dog_search_after_insert AFTER INSERT ON dog_table BEGIN "
+    "INSERT INTO dog_search (rowid, name, breed) VALUES (new.id, new.name, new.breed); "
+    "INSERT INTO dog_search_trigram (rowid, name, breed) VALUES (new.id, new.name, new.breed); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS dog_search_after_delete AFTER DELETE ON dog_table BEGIN "
+    "INSERT INTO dog_search (dog_search, rowid, name, breed) VALUES ('delete', old.id, old.name, old.breed); "
+    "INSERT INTO dog_search_trigram (dog_search_trigram, rowid, name, breed) VALUES ('delete', old.id, old.name, old.breed); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS dog_search_after_update AFTER UPDATE OF name, breed ON dog_table BEGIN "
+    "INSERT INTO dog_search (dog_search, rowid, name, breed) VALUES ('delete', old.id, old.name, old.breed); "
+    "INSERT INTO dog_search_trigram (dog_search_trigram, rowid, name, breed) VALUES ('delete', old.id, old.name, old.breed); "
+    "INSERT INTO dog_search (rowid, name, breed) VALUES (new.id, new.name, new.breed); "
+    "INSERT INTO dog_search_trigram (rowid, name, breed) VALUES (new.id, new.name, new.breed); "
+    "END",
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in SEARCH_INDEX_DDL:
+        op.execute(statement)
+
+    # Index every existing dog.
+    op.execute("INSERT INTO dog_search (dog_search) VALUES ('rebuild')")
+    op.execute("INSERT INTO dog_search_trigram (dog_search_trigram) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for trigger in ('dog_search_after_insert', 'dog_search_after_delete', 'dog_search_after_update'):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    for virtual_table in ('dog_search_vocab', 'dog_search_trigram', 'dog_search'):
+        op.execute(f"DROP TABLE IF EXISTS {virtual_table}")
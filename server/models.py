@@ -3,14 +3,58 @@
 #######################################################
 
 
-# Configured database instance.
-from config import db
+# Configured application/server and database instances.
+from config import app, db
 # SQLAlchemy object validation tools.
 from sqlalchemy.orm import validates
-# SQLAlchemy object model serialization tools.
-from sqlalchemy_serializer import SerializerMixin
+# SQLAlchemy object model serialization tools (timed for performance metrics).
+from serializers import TimedSerializerMixin as SerializerMixin
 # SQLAlchemy object association tools.
 from sqlalchemy.ext.associationproxy import association_proxy
+# Content-addressed photo URLs (serialized in place of stored photo keys).
+from photos import photo_url as photo_url_for, thumbnail_url as thumbnail_url_for
+# SQLAlchemy Core statement construction and dialect-specific `INSERT ... ON CONFLICT` tools.
+from sqlalchemy import update, insert
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+#######################################################
+########## MODEL-LEVEL HELPER FUNCTION(S) #############
+#######################################################
+
+
+# Helper function to normalize a username for case-insensitive, exact-match lookups.
+# NOTE: `casefold()` is a stricter `lower()` that also folds non-ASCII characters.
+def normalize_username(username):
+    return username.strip().casefold()
+
+# Helper function to build the criteria matching live (not soft-deleted) rows of a model.
+# NOTE: Models without a `deleted_at` column have no soft-deleted rows, so no criteria are needed.
+def live_criteria(model):
+    return [model.deleted_at.is_(None)] if hasattr(model, "deleted_at") else []
+
+# Dialects whose `INSERT ... ON CONFLICT DO UPDATE` adds to counter rows in a single statement.
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# Helper function to add `increments` to the counter columns of the row with primary key `keys`, creating it if missing.
+# NOTE: A single upsert, so concurrent transactions creating the same row never fail on its primary key.
+# NOTE: Other dialects `UPDATE` first and only `INSERT` when no row matched.
+def increment_counters(session_or_connection, model, keys, increments):
+    dialect = getattr(session_or_connection, "dialect", None) or session_or_connection.get_bind().dialect
+    dialect_insert = UPSERT_INSERTS.get(dialect.name)
+    if dialect_insert is not None:
+        statement = dialect_insert(model).values(**keys, **increments)
+        session_or_connection.execute(statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={column: getattr(model, column) + statement.excluded[column] for column in increments},
+        ))
+        return
+    result = session_or_connection.execute(
+        update(model).where(*(getattr(model, column) == value for column, value in keys.items()))
+        .values({column: getattr(model, column) + increment for column, increment in increments.items()})
+    )
+    if result.rowcount == 0:
+        session_or_connection.execute(insert(model).values(**keys, **increments))
 
 
 #######################################################
@@ -72,21 +116,51 @@ class Dog(db.Model, SerializerMixin):
     # 0a.   Set up name of SQL database table containing dog data.
     __tablename__ = "dog_table"
 
+    # 0a.   Set up composite indexes backing keyset pagination over filtered catalog reads.
+    # NOTE: Each index ends in `id` so `WHERE <filter> AND id > ? ORDER BY id` is a range scan.
+    __table_args__ = (
+        db.Index("ix_dog_table_breed_id", "breed", "id"),
+        db.Index("ix_dog_table_is_adoptable_id", "is_adoptable", "id"),
+        db.Index("ix_dog_table_created_at", "created_at"),
+        # NOTE: Partial index over soft-deleted dogs only, so the archival job finds them
+        #       without scanning (or indexing) every live dog.
+        db.Index("ix_dog_table_deleted_at", "deleted_at",
+                 sqlite_where=db.text("deleted_at IS NOT NULL"), postgresql_where=db.text("deleted_at IS NOT NULL")),
+    )
+
     # 0a.   Set up physical object columns prior to interdependent association(s).
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String, nullable=False)
     breed = db.Column(db.String, nullable=False)
-    # photo = db.Column(db.String, nullable=False)
+    # NOTE: Holds the content-addressed key of the dog's photo on disk (see `photos.py`), never image bytes;
+    #       dogs without a photo keep `NULL`.
+    photo = db.Column(db.String, nullable=True)
     is_adoptable = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, server_default=db.func.now())
+    # NOTE: Set when the dog is removed; soft-deleted dogs are hidden from every route
+    #       and later moved to `dog_archive` (see `archive.py`).
+    deleted_at = db.Column(db.DateTime, nullable=True)
+    # NOTE: Written by the breed classifier (see `inference.py`); the admin-entered `breed` is never overwritten.
+    predicted_breed = db.Column(db.String, nullable=True)
+    breed_confidence = db.Column(db.Float, nullable=True)
 
     def is_eligible_for_adoption(self):
-        return self.is_adoptable
+        return self.is_adoptable and self.deleted_at is None
+
+    # URLs of the dog's photo and thumbnail (`None` without a photo).
+    @property
+    def photo_url(self):
+        return photo_url_for(self.photo)
+
+    @property
+    def thumbnail_url(self):
+        return thumbnail_url_for(self.photo)
 
     # 1a.   Create a relationship that links a dog row to an adoption row.
     # NOTE: This relationship sets up the connection from a dog to an adoption, 
     #       and must be closed from an adoption back to a dog. 
-    adoptions = db.relationship("Adoption", back_populates="dog")
+    adoptions = db.relationship("Adoption", back_populates="dog", 
+                                lazy=app.config["COLLECTION_LOADING_STRATEGY"])
 
     # 2a.   Create an association proxy from the dog-adoption relationship 
     #       to the user-adoption relationship.
@@ -94,7 +168,11 @@ class Dog(db.Model, SerializerMixin):
 
     # 3a.   Create serialization rules to avoid infinite cascading/recursion
     #       when accessing dog data from an adoption.
-    serialize_rules = ("-adoptions.dog",)
+    # NOTE: `deleted_at` is internal bookkeeping (only live dogs are ever served) and is never serialized.
+    # NOTE: The stored `photo` key is replaced by `photo_url` and `thumbnail_url`.
+    serialize_rules = ("-adoptions.dog", "-deleted_at", "-photo", "photo_url", "thumbnail_url")
+    # NOTE: Computed fields the precompiled serializers derive from a column (see `serializers.py`).
+    serialize_computed = {"photo_url": ("photo", photo_url_for), "thumbnail_url": ("photo", thumbnail_url_for)}
 
 
 # Database object model definition for user(s).
@@ -109,17 +187,27 @@ class User(db.Model, SerializerMixin):
     # 0b.   Set up physical object columns prior to interdependent association(s).
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String, unique=True, nullable=False)
+    # NOTE: Indexed, normalized copy of `username` that login matches exactly, 
+    #       so lookups are an index seek and usernames are unique regardless of case.
+    username_normalized = db.Column(db.String, unique=True, nullable=False, index=True)
     password = db.Column(db.String, nullable=False)
     is_admin = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, server_default=db.func.now())
 
     def is_administrator(self):
         return self.is_admin
+
+    # Keep the normalized username in sync whenever `username` is assigned.
+    @validates("username")
+    def validate_username(self, key, username):
+        self.username_normalized = normalize_username(username)
+        return username
     
     # 1c.   Create a relationship that links a user row to an adoption row.
     # NOTE: This relationship sets up the connection from a user to an adoption, 
     #       and must be closed from an adoption back to a user.
-    adoptions = db.relationship("Adoption", back_populates="user")
+    adoptions = db.relationship("Adoption", back_populates="user", 
+                                lazy=app.config["COLLECTION_LOADING_STRATEGY"])
 
     # 2b.   Create an association proxy from the user-adoption relationship
     #       to the dog-adoption relationship.
@@ -127,7 +215,8 @@ class User(db.Model, SerializerMixin):
 
     # 3b.   Create serialization rules to avoid infinite cascading/recursion 
     #       when accessing user data from an adoption.
-    serialize_rules = ("-adoptions.user",)
+    # NOTE: `username_normalized` is an internal lookup key and is never serialized.
+    serialize_rules = ("-adoptions.user", "-username_normalized")
     
 
 # Database association model definition for connecting a dog and a user.
@@ -138,6 +227,13 @@ class Adoption(db.Model, SerializerMixin):
     # 0c.   Set up name of SQL database table containing adoption data.
     __tablename__ = "adoption_table"
 
+    # 0c.   Set up indexes backing per-user adoption reads, per-dog lookups, and age-based archival.
+    __table_args__ = (
+        db.Index("ix_adoption_table_user_id_created_at", "user_id", "created_at"),
+        db.Index("ix_adoption_table_dog_id", "dog_id"),
+        db.Index("ix_adoption_table_created_at", "created_at"),
+    )
+
     # 0c.   Set up association object columns prior to dependent association(s).
     id = db.Column(db.Integer, primary_key=True)
     dog_id = db.Column(db.Integer, db.ForeignKey("dog_table.id"))
@@ -147,15 +243,116 @@ class Adoption(db.Model, SerializerMixin):
     # 1b.   Extend the relationship from (1a) to link from an adoption row back to a dog row.
     # NOTE: This relationship is the secondary piece that closes the loop from a dog to an adoption
     #       by connecting an adoption back to a dog.
-    dog = db.relationship("Dog", back_populates="adoptions")
+    dog = db.relationship("Dog", back_populates="adoptions", 
+                          lazy=app.config["REFERENCE_LOADING_STRATEGY"])
 
     # 1d.   Extend the relationship from (1c) to link from an adoption row back to a user row.
     # NOTE: This relationship is the secondary piece that closes the loop from a user to an adoption
     #       by connecting an adoption back to a user.
-    user = db.relationship("User", back_populates="adoptions")
+    user = db.relationship("User", back_populates="adoptions", 
+                           lazy=app.config["REFERENCE_LOADING_STRATEGY"])
 
     # 3c.   Create serialization rules to avoid infinite cascading/recursion
     #       when accessing adoption data from a dog.
     # 3d.   Create serialization rules to avoid infinite cascading/recursion 
     #       when accessing adoption data from a user.
-    serialize_rules = ("-dog.adoptions", "-user.adoptions")
\ No newline at end of file
+    serialize_rules = ("-dog.adoptions", "-user.adoptions")
+
+
+#######################################################
+######### INFRASTRUCTURE DATABASE OBJECT MODEL(S) #####
+#######################################################
+
+
+# Database object model definition for per-table version counters.
+# NOTE: Each write to a cached table bumps its counter in the same transaction,
+#       and cached read routes derive their ETags from the counters (see `caching.py`).
+class TableVersion(db.Model):
+    __tablename__ = "table_version"
+
+    name = db.Column(db.String, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+# Database object model definition for the append-only change log (outbox) behind `GET /api/changes`.
+# NOTE: Rows are written in the same transaction as the dog/adoption writes they describe (see `changes.py`).
+# NOTE: `AUTOINCREMENT` keeps SQLite from ever reusing a sequence number, so `seq` only grows.
+class ChangeLog(db.Model):
+    __tablename__ = "change_log"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String, nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    operation = db.Column(db.String, nullable=False)
+    data = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+
+
+#######################################################
+########### ARCHIVE DATABASE OBJECT MODEL(S) ##########
+#######################################################
+
+
+# Database object model definition for archived (soft-deleted) dogs.
+# NOTE: Rows keep their original IDs and columns and are moved here in batches (see `archive.py`).
+class DogArchive(db.Model):
+    __tablename__ = "dog_archive"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String, nullable=False)
+    breed = db.Column(db.String, nullable=False)
+    is_adoptable = db.Column(db.Boolean)
+    created_at = db.Column(db.DateTime)
+    deleted_at = db.Column(db.DateTime)
+    photo = db.Column(db.String)
+    predicted_breed = db.Column(db.String)
+    breed_confidence = db.Column(db.Float)
+    archived_at = db.Column(db.DateTime, server_default=db.func.now())
+
+
+# Database object model definition for archived adoptions (old adoptions and those of archived dogs).
+# NOTE: Rows keep their original IDs and columns and are moved here in batches (see `archive.py`).
+class AdoptionArchive(db.Model):
+    __tablename__ = "adoption_archive"
+
+    # Index backing per-user adoption history reads.
+    __table_args__ = (
+        db.Index("ix_adoption_archive_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    dog_id = db.Column(db.Integer)
+    user_id = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, server_default=db.func.now())
+
+
+#######################################################
+########### SUMMARY DATABASE OBJECT MODEL(S) ##########
+#######################################################
+
+
+# Database object model definition for per-breed availability counts.
+# NOTE: Maintained incrementally in the same transaction as every dog write (see `stats.py`).
+# NOTE: `available_count` counts adoptable dogs; `adopted_count` counts every other dog of the breed.
+class BreedStats(db.Model):
+    __tablename__ = "breed_stats"
+
+    breed = db.Column(db.String, primary_key=True)
+    available_count = db.Column(db.Integer, nullable=False, default=0)
+    adopted_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+# Database object model definition for per-user adoption counts.
+# NOTE: Maintained incrementally in the same transaction as every adoption write (see `stats.py`).
+class UserAdoptionStats(db.Model):
+    __tablename__ = "user_adoption_stats"
+
+    # Index backing "top adopters" reads, ordered by count.
+    __table_args__ = (
+        db.Index("ix_user_adoption_stats_adoption_count", "adoption_count", "user_id"),
+    )
+
+    user_id = db.Column(db.Integer, db.ForeignKey("user_table.id", ondelete="CASCADE"), primary_key=True)
+    adoption_count = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,150 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Flask application-aware JSON encoding tools.
+from flask import json
+
+# Datetime parsing tools for `created_at` range filters.
+from datetime import datetime
+# URL query string encoding tools for pagination links.
+from urllib.parse import urlencode
+
+
+#######################################################
+############ PAGINATION CONFIGURATION VALUES ##########
+#######################################################
+
+
+# Number of rows returned by a paginated route when no `limit` is given.
+DEFAULT_PAGE_SIZE = 100
+# Upper bound on client-requested page sizes to keep per-request memory flat.
+MAX_PAGE_SIZE = 1000
+# Number of rows fetched per round trip while streaming a full export.
+EXPORT_BATCH_SIZE = 1000
+
+# Accepted spellings of boolean query string values.
+TRUTHY_VALUES = ("true", "1", "yes")
+FALSY_VALUES = ("false", "0", "no")
+
+
+#######################################################
+######## EXPORTABLE PAGINATION UTILITY CLASSES ########
+#######################################################
+
+
+# Error raised when a query string argument cannot be parsed.
+# NOTE: Routes catch this and convert it into a `400 Bad Request` response.
+class QueryParameterError(ValueError):
+    pass
+
+
+#######################################################
+####### EXPORTABLE PAGINATION UTILITY FUNCTIONS #######
+#######################################################
+
+
+# Helper function to parse an optional positive integer from the query string.
+def parse_positive_int(args, name, default=None):
+    raw_value = args.get(name)
+    if raw_value is None or raw_value == "":
+        return default
+    try:
+        value = int(raw_value)
+    except ValueError:
+        raise QueryParameterError(f"Query parameter `{name}` must be an integer (received `{raw_value}`).")
+    if value < 0:
+        raise QueryParameterError(f"Query parameter `{name}` must not be negative (received `{raw_value}`).")
+    return value
+
+# Helper function to parse an optional boolean from the query string.
+def parse_bool(args, name):
+    raw_value = args.get(name)
+    if raw_value is None or raw_value == "":
+        return None
+    if raw_value.lower() in TRUTHY_VALUES:
+        return True
+    if raw_value.lower() in FALSY_VALUES:
+        return False
+    raise QueryParameterError(f"Query parameter `{name}` must be `true` or `false` (received `{raw_value}`).")
+
+# Helper function to parse an optional ISO-8601 timestamp from the query string.
+def parse_datetime(args, name):
+    raw_value = args.get(name)
+    if raw_value is None or raw_value == "":
+        return None
+    try:
+        return datetime.fromisoformat(raw_value)
+    except ValueError:
+        raise QueryParameterError(f"Query parameter `{name}` must be an ISO-8601 timestamp (received `{raw_value}`).")
+
+# Helper function to extract the keyset cursor and page size from the query string.
+# NOTE: `after_id` is exclusive, so clients pass back the last ID they received.
+def parse_page(args):
+    after_id = parse_positive_int(args, "after_id", default=0)
+    limit = parse_positive_int(args, "limit", default=DEFAULT_PAGE_SIZE)
+    if limit == 0:
+        raise QueryParameterError("Query parameter `limit` must be at least 1.")
+    return after_id, min(limit, MAX_PAGE_SIZE)
+
+# Helper function to translate catalog query string filters into SQL criteria.
+# NOTE: Filters are pushed into the `WHERE` clause rather than applied to loaded rows.
+# NOTE: With `exact_breed=False`, `breed` is left to the caller (e.g. search matches it word by word).
+def dog_filter_criteria(model, args, exact_breed=True):
+    # NOTE: Soft-deleted dogs are never listed, so every catalog read starts from live rows.
+    criteria = [model.deleted_at.is_(None)]
+
+    breed = args.get("breed")
+    if breed and exact_breed:
+        criteria.append(model.breed == breed)
+
+    is_adoptable = parse_bool(args, "is_adoptable")
+    if is_adoptable is not None:
+        criteria.append(model.is_adoptable == is_adoptable)
+
+    created_after = parse_datetime(args, "created_after")
+    if created_after is not None:
+        criteria.append(model.created_at >= created_after)
+
+    created_before = parse_datetime(args, "created_before")
+    if created_before is not None:
+        criteria.append(model.created_at < created_before)
+
+    return criteria
+
+# Helper function to fetch a single keyset page of rows ordered by a unique key column.
+# NOTE: `statement` is a `select()` over the columns to return, so rows come back
+#       as plain tuples rather than ORM objects.
+# NOTE: One extra row is fetched to decide whether another page exists,
+#       so no `COUNT(*)` over the whole table is ever needed.
+def fetch_keyset_page(session, statement, key_column, after_id, limit):
+    rows = session.execute(statement.where(key_column > after_id).order_by(key_column).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    return rows[:limit], has_more
+
+# Helper function to build pagination response headers pointing at the next page.
+def next_page_headers(base_url, args, last_id, limit):
+    next_args = args.to_dict()
+    next_args.update({"after_id": last_id, "limit": limit})
+    return {
+        "X-Next-After-Id": str(last_id),
+        "Link": f'<{base_url}?{urlencode(next_args)}>; rel="next"',
+    }
+
+# Generator function to stream a JSON array in keyset batches without materializing the table.
+# NOTE: `serialize_rows` converts each fetched batch of row tuples into JSON-friendly objects.
+def stream_json_array(session, statement, key_column, serialize_rows, batch_size=EXPORT_BATCH_SIZE):
+    yield "["
+    after_id = 0
+    is_first_batch = True
+    while True:
+        rows = session.execute(statement.where(key_column > after_id).order_by(key_column).limit(batch_size)).all()
+        if rows:
+            batch = ",".join(json.dumps(item) for item in serialize_rows(rows))
+            yield batch if is_first_batch else "," + batch
+            is_first_batch = False
+        if len(rows) < batch_size:
+            break
+        after_id = getattr(rows[-1], key_column.key)
+    yield "]"
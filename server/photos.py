@@ -0,0 +1,295 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Flask file response tools.
+from flask import send_file
+# Configured application/server instance.
+from config import app
+
+# Deferred imports of optional dependencies (imported on first use, `None` when not installed).
+from lazy import lazy_import
+
+# OPTIONAL: Image validation and thumbnail generation. (Photo uploads are disabled when not installed.)
+Image = lazy_import("PIL.Image")
+ImageOps = lazy_import("PIL.ImageOps")
+
+# Content hashing, file, and background thread pool tools.
+from concurrent.futures import Future, ThreadPoolExecutor
+from hashlib import sha256
+from io import BytesIO
+from pathlib import Path
+import os
+import re
+import threading
+
+
+#######################################################
+######## CONTENT-ADDRESSED PHOTO STORAGE OVERVIEW #####
+#######################################################
+
+
+"""
+Dog photos are kept on disk, never in the database, and are named by the
+SHA-256 hash of their bytes:
+
+    PHOTO_STORAGE_PATH/
+        originals/3f/3fa4...9c.jpg      uploaded bytes, unchanged
+        thumbnails/3f/3fa4...9c.jpg     `PHOTO_THUMBNAIL_SIZE` square JPEG
+
+`Dog.photo` stores only the key (`3fa4...9c.jpg`). Serialized dogs carry
+`photo_url` and `thumbnail_url` instead, so list responses stay small:
+
+1.  Uploads (`POST /api/dogs` as `multipart/form-data`, `PUT /api/dogs/<id>/photo`)
+    are validated by reading the image header, hashed, and written with an
+    atomic rename. An identical photo is stored once, however often it is uploaded.
+2.  Its thumbnail is generated once, by a background thread pool
+    (`PHOTO_THUMBNAIL_WORKERS`), as soon as the original is stored. A request for
+    a thumbnail that is not ready yet waits for that same job, or starts it.
+3.  `GET /api/photos/<key>` and `GET /api/photos/thumbnails/<key>` serve the files
+    without re-encoding: `send_file()` uses `sendfile()` under WSGI servers with
+    `wsgi.file_wrapper` (e.g. gunicorn), or hands off to the front proxy with
+    `USE_X_SENDFILE`. ASGI mode uses the server's `http.response.pathsend` when
+    offered, and otherwise streams a memory-mapped file (see `asgi.py`).
+
+A URL's content can never change (a new photo gets a new key), so responses are
+cached for a year as `immutable`, with the hash as their `ETag`.
+
+NOTE: Files are written before the dog row commits. A failed write leaves an
+      unreferenced file behind, which is harmless (it is reused if uploaded again).
+"""
+
+
+#######################################################
+######## PHOTO STORAGE CONFIGURATION VALUES ###########
+#######################################################
+
+
+# File extension stored for each accepted image format.
+FORMAT_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp"}
+# Media type served for each stored extension.
+EXTENSION_MIMETYPES = {"jpg": "image/jpeg", "png": "image/png", "webp": "image/webp"}
+
+# Photo keys: a SHA-256 hex digest and a stored extension.
+PHOTO_KEY_PATTERN = re.compile(r"^([0-9a-f]{64})\.(jpg|png|webp)$")
+
+# URL prefixes of original photos and thumbnails.
+PHOTO_URL_PREFIX = "/api/photos/"
+THUMBNAIL_URL_PREFIX = "/api/photos/thumbnails/"
+
+# Cache lifetime of photo responses (one year; keys change whenever content does).
+PHOTO_CACHE_MAX_AGE = 365 * 24 * 60 * 60
+PHOTO_CACHE_CONTROL = f"private, max-age={PHOTO_CACHE_MAX_AGE}, immutable"
+
+
+#######################################################
+######### EXPORTABLE PHOTO STORAGE ERROR CLASSES ######
+#######################################################
+
+
+# Error raised when an upload is not an accepted image (or is too large).
+# NOTE: Routes catch this and convert it into a `400 Bad Request` response.
+class PhotoUploadError(ValueError):
+    pass
+
+
+# Error raised when photo storage dependencies are missing.
+# NOTE: Routes catch this and convert it into a `503 Service Unavailable` response.
+class PhotoStorageUnavailable(RuntimeError):
+    pass
+
+
+# Error raised when a thumbnail could not be generated (or is still being generated after the timeout).
+# NOTE: Routes catch this and convert it into a `503 Service Unavailable` response.
+class ThumbnailUnavailable(RuntimeError):
+    pass
+
+
+#######################################################
+######### EXPORTABLE PHOTO STORAGE CLASSES ############
+#######################################################
+
+
+# Content-addressed photo store with thumbnails generated once in a background pool.
+class PhotoStore:
+    def __init__(self, root, thumbnail_size=320, thumbnail_quality=85, workers=2, max_bytes=10 * 1024 * 1024,
+                 max_pixels=40_000_000, thumbnail_timeout=10.0):
+        self.root = Path(root)
+        self.thumbnail_size = thumbnail_size
+        self.thumbnail_quality = thumbnail_quality
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.max_pixels = max_pixels
+        self.thumbnail_timeout = thumbnail_timeout
+        self._executor = None
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    # Path of a stored original photo.
+    def original_path(self, key):
+        return self.root / "originals" / key[:2] / key
+
+    # Path of a stored thumbnail (always a JPEG, whatever the original's format).
+    def thumbnail_path(self, key):
+        return self.root / "thumbnails" / key[:2] / thumbnail_key(key)
+
+    # Validate and store uploaded bytes, returning their key and queueing the thumbnail.
+    # NOTE: Only the header is decoded here; images over `max_pixels` (e.g. small files that decompress
+    #       into huge images) are rejected before any thumbnail job could decode them.
+    def store(self, data):
+        if Image is None:
+            raise PhotoStorageUnavailable("Photo uploads require the `Pillow` package.")
+        if len(data) > self.max_bytes:
+            raise PhotoUploadError(f"Photos must be at most {self.max_bytes} bytes.")
+        try:
+            with Image.open(BytesIO(data)) as image:
+                extension = FORMAT_EXTENSIONS.get(image.format)
+                pixels = image.width * image.height
+                image.verify()
+        except Image.DecompressionBombError:
+            pixels, extension = self.max_pixels + 1, None
+        except (Image.UnidentifiedImageError, OSError, ValueError, SyntaxError):
+            pixels, extension = 0, None
+        if pixels > self.max_pixels:
+            raise PhotoUploadError(f"Photos must be at most {self.max_pixels} pixels.")
+        if extension is None:
+            raise PhotoUploadError("Expected a JPEG, PNG, or WebP image.")
+
+        key = f"{sha256(data).hexdigest()}.{extension}"
+        path = self.original_path(key)
+        if not path.exists():
+            write_atomically(path, data)
+        self.schedule_thumbnail(key)
+        return key
+
+    # Read a stored original photo's bytes (e.g. for breed classification).
+    def read(self, key):
+        return self.original_path(key).read_bytes()
+
+    # Queue a thumbnail job unless the thumbnail exists, returning a `Future` of its path.
+    # NOTE: Concurrent requests for the same key share one job.
+    def schedule_thumbnail(self, key):
+        path = self.thumbnail_path(key)
+        if path.exists():
+            future = Future()
+            future.set_result(path)
+            return future
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="photo-thumbnails")
+                future = self._pending[key] = self._executor.submit(self.generate_thumbnail, key)
+                future.add_done_callback(lambda _: self._pending.pop(key, None))
+        return future
+
+    # Find the key of the original photo a thumbnail key (`<hash>.jpg`) was generated from, or `None`.
+    def original_key(self, key):
+        digest = photo_digest(key)
+        for extension in EXTENSION_MIMETYPES:
+            if self.original_path(f"{digest}.{extension}").exists():
+                return f"{digest}.{extension}"
+        return None
+
+    # Return a `Future` of a thumbnail's path (generating it if needed), or `None` without an original.
+    def thumbnail_future(self, key):
+        original_key = key if self.thumbnail_path(key).exists() else self.original_key(key)
+        return self.schedule_thumbnail(original_key) if original_key else None
+
+    # Wait for a thumbnail (generating it if needed) and return its path, or `None` without an original.
+    def thumbnail(self, key):
+        future = self.thumbnail_future(key)
+        try:
+            return future.result(timeout=self.thumbnail_timeout) if future else None
+        except TimeoutError:
+            raise ThumbnailUnavailable("The thumbnail is still being generated. Please retry shortly.")
+
+    # Decode, orient, crop, and resize an original photo into its thumbnail.
+    # NOTE: `draft()` lets the JPEG decoder downscale while decoding, so large photos decode quickly.
+    # NOTE: A failed job is not remembered, so the next request for the thumbnail tries again.
+    def generate_thumbnail(self, key):
+        path = self.thumbnail_path(key)
+        if path.exists():
+            return path
+        if Image is None:
+            raise PhotoStorageUnavailable("Thumbnails require the `Pillow` package.")
+        size = (self.thumbnail_size, self.thumbnail_size)
+        try:
+            with Image.open(self.original_path(key)) as image:
+                if image.width * image.height > self.max_pixels:
+                    raise ThumbnailUnavailable(f"Photo `{key}` is larger than {self.max_pixels} pixels.")
+                image.draft("RGB", size)
+                thumbnail = ImageOps.fit(ImageOps.exif_transpose(image).convert("RGB"), size, Image.Resampling.LANCZOS)
+        except (Image.DecompressionBombError, OSError, ValueError, SyntaxError) as error:
+            raise ThumbnailUnavailable(f"A thumbnail of photo `{key}` could not be generated.") from error
+        buffer = BytesIO()
+        thumbnail.save(buffer, "JPEG", quality=self.thumbnail_quality, optimize=True, progressive=True)
+        write_atomically(path, buffer.getvalue())
+        return path
+
+
+#######################################################
+######## EXPORTABLE PHOTO STORAGE FUNCTIONS ###########
+#######################################################
+
+
+# Helper function to write bytes to `path` through a temporary file and an atomic rename.
+def write_atomically(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(temporary_path, "wb") as photo_file:
+        photo_file.write(data)
+    temporary_path.replace(path)
+
+# Helper function to check that a URL path segment is a well-formed photo key.
+def is_photo_key(key):
+    return PHOTO_KEY_PATTERN.match(key) is not None
+
+# Helper function to extract the content hash from a photo key.
+def photo_digest(key):
+    return key.rsplit(".", 1)[0]
+
+# Helper function to name a photo's thumbnail (same hash, JPEG extension).
+def thumbnail_key(key):
+    return photo_digest(key) + ".jpg"
+
+# Helper function to build the URL of a stored photo (`None` without a photo).
+def photo_url(key):
+    return PHOTO_URL_PREFIX + key if key else None
+
+# Helper function to build the URL of a stored photo's thumbnail (`None` without a photo).
+def thumbnail_url(key):
+    return THUMBNAIL_URL_PREFIX + thumbnail_key(key) if key else None
+
+# Helper function to look up the media type served for a photo key.
+def photo_mimetype(key):
+    return EXTENSION_MIMETYPES[key.rsplit(".", 1)[1]]
+
+# Helper function to build the caching headers of a photo response.
+def photo_cache_headers(key):
+    return {"ETag": f'"{photo_digest(key)}"', "Cache-Control": PHOTO_CACHE_CONTROL}
+
+# Serve a stored file as an immutable, conditionally cached Flask response.
+# NOTE: `send_file()` passes the open file to the WSGI server's `wsgi.file_wrapper` (`sendfile()` under
+#       gunicorn), or only sends an `X-Sendfile` header when `USE_X_SENDFILE` is enabled.
+def send_photo(path, key):
+    response = send_file(path, mimetype=photo_mimetype(key), conditional=True,
+                         etag=photo_digest(key), max_age=PHOTO_CACHE_MAX_AGE)
+    response.headers["Cache-Control"] = PHOTO_CACHE_CONTROL
+    return response
+
+# Helper function to build a photo store from application configuration.
+def photo_store_from_config(config):
+    return PhotoStore(
+        root=config["PHOTO_STORAGE_PATH"] or Path(app.instance_path) / "photos",
+        thumbnail_size=config["PHOTO_THUMBNAIL_SIZE"],
+        thumbnail_quality=config["PHOTO_THUMBNAIL_QUALITY"],
+        workers=config["PHOTO_THUMBNAIL_WORKERS"],
+        max_bytes=config["PHOTO_MAX_BYTES"],
+        max_pixels=config["PHOTO_MAX_PIXELS"],
+    )
+
+
+# Process-wide photo store shared by the upload, photo, and classification routes.
+photo_store = photo_store_from_config(app.config)
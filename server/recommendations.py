@@ -0,0 +1,363 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Configured application/server and database instances.
+from config import app, db
+# Relative access to dog and adoption models.
+from models import Dog, Adoption, live_criteria
+# Change log reads and the process-wide write notifier behind incremental refreshes.
+from changes import DOG as DOG_ENTITY, MAX_CHANGE_LIMIT, latest_sequence, read_changes
+# Table version counters that reveal dog writes, including those missing from the change log.
+from caching import current_table_versions
+# SQLAlchemy Core statement construction tools.
+from sqlalchemy import select, func
+
+# Deferred imports of optional dependencies (imported on first use, `None` when not installed).
+from lazy import lazy_import
+
+# OPTIONAL: Array math for the embedding matrix. (Recommendations are disabled when not installed.)
+np = lazy_import("numpy")
+
+# Index locking, background rebuild, and timing tools.
+import threading
+from time import monotonic
+
+
+#######################################################
+######### VECTORIZED RECOMMENDATIONS OVERVIEW #########
+#######################################################
+
+
+"""
+`GET /api/users/<id>/recommendations` ranks adoptable dogs for a user without
+scoring dogs one at a time in Python. Each process keeps a `RecommendationIndex`:
+
+1.  Breed embeddings. Breeds adopted by the same users are similar. The
+    co-adoption counts (users who adopted both breeds, from one `GROUP BY`) are
+    turned into a cosine similarity matrix, with every breed fully similar to
+    itself. That matrix is factored into `RECOMMENDATION_DIMENSIONS`-dimensional
+    vectors whose dot products approximate it.
+2.  Dog matrix. Every adoptable dog is one column of a `(features, dogs)` float32
+    matrix:
+
+        [ breed embedding + confidence * 0.5 * predicted breed embedding | popularity | removed ]
+
+    `popularity` is the breed's (log-scaled) adopter count. `removed` is `0`, or a
+    huge negative number once the dog is adopted, deleted, or made unavailable.
+    The matrix is feature-major, so a full scan reads memory sequentially.
+3.  Scoring. A user's vector is the mean embedding of the dogs they adopted,
+    plus weights for popularity and `removed`. (Users without adoptions are ranked
+    by popularity alone.) One matrix-vector product scores every dog. Removed dogs
+    sink to the bottom inside that same product, and `argpartition()` selects the
+    top `limit` dogs without sorting the rest.
+
+The index is built on first use and rebuilt in a background thread every
+`RECOMMENDATION_REBUILD_INTERVAL` seconds, so the breed embeddings follow adoption
+history. Between rebuilds it is refreshed incrementally from the change log
+(see `changes.py`). The refresh runs whenever the `dog_table` version counter
+(see `caching.py`) has moved, so it sees writes from every process. Only the
+dogs named by new `dog` changes are re-read. They are appended, updated in place,
+or marked removed, and removed columns are compacted away once they pile up.
+
+NOTE: Bulk changes made outside the API (e.g. `seed.py` or a manual `UPDATE`) are
+      not in the change log, but still bump the version (see the triggers in
+      `caching.py`). A moved version without new `dog` changes rebuilds the index.
+"""
+
+
+#######################################################
+######## RECOMMENDATION CONFIGURATION VALUES ##########
+#######################################################
+
+
+# Weight of a dog's predicted breed relative to its admin-entered breed (scaled by the prediction's confidence).
+PREDICTED_BREED_WEIGHT = 0.5
+# Weight of breed popularity in personalized scores (users without adoptions are ranked by popularity alone).
+POPULARITY_WEIGHT = 0.1
+# Value of the `removed` feature for dogs that are no longer adoptable (far below any real score).
+REMOVED_SCORE = -1e30
+
+# Default and maximum number of recommendations returned per request.
+DEFAULT_RECOMMENDATIONS = 10
+MAX_RECOMMENDATIONS = 100
+
+# Number of dogs re-read per statement while refreshing.
+REFRESH_BATCH_SIZE = 500
+# Fraction of removed columns at which the matrix is compacted.
+COMPACTION_THRESHOLD = 0.25
+
+
+#######################################################
+######## EXPORTABLE RECOMMENDATION ERROR CLASSES ######
+#######################################################
+
+
+# Error raised when recommendation dependencies are missing.
+# NOTE: Routes catch this and convert it into a `503 Service Unavailable` response.
+class RecommendationsUnavailable(RuntimeError):
+    pass
+
+
+#######################################################
+####### EXPORTABLE RECOMMENDATION INDEX CLASSES #######
+#######################################################
+
+
+# Breed vocabulary, embeddings, and popularity from one pass over the adoption history.
+class BreedEmbeddings:
+    def __init__(self, breeds, vectors, popularity):
+        self.index = {breed: position for position, breed in enumerate(breeds)}
+        self.vectors = vectors
+        self.popularity = popularity
+
+    @property
+    def dimensions(self):
+        return self.vectors.shape[1]
+
+    # Embed `(breed, predicted_breed, breed_confidence)` rows as `(features, rows)` columns (without `removed`).
+    # NOTE: Breeds first seen after the last rebuild get a zero embedding until the next rebuild.
+    def embed(self, rows):
+        dimensions = self.dimensions
+        columns = np.zeros((dimensions + 2, len(rows)), dtype=np.float32)
+        if not rows:
+            return columns
+        unknown = len(self.popularity)
+        vectors = np.vstack([self.vectors, np.zeros((1, dimensions), dtype=np.float32)])
+        popularity = np.append(self.popularity, np.float32(0))
+        breed_positions = np.array([self.index.get(row[0], unknown) for row in rows])
+        predicted_positions = np.array([self.index.get(row[1], unknown) if row[1] != row[0] else unknown for row in rows])
+        confidences = np.array([row[2] or 0.0 for row in rows], dtype=np.float32)
+        columns[:dimensions] = (vectors[breed_positions] +
+                                (PREDICTED_BREED_WEIGHT * confidences)[:, None] * vectors[predicted_positions]).T
+        columns[dimensions] = popularity[breed_positions]
+        return columns
+
+
+# Per-process matrix of adoptable dog embeddings, scored with one vectorized product per request.
+class RecommendationIndex:
+    def __init__(self, dimensions=16, rebuild_interval=3600.0):
+        self.dimensions = dimensions
+        self.rebuild_interval = rebuild_interval
+        self.embeddings = None
+        self.sequence = 0
+        self.version = None
+        self.built_at = None
+        # NOTE: `(matrix, ids, size)` is replaced as a whole, so readers never see a mismatched pair.
+        self._snapshot = None
+        self._removed = 0
+        self._lock = threading.Lock()
+        self._rebuilding = False
+
+    # Build the embeddings and matrix from scratch, replacing the current index.
+    def rebuild(self, session):
+        if np is None:
+            raise RecommendationsUnavailable("Recommendations require the `numpy` package.")
+        # STEP 1: Note the table version and change log position first, so writes committed during the build are replayed afterwards.
+        version, = current_table_versions(session, Dog)
+        sequence = latest_sequence(session)
+        breeds = session.scalars(select(Dog.breed).where(*live_criteria(Dog)).distinct().order_by(Dog.breed)).all()
+        embeddings = build_breed_embeddings(session, breeds, self.dimensions)
+
+        # STEP 2: Embed every adoptable dog, in ID order.
+        rows = session.execute(select(Dog.id, Dog.breed, Dog.predicted_breed, Dog.breed_confidence)
+                               .where(Dog.is_adoptable.is_(True), *live_criteria(Dog))
+                               .order_by(Dog.id)).all()
+        session.rollback()
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        matrix = embeddings.embed([row[1:] for row in rows])
+
+        # STEP 3: Swap the new index in.
+        with self._lock:
+            self.embeddings = embeddings
+            self.sequence = sequence
+            self.version = version
+            self._snapshot = (matrix, ids, len(ids))
+            self._removed = 0
+            self.built_at = monotonic()
+        return self
+
+    # Apply dog changes committed since the last refresh (called on every read, one version lookup when nothing changed).
+    # NOTE: Returns `False` when the version moved without any new `dog` changes, so the caller rebuilds instead.
+    # NOTE: The version is re-read after the changes until it holds still, so writes committed mid-refresh
+    #       are read now rather than mistaken for unlogged writes later. Unlogged writes landing in the same
+    #       refresh as logged ones are picked up by the next periodic rebuild.
+    def refresh(self, session):
+        if current_table_versions(session, Dog) == (self.version,):
+            return True
+        with self._lock:
+            version, = current_table_versions(session, Dog)
+            dog_ids = set()
+            while version != self.version:
+                changes = read_changes(session, self.sequence, MAX_CHANGE_LIMIT, [DOG_ENTITY])
+                dog_ids.update(change["id"] for change in changes)
+                if changes:
+                    self.sequence = changes[-1]["seq"]
+                if len(changes) == MAX_CHANGE_LIMIT:
+                    continue
+                latest_version, = current_table_versions(session, Dog)
+                if latest_version == version:
+                    break
+                version = latest_version
+            else:
+                return True
+            if not dog_ids:
+                return False
+            self._apply(session, sorted(dog_ids))
+            self.version = version
+            return True
+
+    # Helper function to re-read changed dogs and append, update, or remove their columns.
+    # NOTE: Runs under the index lock; new columns are written past `size` before the snapshot grows to include them.
+    def _apply(self, session, dog_ids):
+        adoptable = {}
+        for start in range(0, len(dog_ids), REFRESH_BATCH_SIZE):
+            adoptable.update((row[0], row[1:]) for row in session.execute(
+                select(Dog.id, Dog.breed, Dog.predicted_breed, Dog.breed_confidence)
+                .where(Dog.id.in_(dog_ids[start:start + REFRESH_BATCH_SIZE]), Dog.is_adoptable.is_(True), *live_criteria(Dog))))
+        session.rollback()
+
+        matrix, ids, size = self._snapshot
+        requested = np.array(dog_ids, dtype=np.int64)
+        positions = np.searchsorted(ids[:size], requested)
+        found = (positions < size) & (ids[np.minimum(positions, max(size - 1, 0))] == requested) if size else np.zeros(len(requested), dtype=bool)
+
+        # Update (or revive) dogs already in the matrix, and remove those no longer adoptable.
+        removed = self._removed
+        for dog_id, position in zip(requested[found].tolist(), positions[found].tolist()):
+            was_removed = bool(matrix[-1, position] != 0)
+            if dog_id in adoptable:
+                matrix[:, position] = self.embeddings.embed([adoptable[dog_id]])[:, 0]
+                removed -= was_removed
+            elif not was_removed:
+                matrix[-1, position] = REMOVED_SCORE
+                removed += 1
+
+        # Append (or, rarely, insert) adoptable dogs not yet in the matrix.
+        new_ids = [dog_id for dog_id in requested[~found].tolist() if dog_id in adoptable]
+        if new_ids:
+            new_columns = self.embeddings.embed([adoptable[dog_id] for dog_id in new_ids])
+            if size and new_ids[0] < ids[size - 1]:
+                order = np.argsort(np.concatenate([ids[:size], new_ids]), kind="stable")
+                matrix = np.concatenate([matrix[:, :size], new_columns], axis=1)[:, order]
+                ids = np.concatenate([ids[:size], new_ids])[order]
+                size = len(ids)
+            else:
+                if size + len(new_ids) > len(ids):
+                    capacity = max(2 * len(ids), size + len(new_ids), 1024)
+                    matrix = np.concatenate([matrix[:, :size], np.zeros((matrix.shape[0], capacity - size), dtype=np.float32)], axis=1)
+                    ids = np.concatenate([ids[:size], np.zeros(capacity - size, dtype=np.int64)])
+                matrix[:, size:size + len(new_ids)] = new_columns
+                ids[size:size + len(new_ids)] = new_ids
+                size += len(new_ids)
+
+        # Drop removed columns once they make up a large share of the matrix.
+        if size and removed > COMPACTION_THRESHOLD * size:
+            keep = matrix[-1, :size] == 0
+            matrix, ids, size, removed = matrix[:, :size][:, keep], ids[:size][keep], int(keep.sum()), 0
+        self._snapshot = (matrix, ids, size)
+        self._removed = removed
+
+    # Helper function to make sure the index is built and current, scheduling a background rebuild when it is old.
+    # NOTE: Writes missing from the change log are rebuilt in the foreground, since cached responses are keyed by the new version.
+    def ensure_current(self, session):
+        if self._snapshot is None:
+            self.rebuild(session)
+        elif monotonic() - self.built_at > self.rebuild_interval and not self._rebuilding:
+            self._rebuilding = True
+            threading.Thread(target=self._rebuild_in_background, name="recommendation-rebuild", daemon=True).start()
+        if not self.refresh(session):
+            self.rebuild(session)
+
+    def _rebuild_in_background(self):
+        try:
+            with app.app_context():
+                self.rebuild(db.session)
+        finally:
+            self._rebuilding = False
+
+    # Return up to `limit` `(dog_id, score)` pairs for a user, best first.
+    def recommend(self, session, user_id, limit=DEFAULT_RECOMMENDATIONS):
+        if np is None:
+            raise RecommendationsUnavailable("Recommendations require the `numpy` package.")
+        self.ensure_current(session)
+        embeddings = self.embeddings
+        matrix, ids, size = self._snapshot
+        if size == 0:
+            return []
+
+        # Build the user's vector from the dogs they adopted (their most recent adoptions are not special-cased).
+        adopted = session.execute(select(Dog.breed, Dog.predicted_breed, Dog.breed_confidence)
+                                  .join(Adoption, Adoption.dog_id == Dog.id)
+                                  .where(Adoption.user_id == user_id)).all()
+        user_vector = np.zeros(matrix.shape[0], dtype=np.float32)
+        if adopted:
+            user_vector[:embeddings.dimensions] = embeddings.embed(adopted)[:embeddings.dimensions].mean(axis=1)
+            user_vector[embeddings.dimensions] = POPULARITY_WEIGHT
+        else:
+            user_vector[embeddings.dimensions] = 1.0
+        user_vector[-1] = 1.0
+
+        # Score every dog with one product, then pick the top `limit` without sorting the rest.
+        # NOTE: Dogs tied with the lowest selected score are taken in ID order (columns are sorted by ID),
+        #       so equal scores always give the same recommendations.
+        scores = user_vector @ matrix[:, :size]
+        limit = min(limit, size)
+        top = np.argpartition(scores, size - limit)[size - limit:]
+        threshold = scores[top].min()
+        above = top[scores[top] > threshold]
+        top = np.concatenate([above, np.flatnonzero(scores == threshold)[:limit - len(above)]])
+        top = top[np.lexsort((ids[top], -scores[top]))]
+        return [(int(ids[position]), round(float(scores[position]), 4)) for position in top
+                if scores[position] > REMOVED_SCORE / 2]
+
+
+#######################################################
+####### EXPORTABLE RECOMMENDATION UTILITY FUNCTIONS ###
+#######################################################
+
+
+# Build breed embeddings whose dot products approximate co-adoption similarity.
+def build_breed_embeddings(session, breeds, dimensions):
+    positions = {breed: position for position, breed in enumerate(breeds)}
+
+    # STEP 1: Count the users who adopted each pair of breeds (the diagonal counts each breed's adopters).
+    user_breeds = select(Adoption.user_id, Dog.breed).join(Dog, Dog.id == Adoption.dog_id).distinct().subquery()
+    first, second = user_breeds.alias(), user_breeds.alias()
+    co_adoptions = np.zeros((len(breeds), len(breeds)))
+    for first_breed, second_breed, count in session.execute(
+        select(first.c.breed, second.c.breed, func.count())
+        .join(second, first.c.user_id == second.c.user_id)
+        .group_by(first.c.breed, second.c.breed)
+    ):
+        if first_breed in positions and second_breed in positions:
+            co_adoptions[positions[first_breed], positions[second_breed]] = count
+
+    # STEP 2: Normalize counts into cosine similarity, with every breed fully similar to itself.
+    adopters = np.diag(co_adoptions).copy()
+    norms = np.sqrt(np.outer(adopters, adopters))
+    similarity = np.divide(co_adoptions, norms, out=np.zeros_like(co_adoptions), where=norms > 0)
+    np.fill_diagonal(similarity, 1.0)
+
+    # STEP 3: Keep the strongest `dimensions` eigenvectors, scaled so that dot products approximate similarity.
+    vectors = np.zeros((len(breeds), dimensions), dtype=np.float32)
+    if len(breeds):
+        eigenvalues, eigenvectors = np.linalg.eigh(similarity)
+        strongest = np.argsort(eigenvalues)[::-1][:dimensions]
+        strongest = strongest[eigenvalues[strongest] > 0]
+        vectors[:, :len(strongest)] = eigenvectors[:, strongest] * np.sqrt(eigenvalues[strongest])
+    popularity = np.log1p(adopters)
+    popularity = (popularity / popularity.max() if len(breeds) and popularity.max() > 0 else popularity).astype(np.float32)
+    return BreedEmbeddings(breeds, vectors, popularity)
+
+# Helper function to build a recommendation index from application configuration.
+def recommendation_index_from_config(config):
+    return RecommendationIndex(
+        dimensions=config["RECOMMENDATION_DIMENSIONS"],
+        rebuild_interval=config["RECOMMENDATION_REBUILD_INTERVAL"],
+    )
+
+
+# Process-wide recommendation index shared by every recommendations request.
+recommendation_index = recommendation_index_from_config(app.config)
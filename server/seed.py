@@ -6,13 +6,68 @@
 # Configured application/server and database instances.
 from config import db, app
 # Relative access to user, dog, and adoption models.
-from models import User, Dog, Adoption
+from models import User, Dog, Adoption, DogArchive, AdoptionArchive, ChangeLog, normalize_username
+# Bounded password hashing service for user authentication.
+from hashing import password_hasher
+# Breed and adopter summary rebuild after bulk loads.
+from stats import rebuild_stats
+# Table version counters behind cached catalog responses.
+from caching import bump_table_versions
+# Dataset breed catalog shared with the research manifest.
+from breeds import load_breed_catalog
 
-# Cryptographic hashing tools for user authentication.
-import bcrypt
+# SQLAlchemy Core bulk statement construction tools.
+from sqlalchemy import delete, insert, text
 
-# Random selection tools.
-from random import choice
+# Command-line argument parsing tools.
+from argparse import ArgumentParser
+# Batching tools for streaming generated rows.
+from itertools import islice
+# Seeded random generation tools.
+from random import Random
+# Load timing tools.
+from time import perf_counter
+
+
+#######################################################
+############ SAMPLE AND SYNTHETIC DATA SETS ###########
+#######################################################
+
+
+# Hand-written sample users (with known passwords) that are always seeded first.
+SAMPLE_USERS = [
+    {"username": "friendly_neighborhood_user", "password": "hunter2", "is_admin": False},
+    {"username": "into_the_userverse", "password": "drowssap", "is_admin": False},
+    {"username": "amazing_administrator", "password": "abcde12345", "is_admin": True},
+]
+
+# Hand-written sample dogs that are always seeded first.
+SAMPLE_DOGS = [
+    {"name": "Odie", "breed": "Beagle", "is_adoptable": True},
+    {"name": "Benji", "breed": "Basenji", "is_adoptable": True},
+    {"name": "Fido", "breed": "Irish Wolfhound", "is_adoptable": True},
+    {"name": "Rex", "breed": "Rottweiler", "is_adoptable": True},
+    {"name": "Skipper", "breed": "Malamute", "is_adoptable": True},
+    {"name": "Zoomer", "breed": "Viszla", "is_adoptable": False},
+    {"name": "Borky", "breed": "Pomeranian", "is_adoptable": False},
+    {"name": "Ghost", "breed": "Siberian Husky", "is_adoptable": False},
+]
+
+# Name stems combined with a numeric suffix for synthetic dogs.
+SYNTHETIC_DOG_NAMES = ["Max", "Bella", "Charlie", "Luna", "Cooper", "Daisy", "Milo", "Sadie",
+                       "Buddy", "Lola", "Rocky", "Zoe", "Bear", "Nala", "Duke", "Rosie"]
+
+# Plaintext password shared by synthetic users (hashed once per run unless `--unique-passwords`).
+SYNTHETIC_PASSWORD = "synthetic-password"
+
+# SQLite pragmas applied on the loading connection with `--fast-pragmas`.
+# NOTE: These trade crash safety for speed and only last for the loading connection.
+FAST_LOAD_PRAGMAS = [
+    "PRAGMA journal_mode = MEMORY",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -200000",
+]
 
 
 #######################################################
@@ -20,76 +75,211 @@ from random import choice
 #######################################################
 
 
-# Helper function to generate sample users using relevant object model.
+# Helper function to parse seeding options from the command line.
+# NOTE: With no arguments, only the sample users, dogs, and adoptions are seeded.
+def parse_arguments(argv=None):
+    parser = ArgumentParser(description="Seed the Pup Emporium database with sample and synthetic data.")
+    parser.add_argument("--users", type=int, default=0, help="Number of synthetic users to generate.")
+    parser.add_argument("--dogs", type=int, default=0, help="Number of synthetic dogs to generate.")
+    parser.add_argument("--adoption-ratio", type=float, default=0.3,
+                        help="Fraction of synthetic dogs that are adopted by a synthetic or sample user.")
+    parser.add_argument("--breed-weights", type=parse_breed_weights, default=None,
+                        help="Comma-separated `Breed=weight` pairs (default: uniform over the sample breeds).")
+    parser.add_argument("--breed-catalog", default=None,
+                        help="Dataset `breeds.json` (or its directory) to draw synthetic breeds from, "
+                             "weighted by image count (see `breeds.py`).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for deterministic output.")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Rows per `INSERT` batch and transaction.")
+    parser.add_argument("--fast-pragmas", action="store_true", help="Apply unsafe-but-fast SQLite pragmas during load.")
+    parser.add_argument("--password-rounds", type=int, default=4,
+                        help="bcrypt cost factor for synthetic users (sample users use the configured cost).")
+    parser.add_argument("--unique-passwords", action="store_true",
+                        help="Hash a distinct password per synthetic user instead of sharing one hash.")
+    parser.add_argument("--prehashed-password", default=None,
+                        help="Existing password hash to assign to every synthetic user (skips hashing entirely).")
+    return parser.parse_args(argv)
+
+# Helper function to parse `Breed=weight` pairs into a breed weight table.
+def parse_breed_weights(raw_weights):
+    weights = {}
+    for pair in raw_weights.split(","):
+        breed, _, weight = pair.partition("=")
+        weights[breed.strip()] = float(weight or 1)
+    return weights
+
+# Helper function to split an iterator of rows into lists of at most `size` rows.
+def batched(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+# Generator function for sample user rows with real (configured-cost) password hashes.
 def create_users():
-    # Inner function to handle cryptographic hashing of passwords for safer database storage.
-    def encrypt_password(password):
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(password.encode("utf-8"), salt=salt)
-        return hashed_password.decode("utf-8")
-    
-    user_1 = User(username="friendly_neighborhood_user", password=encrypt_password("hunter2"))
-    user_2 = User(username="into_the_userverse", password=encrypt_password("drowssap"))
-    user_3 = User(username="amazing_administrator", password=encrypt_password("abcde12345"), is_admin=True)
-    
-    return [user_1, user_2, user_3]
-
-# Helper function to generate sample dogs using relevant object model.
+    hashed_passwords = password_hasher.hash_many([user["password"] for user in SAMPLE_USERS])
+    for user_id, (user, hashed_password) in enumerate(zip(SAMPLE_USERS, hashed_passwords), start=1):
+        yield {"id": user_id, "username": user["username"], "username_normalized": normalize_username(user["username"]),
+               "password": hashed_password, "is_admin": user["is_admin"]}
+
+# Generator function for sample dog rows.
 def create_dogs():
-    dog_1 = Dog(name="Odie", breed="Beagle")
-    dog_2 = Dog(name="Benji", breed="Basenji")
-    dog_3 = Dog(name="Fido", breed="Irish Wolfhound")
-    dog_4 = Dog(name="Rex", breed="Rottweiler")
-    dog_5 = Dog(name="Skipper", breed="Malamute")
-    dog_6 = Dog(name="Zoomer", breed="Viszla", is_adoptable=False)
-    dog_7 = Dog(name="Borky", breed="Pomeranian", is_adoptable=False)
-    dog_8 = Dog(name="Ghost", breed="Siberian Husky", is_adoptable=False)
-
-    return [dog_1, dog_2, dog_3, dog_4, dog_5, dog_6, dog_7, dog_8]
-
-# Helper function to curate several sample adoptions (dog-user associations).
-def create_adoptions(sample_users, sample_dogs):
-    general_users = [user for user in sample_users if user.is_admin is False]
-    adopted_dogs = [dog for dog in sample_dogs if dog.is_adoptable is False]
-    sample_adoptions = []
-    for adopted_dog in adopted_dogs:
-        sample_adoptions.append(Adoption(
-            dog_id=adopted_dog.id,
-            user_id=choice(general_users).id
+    for dog_id, dog in enumerate(SAMPLE_DOGS, start=1):
+        yield {"id": dog_id, **dog}
+
+# Generator function for sample adoption rows linking adopted sample dogs to general sample users.
+def create_adoptions(rng):
+    general_user_ids = [user_id for user_id, user in enumerate(SAMPLE_USERS, start=1) if not user["is_admin"]]
+    for dog_id, dog in enumerate(SAMPLE_DOGS, start=1):
+        if not dog["is_adoptable"]:
+            yield {"dog_id": dog_id, "user_id": rng.choice(general_user_ids)}
+
+# Helper function to produce password hashes for synthetic users.
+# NOTE: Returns a callable so unique hashes can be produced batch by batch.
+def synthetic_password_source(options):
+    if options.prehashed_password:
+        return lambda count: [options.prehashed_password] * count
+    if options.unique_passwords:
+        return lambda count: password_hasher.hash_many([SYNTHETIC_PASSWORD] * count, rounds=options.password_rounds)
+    shared_hash = password_hasher.hash_many([SYNTHETIC_PASSWORD], rounds=options.password_rounds)[0]
+    return lambda count: [shared_hash] * count
+
+# Generator function for batches of synthetic user rows.
+def generate_users(count, start_id, batch_size, password_source):
+    for batch_start in range(0, count, batch_size):
+        batch_ids = range(start_id + batch_start, start_id + min(batch_start + batch_size, count))
+        hashed_passwords = password_source(len(batch_ids))
+        yield [{"id": user_id, "username": f"synthetic_user_{user_id}",
+                "username_normalized": f"synthetic_user_{user_id}",
+                "password": hashed_password, "is_admin": False}
+               for user_id, hashed_password in zip(batch_ids, hashed_passwords)]
+
+# Generator function for synthetic dog rows paired with the adoption row (if any) for each dog.
+# NOTE: Adopters are drawn uniformly from every general (non-admin) user ID without materializing them.
+def generate_dogs(count, start_id, rng, breed_weights, adoption_ratio, general_user_id_at, general_user_count):
+    breeds, weights = list(breed_weights), list(breed_weights.values())
+    for dog_id in range(start_id, start_id + count):
+        is_adopted = general_user_count > 0 and rng.random() < adoption_ratio
+        dog = {"id": dog_id, "name": f"{rng.choice(SYNTHETIC_DOG_NAMES)} {dog_id}",
+               "breed": rng.choices(breeds, weights)[0], "is_adoptable": not is_adopted}
+        adoption = {"dog_id": dog_id, "user_id": general_user_id_at(rng.randrange(general_user_count))} if is_adopted else None
+        yield dog, adoption
+
+# Helper function to insert batches of rows with Core `executemany`, one transaction per batch.
+def bulk_insert(connection, model, batches):
+    inserted = 0
+    for batch in batches:
+        with connection.begin():
+            connection.execute(insert(model), batch)
+        inserted += len(batch)
+    return inserted
+
+# Helper function to insert synthetic dogs and their adoptions together, one transaction per batch.
+def bulk_insert_dogs_and_adoptions(connection, rows, batch_size):
+    dog_count = adoption_count = 0
+    for batch in batched(rows, batch_size):
+        dogs = [dog for dog, _ in batch]
+        adoptions = [adoption for _, adoption in batch if adoption is not None]
+        with connection.begin():
+            connection.execute(insert(Dog), dogs)
+            if adoptions:
+                connection.execute(insert(Adoption), adoptions)
+        dog_count += len(dogs)
+        adoption_count += len(adoptions)
+    return dog_count, adoption_count
+
+# Helper function to point PostgreSQL ID sequences past each table's largest ID (back to `1` for empty tables).
+# NOTE: Seeded rows carry explicit IDs, which do not advance the sequences, and sample rows assume IDs start at `1`.
+# NOTE: SQLite needs no reset, since its rowids already continue from the largest ID in the table.
+def reset_id_sequences(connection, *models):
+    if connection.dialect.name != "postgresql":
+        return
+    for model in models:
+        table_name = model.__tablename__
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {table_name}"
         ))
-    return sample_adoptions
 
-#######################################################
-#### DATABASE POPULATION WITHIN APPLIATION CONTEXT ####
-#######################################################
+# Seed the database with sample data plus the requested volume of synthetic data.
+# NOTE: The change log is cleared (its entries describe rows that no longer exist), and the table versions are bumped,
+#       so change feed followers and cached responses see the replaced data.
+def seed_database(options):
+    rng = Random(options.seed)
+    breed_weights = options.breed_weights or {breed: 1.0 for breed in sorted({dog["breed"] for dog in SAMPLE_DOGS})}
+    if options.breed_catalog and not options.breed_weights:
+        breed_weights = {entry["breed"]: float(entry["images"]) for entry in load_breed_catalog(options.breed_catalog)}
+
+    with db.engine.connect() as connection:
+        if options.fast_pragmas and connection.dialect.name == "sqlite":
+            print("\n\t>> Applying fast-load SQLite pragmas...")
+            for pragma in FAST_LOAD_PRAGMAS:
+                connection.exec_driver_sql(pragma)
+            connection.commit()
+
+        print("\n\t>> Deleting preexisting table data...")
+        with connection.begin():
+            connection.execute(delete(AdoptionArchive))
+            connection.execute(delete(DogArchive))
+            connection.execute(delete(Adoption))
+            connection.execute(delete(Dog))
+            connection.execute(delete(User))
+            connection.execute(delete(ChangeLog))
+            reset_id_sequences(connection, User, Dog, Adoption)
+        print("\t>> Data deletion successful.")
+
+        print("\n\t>> Generating sample users, dogs, and adoptions with cryptographic hashing...")
+        bulk_insert(connection, User, [list(create_users())])
+        bulk_insert(connection, Dog, [list(create_dogs())])
+        bulk_insert(connection, Adoption, [list(create_adoptions(rng))])
+        print("\t>> Sample data generation successful.")
 
+        sample_general_user_ids = [user_id for user_id, user in enumerate(SAMPLE_USERS, start=1) if not user["is_admin"]]
+        first_synthetic_user_id = len(SAMPLE_USERS) + 1
+        general_user_count = len(sample_general_user_ids) + options.users
 
-with app.app_context():
-    print(">> Seeding data...")
+        # Map an index in `[0, general_user_count)` onto a general user ID.
+        def general_user_id_at(index):
+            if index < len(sample_general_user_ids):
+                return sample_general_user_ids[index]
+            return first_synthetic_user_id + index - len(sample_general_user_ids)
 
-    print("\n\t>> Deleting preexisting table data...")
-    User.query.delete()
-    Dog.query.delete()
-    Adoption.query.delete()
-    db.session.commit()
-    print("\t>> Data deletion successful.")
+        if options.users:
+            print(f"\n\t>> Generating {options.users} synthetic users...")
+            start = perf_counter()
+            users = generate_users(options.users, first_synthetic_user_id, options.batch_size,
+                                   synthetic_password_source(options))
+            inserted = bulk_insert(connection, User, users)
+            print(f"\t>> Inserted {inserted} users in {perf_counter() - start:.1f}s.")
+
+        if options.dogs:
+            print(f"\n\t>> Generating {options.dogs} synthetic dogs (adoption ratio {options.adoption_ratio})...")
+            start = perf_counter()
+            rows = generate_dogs(options.dogs, len(SAMPLE_DOGS) + 1, rng, breed_weights, options.adoption_ratio,
+                                 general_user_id_at, general_user_count)
+            dog_count, adoption_count = bulk_insert_dogs_and_adoptions(connection, rows, options.batch_size)
+            print(f"\t>> Inserted {dog_count} dogs and {adoption_count} adoptions in {perf_counter() - start:.1f}s.")
+
+        print("\n\t>> Rebuilding breed and adopter summaries...")
+        with connection.begin():
+            rebuild_stats(connection)
+            bump_table_versions(connection, User, Dog, Adoption)
+            reset_id_sequences(connection, User, Dog, Adoption)
+        print("\t>> Summary rebuild successful.")
+
+    password_hasher.shutdown()
+
+
+#######################################################
+#### DATABASE POPULATION WITHIN APPLIATION CONTEXT ####
+#######################################################
 
-    print("\n\t>> Generating sample data for users with cryptographic hashing...")
-    sample_users = create_users()
-    db.session.add_all(sample_users)
-    db.session.commit()
-    print("\t>> User data generation successful.")
 
-    print("\n\t>> Generating sample data for dogs...")
-    sample_dogs = create_dogs()
-    db.session.add_all(sample_dogs)
-    db.session.commit()
-    print("\t>> Dog data generation successful.")
+# Seed the database from command-line arguments (`python seed.py ...` or `flask --app app seed ...`).
+def main(argv=None):
+    options = parse_arguments(argv)
+    with app.app_context():
+        print(">> Seeding data...")
+        seed_database(options)
+        print("\n>> Data seeding complete.")
 
-    print("\n\t>> Generating random associations (adoptions) between relevant users and dogs...")
-    sample_adoptions = create_adoptions(sample_users=sample_users, sample_dogs=sample_dogs)
-    db.session.add_all(sample_adoptions)
-    db.session.commit()
-    print("\t>> Adoption association generation successful.")
 
-    print("\n>> Data seeding complete.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
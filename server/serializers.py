@@ -0,0 +1,146 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# SQLAlchemy statement construction and mapper inspection tools.
+from sqlalchemy import select, inspect
+# SQLAlchemy object model serialization and rule-resolution tools.
+from sqlalchemy_serializer import SerializerMixin
+from sqlalchemy_serializer.lib.schema import Schema
+# Request phase timing for performance metrics.
+from metrics import timed_phase
+
+# Column value types that require string formatting during serialization.
+from datetime import date, datetime, time
+from decimal import Decimal
+# Result caching tools for compiled serializers.
+from functools import lru_cache
+
+
+#######################################################
+######## PRECOMPILED SERIALIZATION EXPLANATION ########
+#######################################################
+
+
+"""
+`SerializerMixin.to_dict()` re-resolves its `only`/`rules` schema on every call,
+inspects every mapped attribute of every instance, and dispatches on the runtime
+type of every value. For hot list routes, that work is identical for every row.
+
+A `CompiledSerializer` does that work exactly once per (model, only, rules) spec:
+
+1.  Resolve the spec with the same `Schema` rule engine that `to_dict()` uses,
+    including the model's own `serialize_only`/`serialize_rules`.
+2.  Reject specs that would include relationships, since those cannot be
+    flattened into a single row. (Use `to_dict()` for nested output.)
+3.  Precompute one converter per remaining column from the column's Python type,
+    using the model's own date/datetime/time/decimal formats.
+4.  Map computed fields the model declares in `serialize_computed` (e.g.
+    `Dog.photo_url`) to their source column and a function of its value.
+
+The result can be applied directly to row tuples returned by
+`db.session.execute(serializer.select())`, with no ORM objects being built,
+and produces output identical to `instance.to_dict(only=..., rules=...)`.
+"""
+
+
+#######################################################
+####### EXPORTABLE SERIALIZATION UTILITY CLASSES ######
+#######################################################
+
+
+# Flat, precompiled field extractor for a single model and serialization spec.
+class CompiledSerializer:
+    def __init__(self, model, only=(), rules=()):
+        self.model = model
+        self.fields = resolve_flat_fields(model, only=only, rules=rules)
+        computed = getattr(model, "serialize_computed", {})
+        self.columns = tuple(getattr(model, computed[field][0] if field in computed else field) for field in self.fields)
+        self.converters = tuple(computed[field][1] if field in computed else column_converter(model, column)
+                                for field, column in zip(self.fields, self.columns))
+
+    # Build a `SELECT` over exactly the columns this serializer emits.
+    def select(self):
+        return select(*self.columns)
+
+    # Serialize a single row tuple whose values are ordered like `self.fields`.
+    def serialize_row(self, row):
+        return {field: convert(value) for field, convert, value in zip(self.fields, self.converters, row)}
+
+    # Serialize many row tuples in one pass.
+    def serialize_rows(self, rows):
+        fields, converters = self.fields, self.converters
+        with timed_phase("serialize"):
+            return [{field: convert(value) for field, convert, value in zip(fields, converters, row)} for row in rows]
+
+    # Serialize an already-loaded ORM instance without walking its relationships.
+    def serialize_instance(self, instance):
+        with timed_phase("serialize"):
+            return self.serialize_row(tuple(getattr(instance, column.key) for column in self.columns))
+
+
+# `SerializerMixin` whose `to_dict()` time is attributed to the request's `serialize` phase.
+class TimedSerializerMixin(SerializerMixin):
+    def to_dict(self, *args, **kwargs):
+        with timed_phase("serialize"):
+            return super().to_dict(*args, **kwargs)
+
+
+#######################################################
+###### EXPORTABLE SERIALIZATION UTILITY FUNCTIONS #####
+#######################################################
+
+
+# Helper function to resolve an `only`/`rules` spec into a sorted tuple of column names.
+# NOTE: Mirrors `Serializer.serialize_model()`, which applies the call's spec first
+#       and the model's own `serialize_only`/`serialize_rules` second.
+def resolve_flat_fields(model, only=(), rules=()):
+    schema = Schema()
+    schema.update(only=only, extend=rules)
+    schema.update(only=model.serialize_only, extend=model.serialize_rules)
+
+    mapper = inspect(model)
+    keys = schema.keys
+    if schema.is_greedy:
+        keys.update(attribute.key for attribute in mapper.attrs)
+
+    fields = sorted(key for key in keys if schema.is_included(key=key))
+    column_keys = {attribute.key for attribute in mapper.column_attrs} | set(getattr(model, "serialize_computed", {}))
+    nested_fields = [field for field in fields if field not in column_keys]
+    if nested_fields:
+        raise ValueError(f"Serialization spec for `{model.__name__}` includes non-column fields {nested_fields}; "
+                         "use `to_dict()` for nested output.")
+    return tuple(fields)
+
+# Helper function to choose a value converter for a column based on its Python type.
+# NOTE: Formats are read from the model so output matches `SerializerMixin.to_dict()`.
+def column_converter(model, column):
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return passthrough
+
+    if issubclass(python_type, datetime):
+        return none_safe(lambda value: value.strftime(model.datetime_format))
+    if issubclass(python_type, date):
+        return none_safe(lambda value: value.strftime(model.date_format))
+    if issubclass(python_type, time):
+        return none_safe(lambda value: value.strftime(model.time_format))
+    if issubclass(python_type, Decimal):
+        return none_safe(lambda value: model.decimal_format.format(value))
+    return passthrough
+
+# Identity converter for JSON-native column values.
+def passthrough(value):
+    return value
+
+# Wrapper to leave `NULL` column values as `None`, as `to_dict()` does.
+def none_safe(convert):
+    return lambda value: None if value is None else convert(value)
+
+# Cached constructor for compiled serializers, keyed by model and serialization spec.
+# NOTE: `only` and `rules` must be tuples (hashable), as they are throughout `app.py`.
+@lru_cache(maxsize=None)
+def compiled_serializer(model, only=(), rules=()):
+    return CompiledSerializer(model, only=only, rules=rules)
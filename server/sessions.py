@@ -0,0 +1,427 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Flask session storage, session interface, and request context tools.
+from flask import session
+from flask.sessions import SessionInterface, SessionMixin
+# Configured application/server instance.
+from config import app
+# Relative access to user model.
+from models import User
+# SQLAlchemy ORM event hooks and session tools.
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+# Command line option parsing tools for the revocation command.
+import click
+# Signed cookie and observable dictionary tools.
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+# Session identifier, storage, and expiry bookkeeping tools.
+from collections import OrderedDict
+import json
+import os
+import secrets
+import sqlite3
+import threading
+from time import time
+
+
+#######################################################
+########## SERVER-SIDE SESSION STORE OVERVIEW #########
+#######################################################
+
+
+"""
+By default (`SESSION_BACKEND=sqlite`), the session cookie carries only a signed,
+random session ID; the session itself lives in a server-side store:
+
+    memory    Per-process LRU (`SESSION_STORE_SIZE` entries). Fastest, but only
+              valid when a single server process handles every request.
+    sqlite    A small SQLite file (`SESSION_STORE_PATH`, default `instance/sessions.db`)
+              shared by every worker on the host, so logins and revocations are
+              seen by all of them.
+    cookie    Flask's original signed-cookie sessions (no server-side state).
+
+Logging in stores the user's ID, username, and admin flag in the session, so
+`authorization_required` and `/check_session` resolve the principal without
+touching the application database. Server-side sessions stay correct because:
+
+    - Logging in issues a fresh session ID, and logging out deletes the session.
+    - Committed ORM changes to a user rewrite the cached username/admin flag in
+      all of that user's sessions, and deleting a user revokes them.
+    - `revoke_user_sessions()` / `revoke_all_sessions()` (or `flask --app app
+      revoke-sessions`) log users out everywhere at once.
+
+NOTE: With `SESSION_BACKEND=cookie`, the cached fields cannot be revoked, so the
+      principal is still loaded through `middleware.load_principal()`.
+"""
+
+
+#######################################################
+######### EXPORTABLE SESSION UTILITY CLASSES ##########
+#######################################################
+
+
+# Session dictionary backed by a server-side store and identified by `sid`.
+# NOTE: Tracks access and modification like Flask's `SecureCookieSession`, so `Vary: Cookie`
+#       and conditional saving behave the same.
+class ServerSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.modified = False
+        self.accessed = False
+        self.rotated = False
+
+    def __getitem__(self, key):
+        self.accessed = True
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.accessed = True
+        return super().get(key, default)
+
+    def setdefault(self, key, default=None):
+        self.accessed = True
+        return super().setdefault(key, default)
+
+    # Issue a new session ID on the next save (e.g. at login), discarding the old one.
+    def rotate(self):
+        self.rotated = True
+        self.modified = True
+
+
+# Thread-safe, size-bounded LRU session store for a single server process.
+class MemorySessionStore:
+    # Loads never wait on I/O, so the async server (see `asgi.py`) reads them on the event loop.
+    blocking = False
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._sids_by_user = {}
+        self._lock = threading.Lock()
+
+    def load(self, sid):
+        with self._lock:
+            entry = self._entries.get(sid)
+            if entry is None:
+                return None
+            user_id, data, expires_at = entry
+            if expires_at <= time():
+                self._discard(sid)
+                return None
+            self._entries.move_to_end(sid)
+            return dict(data)
+
+    def save(self, sid, user_id, data, ttl):
+        with self._lock:
+            self._discard(sid)
+            self._entries[sid] = (user_id, dict(data), time() + ttl)
+            self._sids_by_user.setdefault(user_id, set()).add(sid)
+            while len(self._entries) > self.max_size:
+                self._discard(next(iter(self._entries)))
+
+    def delete(self, sid):
+        with self._lock:
+            self._discard(sid)
+
+    def refresh_user(self, user_id, changes):
+        with self._lock:
+            for sid in self._sids_by_user.get(user_id, ()):
+                self._entries[sid][1].update(changes)
+
+    def revoke_users(self, user_ids):
+        with self._lock:
+            sids = [sid for user_id in user_ids for sid in self._sids_by_user.get(user_id, ())]
+            for sid in sids:
+                self._discard(sid)
+            return len(sids)
+
+    def revoke_all(self):
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._sids_by_user.clear()
+            return count
+
+    # Drop expired sessions from the least recently used end (eviction handles the rest).
+    def purge_expired(self):
+        with self._lock:
+            now = time()
+            while self._entries and next(iter(self._entries.values()))[2] <= now:
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, sid):
+        entry = self._entries.pop(sid, None)
+        if entry is not None:
+            sids = self._sids_by_user.get(entry[0])
+            sids.discard(sid)
+            if not sids:
+                del self._sids_by_user[entry[0]]
+
+
+# Session store kept in a SQLite file shared by every worker process on the host.
+# NOTE: Each thread keeps its own autocommit connection; WAL lets readers proceed during writes.
+class SQLiteSessionStore:
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS server_session ("
+        "sid TEXT PRIMARY KEY, user_id INTEGER, data TEXT NOT NULL, expires_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_server_session_user_id ON server_session (user_id)",
+        "CREATE INDEX IF NOT EXISTS ix_server_session_expires_at ON server_session (expires_at)",
+    ]
+    # Loads wait on file I/O (and on locks held by other workers), so the async server reads them on a worker thread.
+    blocking = True
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode = WAL")
+        for statement in self.SCHEMA:
+            connection.execute(statement)
+
+    # NOTE: Connections are reopened after a fork, since SQLite connections must not cross processes.
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA synchronous = NORMAL")
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    def load(self, sid):
+        row = self._connection().execute(
+            "SELECT data FROM server_session WHERE sid = ? AND expires_at > ?", (sid, time())
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def save(self, sid, user_id, data, ttl):
+        self._connection().execute(
+            "INSERT INTO server_session (sid, user_id, data, expires_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (sid) DO UPDATE SET user_id = excluded.user_id, data = excluded.data, "
+            "expires_at = excluded.expires_at",
+            (sid, user_id, json.dumps(data), time() + ttl)
+        )
+
+    def delete(self, sid):
+        self._connection().execute("DELETE FROM server_session WHERE sid = ?", (sid,))
+
+    def refresh_user(self, user_id, changes):
+        self._connection().execute(
+            "UPDATE server_session SET data = json_patch(data, ?) WHERE user_id = ?", (json.dumps(changes), user_id)
+        )
+
+    def revoke_users(self, user_ids):
+        user_ids = list(user_ids)
+        if not user_ids:
+            return 0
+        placeholders = ", ".join("?" for _ in user_ids)
+        return self._connection().execute(
+            f"DELETE FROM server_session WHERE user_id IN ({placeholders})", user_ids
+        ).rowcount
+
+    def revoke_all(self):
+        return self._connection().execute("DELETE FROM server_session").rowcount
+
+    def purge_expired(self):
+        self._connection().execute("DELETE FROM server_session WHERE expires_at <= ?", (time(),))
+
+
+# Flask session interface keeping session data in a server-side store, keyed by a signed cookie.
+class ServerSideSessionInterface(SessionInterface):
+    salt = "server-side-session"
+
+    def __init__(self, store):
+        self.store = store
+
+    def get_signer(self, app):
+        if not app.secret_key:
+            return None
+        return Signer(app.secret_key, salt=self.salt)
+
+    # Resolve a session cookie value into its session (an empty one if missing, forged, expired, or revoked).
+    def load(self, app, cookie):
+        signer = self.get_signer(app)
+        if signer is None:
+            return None
+        if cookie:
+            try:
+                sid = signer.unsign(cookie).decode("ascii")
+            except BadSignature:
+                return ServerSession()
+            data = self.store.load(sid)
+            if data is not None:
+                return ServerSession(data, sid=sid)
+        return ServerSession()
+
+    def open_session(self, app, request):
+        return self.load(app, request.cookies.get(self.get_cookie_name(app)))
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        # An emptied session (e.g. logout) is deleted from the store along with its cookie.
+        if not session:
+            if session.sid is not None:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path, secure=self.get_cookie_secure(app),
+                                       partitioned=self.get_cookie_partitioned(app),
+                                       httponly=self.get_cookie_httponly(app), samesite=self.get_cookie_samesite(app))
+                response.vary.add("Cookie")
+            return
+
+        if not self.should_set_cookie(app, session):
+            return
+
+        sid = session.sid
+        if sid is None or session.rotated:
+            if sid is not None:
+                self.store.delete(sid)
+            sid = secrets.token_urlsafe(32)
+            self.store.purge_expired()
+        self.store.save(sid, session.get("user_id"), dict(session), app.permanent_session_lifetime.total_seconds())
+
+        response.set_cookie(name, self.get_signer(app).sign(sid).decode("ascii"),
+                            expires=self.get_expiration_time(app, session), httponly=self.get_cookie_httponly(app),
+                            domain=domain, path=path, secure=self.get_cookie_secure(app),
+                            partitioned=self.get_cookie_partitioned(app), samesite=self.get_cookie_samesite(app))
+        response.vary.add("Cookie")
+
+
+#######################################################
+######## SESSION STORE SELECTION AND INSTALLATION #####
+#######################################################
+
+
+# Helper function to build the session store named by `SESSION_BACKEND`, or `None` for cookie sessions.
+def session_store_from_config():
+    backend = app.config["SESSION_BACKEND"]
+    if backend == "memory":
+        return MemorySessionStore(max_size=app.config["SESSION_STORE_SIZE"])
+    if backend == "sqlite":
+        return SQLiteSessionStore(app.config["SESSION_STORE_PATH"] or os.path.join(app.instance_path, "sessions.db"))
+    if backend == "cookie":
+        return None
+    raise ValueError(f"Unknown `SESSION_BACKEND`: `{backend}` (expected `memory`, `sqlite`, or `cookie`).")
+
+
+# Process-wide session store, installed as the application's session interface.
+session_store = session_store_from_config()
+if session_store is not None:
+    app.session_interface = ServerSideSessionInterface(session_store)
+
+
+#######################################################
+######### EXPORTABLE SESSION UTILITY FUNCTIONS ########
+#######################################################
+
+
+# Helper function to start an authenticated session for a user (at signup or login).
+# NOTE: Server-side sessions get a fresh ID, so an ID issued before login can never become authenticated.
+def sign_in(user):
+    session.clear()
+    if isinstance(session, ServerSession):
+        session.rotate()
+    session["user_id"] = user.id
+    session["username"] = user.username
+    session["is_admin"] = bool(user.is_admin)
+
+# Helper function to end the current session (deleting it from the server-side store).
+def sign_out():
+    session.clear()
+
+# Helper function to resolve a raw session cookie value into session data outside of a Flask request (e.g. ASGI).
+def load_session_cookie(cookie):
+    interface = app.session_interface
+    if isinstance(interface, ServerSideSessionInterface):
+        return interface.load(app, cookie) or {}
+    serializer = interface.get_signing_serializer(app)
+    if not cookie or serializer is None:
+        return {}
+    try:
+        return serializer.loads(cookie, max_age=int(app.permanent_session_lifetime.total_seconds()))
+    except BadSignature:
+        return {}
+
+# Log the given users out of every session, on every worker sharing the store.
+def revoke_user_sessions(user_ids):
+    return session_store.revoke_users(user_ids) if session_store is not None else 0
+
+# Log every user out of every session.
+def revoke_all_sessions():
+    return session_store.revoke_all() if session_store is not None else 0
+
+
+#######################################################
+####### SESSION PRINCIPAL SYNCHRONIZATION HOOKS #######
+#######################################################
+
+
+# Queue changed users' cached session fields (or revocation, on deletion) until the change commits.
+@event.listens_for(User, "after_update")
+def refresh_changed_user_sessions(mapper, connection, target):
+    queue_session_refresh(object_session(target), target.id, target.username, target.is_admin)
+
+@event.listens_for(User, "after_delete")
+def revoke_deleted_user_sessions(mapper, connection, target):
+    queue_session_revocation(object_session(target), target.id)
+
+# Helper function to rewrite a user's cached session fields once the database session commits.
+# NOTE: Also called by Core `UPDATE` paths (e.g. `updates.patch_users()`) that bypass the ORM events above.
+def queue_session_refresh(database_session, user_id, username, is_admin):
+    if session_store is not None and database_session is not None:
+        database_session.info.setdefault("refreshed_session_users", {})[user_id] = {
+            "username": username, "is_admin": bool(is_admin)
+        }
+
+# Helper function to revoke a user's sessions once the database session commits.
+def queue_session_revocation(database_session, user_id):
+    if session_store is not None and database_session is not None:
+        database_session.info.setdefault("revoked_session_users", set()).add(user_id)
+
+# Apply queued session changes once the database session commits, and drop them on rollback.
+@event.listens_for(Session, "after_commit")
+def apply_session_changes(database_session):
+    for user_id, changes in database_session.info.pop("refreshed_session_users", {}).items():
+        session_store.refresh_user(user_id, changes)
+    revoked_user_ids = database_session.info.pop("revoked_session_users", ())
+    if revoked_user_ids:
+        session_store.revoke_users(revoked_user_ids)
+
+@event.listens_for(Session, "after_rollback")
+def discard_session_changes(database_session):
+    database_session.info.pop("refreshed_session_users", None)
+    database_session.info.pop("revoked_session_users", None)
+
+
+#######################################################
+########### SESSION MAINTENANCE CLI COMMAND(S) ########
+#######################################################
+
+
+# CLI command to log users out everywhere: `flask --app app revoke-sessions --user-id 7 --user-id 9` (or `--all`).
+# NOTE: Has no effect on other processes' `memory` stores; use the `sqlite` backend for multi-worker revocation.
+@app.cli.command("revoke-sessions")
+@click.option("--user-id", "user_ids", type=int, multiple=True, help="User whose sessions to revoke (repeatable).")
+@click.option("--all", "revoke_all", is_flag=True, help="Revoke every session.")
+def revoke_sessions_command(user_ids, revoke_all):
+    if session_store is None:
+        raise click.UsageError("`SESSION_BACKEND=cookie` sessions cannot be revoked; rotate `SECRET_KEY` instead.")
+    if not revoke_all and not user_ids:
+        raise click.UsageError("Pass `--user-id` (repeatable) or `--all`.")
+    count = revoke_all_sessions() if revoke_all else revoke_user_sessions(user_ids)
+    print(f">> Revoked {count} sessions.")
@@ -0,0 +1,143 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Configured application/server and database instances.
+from config import app, db
+# Relative access to dog, adoption, archive, and summary models.
+from models import Dog, Adoption, AdoptionArchive, BreedStats, UserAdoptionStats, live_criteria, increment_counters
+# Table version counters behind the cached `/api/stats` route.
+from caching import bump_table_versions
+# SQLAlchemy Core statement construction tools.
+from sqlalchemy import select, insert, delete, func, case, union_all
+
+# Collection tools for accumulating count deltas.
+from collections import Counter
+
+
+#######################################################
+######### DENORMALIZED SUMMARY TABLES OVERVIEW ########
+#######################################################
+
+
+"""
+Dashboard figures ("adoptable dogs per breed", "adoptions per user") used to
+require aggregating every dog. They are now read from two summary tables:
+
+    breed_stats            breed -> (available_count, adopted_count)
+    user_adoption_stats    user_id -> adoption_count
+
+Every route that writes dogs or adoptions applies the matching *delta* to the
+summary rows inside its own transaction, so the summaries commit (or roll back)
+together with the write and reading them costs O(#breeds), not O(#dogs).
+
+`rebuild_stats()` (exposed as `flask --app app rebuild-stats`) recomputes both
+tables from scratch, for backfills and after bulk loads such as `seed.py`.
+"""
+
+
+#######################################################
+######## EXPORTABLE SUMMARY MAINTENANCE FUNCTIONS #####
+#######################################################
+
+
+# Helper function to express one dog's contribution to its breed's counts.
+# NOTE: Pass `sign=-1` to remove a contribution (e.g. before an update or on deletion).
+def dog_breed_delta(breed, is_adoptable, sign=1):
+    return {breed: (sign, 0) if is_adoptable is True else (0, sign)}
+
+# Helper function to merge several `{breed: (available, adopted)}` deltas into one.
+def merge_breed_deltas(*deltas):
+    merged = {}
+    for delta in deltas:
+        for breed, (available, adopted) in delta.items():
+            previous_available, previous_adopted = merged.get(breed, (0, 0))
+            merged[breed] = (previous_available + available, previous_adopted + adopted)
+    return merged
+
+# Apply `{breed: (available_delta, adopted_delta)}` to the per-breed summary inside the caller's transaction.
+# NOTE: Each row is upserted, so concurrent writes adding a breed's first dog cannot collide on its primary key.
+def adjust_breed_stats(session, deltas):
+    for breed, (available, adopted) in deltas.items():
+        if available == 0 and adopted == 0:
+            continue
+        increment_counters(session, BreedStats, {"breed": breed},
+                           {"available_count": available, "adopted_count": adopted})
+
+# Apply `{user_id: adoption_delta}` to the per-user summary inside the caller's transaction.
+def adjust_user_adoption_stats(session, deltas):
+    for user_id, adopted in deltas.items():
+        if adopted == 0:
+            continue
+        increment_counters(session, UserAdoptionStats, {"user_id": user_id}, {"adoption_count": adopted})
+
+# Record newly adopted dogs: each moves from available to adopted, and each adopter gains one adoption.
+# NOTE: `adoptions` is a list of `(user_id, breed)` pairs.
+def record_adoptions(session, adoptions):
+    breed_deltas = merge_breed_deltas(*(dog_breed_delta(breed, True, -1) for _, breed in adoptions),
+                                      *(dog_breed_delta(breed, False) for _, breed in adoptions))
+    adjust_breed_stats(session, breed_deltas)
+    adjust_user_adoption_stats(session, Counter(user_id for user_id, _ in adoptions))
+
+# Recompute both summary tables from the dog and adoption tables inside the caller's transaction.
+# NOTE: Soft-deleted dogs are not counted; archived adoptions still count towards their adopters.
+# NOTE: Bumps both tables' versions in the same transaction, so cached `/api/stats` responses are replaced.
+def rebuild_stats(session):
+    available = func.sum(case((Dog.is_adoptable.is_(True), 1), else_=0))
+    session.execute(delete(BreedStats))
+    session.execute(insert(BreedStats).from_select(
+        ["breed", "available_count", "adopted_count"],
+        select(Dog.breed, available, func.count() - available).where(*live_criteria(Dog)).group_by(Dog.breed)
+    ))
+    adopters = union_all(select(Adoption.user_id), select(AdoptionArchive.user_id)).subquery()
+    session.execute(delete(UserAdoptionStats))
+    session.execute(insert(UserAdoptionStats).from_select(
+        ["user_id", "adoption_count"],
+        select(adopters.c.user_id, func.count()).where(adopters.c.user_id.is_not(None)).group_by(adopters.c.user_id)
+    ))
+    bump_table_versions(session, BreedStats, UserAdoptionStats)
+
+
+#######################################################
+########## EXPORTABLE SUMMARY READ FUNCTIONS ##########
+#######################################################
+
+
+# Read the per-breed summary, totals, and the top adopters.
+# NOTE: One scan of `breed_stats` plus one index range scan of `user_adoption_stats`.
+def read_stats(session, top_adopters=10):
+    breeds = [{"breed": breed, "available": available_count, "adopted": adopted_count}
+              for breed, available_count, adopted_count in session.execute(
+                  select(BreedStats.breed, BreedStats.available_count, BreedStats.adopted_count)
+                  .where((BreedStats.available_count != 0) | (BreedStats.adopted_count != 0))
+                  .order_by(BreedStats.breed)
+              )]
+    adopters = [{"user_id": user_id, "adoptions": adoption_count}
+                for user_id, adoption_count in session.execute(
+                    select(UserAdoptionStats.user_id, UserAdoptionStats.adoption_count)
+                    .where(UserAdoptionStats.adoption_count > 0)
+                    .order_by(UserAdoptionStats.adoption_count.desc(), UserAdoptionStats.user_id.desc())
+                    .limit(top_adopters)
+                )]
+    return {
+        "totals": {"available": sum(breed["available"] for breed in breeds),
+                   "adopted": sum(breed["adopted"] for breed in breeds)},
+        "breeds": breeds,
+        "top_adopters": adopters,
+    }
+
+
+#######################################################
+########## SUMMARY MAINTENANCE CLI COMMAND(S) #########
+#######################################################
+
+
+# CLI command to backfill (or repair) the summary tables: `flask --app app rebuild-stats`.
+@app.cli.command("rebuild-stats")
+def rebuild_stats_command():
+    rebuild_stats(db.session)
+    db.session.commit()
+    breed_count = db.session.scalar(select(func.count()).select_from(BreedStats))
+    user_count = db.session.scalar(select(func.count()).select_from(UserAdoptionStats))
+    print(f">> Rebuilt stats for {breed_count} breeds and {user_count} adopters.")
@@ -0,0 +1,115 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Test environment, path, and scratch directory tools.
+import os
+import sys
+import tempfile
+
+# Test fixture tools.
+import pytest
+
+# NOTE: The application is configured from the environment when `config.py` is first imported,
+#       so the scratch database, in-memory sessions, and cheap password hashes are set up first.
+SCRATCH_DIRECTORY = tempfile.mkdtemp(prefix="pup-emporium-tests-")
+os.environ["SECRET_KEY"] = "test-secret-key"
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(SCRATCH_DIRECTORY, "test.db")
+os.environ["SESSION_BACKEND"] = "memory"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["PHOTO_STORAGE_PATH"] = os.path.join(SCRATCH_DIRECTORY, "photos")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+# Configured application/server (with every route registered) and database instances.
+from app import app
+from config import db
+# Relative access to user and dog models.
+from models import User, Dog
+# Process-wide caches that would otherwise outlive each test's database.
+from caching import response_cache
+from middleware import principal_cache
+from search import search_vocabulary
+from sessions import session_store
+# Summary tables kept in step with the fixture rows.
+from stats import rebuild_stats
+# Password hashing service for fixture users.
+from hashing import password_hasher
+
+
+#######################################################
+########## SAMPLE DATA FOR EVERY TEST DATABASE ########
+#######################################################
+
+
+# Fixture users: `(username, password, is_admin)`.
+TEST_USERS = [
+    ("admin", "admin-password", True),
+    ("adopter", "adopter-password", False),
+]
+
+# Fixture dogs: `(name, breed, is_adoptable)`.
+TEST_DOGS = [
+    ("Odie", "Beagle", True),
+    ("Benji", "Basenji", True),
+    ("Ghost", "Siberian Husky", True),
+    ("Rex", "Rottweiler", True),
+    ("Borky", "Pomeranian", False),
+]
+
+
+#######################################################
+############# SHARED PYTEST FIXTURE(S) ################
+#######################################################
+
+
+# Fresh schema, fixture rows, and empty process-wide caches for every test.
+# NOTE: Table version counters restart with each database, so cached responses must not survive it.
+@pytest.fixture
+def database():
+    app.testing = True
+    response_cache.clear()
+    principal_cache.clear()
+    search_vocabulary.clear()
+    session_store.revoke_all()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.add_all([User(username=username, password=password_hasher.hash_password(password), is_admin=is_admin)
+                            for username, password, is_admin in TEST_USERS])
+        db.session.add_all([Dog(name=name, breed=breed, is_adoptable=is_adoptable)
+                            for name, breed, is_adoptable in TEST_DOGS])
+        db.session.commit()
+        rebuild_stats(db.session)
+        db.session.commit()
+    yield db
+    with app.app_context():
+        db.session.remove()
+
+# Test client without a session.
+@pytest.fixture
+def client(database):
+    return app.test_client()
+
+# Helper function to build a test client signed in as one of the fixture users.
+def signed_in_client(username):
+    password = next(password for name, password, _ in TEST_USERS if name == username)
+    test_client = app.test_client()
+    response = test_client.post("/login", json={"username": username, "password": password})
+    assert response.status_code == 200, response.get_json()
+    return test_client
+
+# Test client signed in as the administrator.
+@pytest.fixture
+def admin_client(database):
+    return signed_in_client("admin")
+
+# A second, independent administrator session (e.g. for concurrent requests).
+@pytest.fixture
+def other_admin_client(database):
+    return signed_in_client("admin")
+
+# Test client signed in as the (non-administrator) adopter.
+@pytest.fixture
+def adopter_client(database):
+    return signed_in_client("adopter")
@@ -0,0 +1,70 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Test parametrization tools.
+import pytest
+
+# SQL statement counting for requests.
+from instrumentation import count_queries
+
+# Concurrent request tools.
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+
+#######################################################
+################# ADOPTION TEST CASES #################
+#######################################################
+
+
+# Two sessions adopting the same dog at once: exactly one wins, and the other gets a `409 Conflict`.
+@pytest.mark.parametrize("dog_id", [1, 2, 3, 4])
+def test_concurrent_adoptions_of_one_dog_conflict(admin_client, other_admin_client, dog_id):
+    barrier = threading.Barrier(2)
+
+    # Wait for the other session, then adopt the dog to user 2.
+    def adopt(test_client):
+        barrier.wait()
+        return test_client.post("/api/users/2/adoptions", json={"dog_id": dog_id})
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        responses = list(executor.map(adopt, [admin_client, other_admin_client]))
+
+    assert sorted(response.status_code for response in responses) == [201, 409]
+    adopted_dogs = admin_client.get("/api/users/2/dogs").get_json()
+    assert [dog["id"] for dog in adopted_dogs] == [dog_id]
+
+# Adopting a dog that was already adopted is a conflict, and leaves the first adoption alone.
+def test_adopting_an_adopted_dog_conflicts(admin_client):
+    assert admin_client.post("/api/users/2/adoptions", json={"dog_id": 1}).status_code == 201
+    response = admin_client.post("/api/users/1/adoptions", json={"dog_id": 1})
+    assert response.status_code == 409
+    assert admin_client.get("/api/users/1/dogs").get_json() == []
+
+# The single adoption route still accepts a numeric string `dog_id`, and rejects anything else.
+@pytest.mark.parametrize("dog_id, status_code", [("2", 201), (2, 201), ("two", 400), (None, 400)])
+def test_adoption_accepts_numeric_string_dog_ids(admin_client, dog_id, status_code):
+    assert admin_client.post("/api/users/2/adoptions", json={"dog_id": dog_id}).status_code == status_code
+
+# Bulk adoptions report each item, with the first request for a dog winning within the batch.
+def test_bulk_adoption_reports_each_item(admin_client):
+    response = admin_client.post("/api/adoptions/bulk", json={"adoptions": [
+        {"user_id": 2, "dog_id": 1}, {"user_id": 1, "dog_id": 1}, {"user_id": 2, "dog_id": 5},
+        {"user_id": 2, "dog_id": 99}, {"user_id": 99, "dog_id": 2}, {"user_id": 2, "dog_id": 3},
+        {"user_id": 2, "dog_id": "4"},
+    ]})
+    assert response.status_code == 200
+    statuses = [result["status"] for result in response.get_json()["results"]]
+    assert statuses == ["adopted", "duplicate", "not_adoptable", "dog_not_found", "user_not_found", "adopted", "invalid"]
+    assert sorted(dog["id"] for dog in admin_client.get("/api/users/2/dogs").get_json()) == [1, 3]
+
+# Bulk adoptions insert every adoption row in one statement, however many dogs they adopt.
+def test_bulk_adoption_inserts_in_one_statement(admin_client):
+    with count_queries() as counter:
+        response = admin_client.post("/api/adoptions/bulk", json={"adoptions": [{"user_id": 2, "dog_id": dog_id}
+                                                                                for dog_id in (1, 2, 3, 4)]})
+    assert response.status_code == 200
+    inserts = [statement for statement in counter.statements if statement.startswith("INSERT INTO adoption_table")]
+    assert len(inserts) == 1
@@ -0,0 +1,50 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Configured application/server and database instances.
+from app import app
+from config import db
+# Relative access to the dog model.
+from models import Dog
+# SQLAlchemy statement construction tools.
+from sqlalchemy import update
+
+
+#######################################################
+########### CONDITIONAL RESPONSE TEST CASES ###########
+#######################################################
+
+
+# Revalidating an unchanged catalog answers `304 Not Modified` with an empty body.
+def test_unchanged_catalog_revalidates_with_304(admin_client):
+    response = admin_client.get("/api/dogs")
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+
+    revalidated = admin_client.get("/api/dogs", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+    assert revalidated.headers["ETag"] == etag
+
+# A routed write moves the ETag, so the next revalidation gets the new body.
+def test_write_invalidates_cached_catalog(admin_client):
+    etag = admin_client.get("/api/dogs/1").headers["ETag"]
+    assert admin_client.patch("/api/dogs/1", json={"name": "Odie II"}).status_code == 200
+
+    response = admin_client.get("/api/dogs/1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.get_json()["name"] == "Odie II"
+
+# A write that bypasses the routes is caught by the version triggers.
+def test_unrouted_write_invalidates_cached_catalog(admin_client):
+    etag = admin_client.get("/api/dogs").headers["ETag"]
+    with app.app_context():
+        db.session.execute(update(Dog).where(Dog.id == 2).values(name="Benji II"))
+        db.session.commit()
+
+    response = admin_client.get("/api/dogs", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "Benji II" in [dog["name"] for dog in response.get_json()]
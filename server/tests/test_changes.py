@@ -0,0 +1,66 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Concurrent request tools.
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+
+#######################################################
+############### CHANGE FEED TEST CASES ################
+#######################################################
+
+
+# Helper function to read one page of the change feed, returning `(changes, next_since)`.
+def read_feed(test_client, query_string):
+    response = test_client.get(f"/api/changes?{query_string}")
+    assert response.status_code == 200, response.get_json()
+    body = response.get_json()
+    return body["changes"], body["next_since"]
+
+# A cursor taken before a write returns exactly that write's changes, and then nothing new.
+def test_cursor_follows_committed_changes(admin_client):
+    changes, cursor = read_feed(admin_client, "")
+    assert changes == []
+
+    assert admin_client.patch("/api/dogs/1", json={"name": "Odie II"}).status_code == 200
+    assert admin_client.post("/api/users/2/adoptions", json={"dog_id": 2}).status_code == 201
+
+    changes, next_cursor = read_feed(admin_client, f"since={cursor}")
+    assert [(change["entity"], change["id"], change["operation"]) for change in changes] == [
+        ("dog", 1, "update"), ("dog", 2, "update"), ("adoption", 1, "insert"),
+    ]
+    assert changes[0]["data"] == {"id": 1, "name": "Odie II"}
+    assert next_cursor == changes[-1]["seq"]
+    assert read_feed(admin_client, f"since={next_cursor}") == ([], next_cursor)
+
+# `limit` pages through the feed, and `entity` filters it.
+def test_cursor_pages_and_filters_by_entity(admin_client):
+    _, cursor = read_feed(admin_client, "")
+    assert admin_client.post("/api/adoptions/bulk", json={"adoptions": [{"user_id": 2, "dog_id": dog_id}
+                                                                        for dog_id in (1, 2)]}).status_code == 200
+
+    first_page, page_cursor = read_feed(admin_client, f"since={cursor}&limit=3")
+    second_page, _ = read_feed(admin_client, f"since={page_cursor}&limit=3")
+    assert len(first_page) == 3 and len(second_page) == 1
+    adoptions, _ = read_feed(admin_client, f"since={cursor}&entity=adoption")
+    assert [change["entity"] for change in adoptions] == ["adoption", "adoption"]
+
+# A long poll returns as soon as a write commits, instead of waiting out its timeout.
+def test_long_poll_wakes_on_commit(admin_client, other_admin_client):
+    _, cursor = read_feed(admin_client, "")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        started = time.monotonic()
+        poll = executor.submit(read_feed, admin_client, f"since={cursor}&wait=10")
+        time.sleep(0.2)
+        assert other_admin_client.delete("/api/dogs/3").status_code == 204
+        changes, _ = poll.result(timeout=10)
+    assert time.monotonic() - started < 5
+    assert [(change["id"], change["operation"]) for change in changes] == [(3, "delete")]
+
+# Invalid cursors and limits are rejected.
+def test_invalid_cursor_is_rejected(admin_client):
+    assert admin_client.get("/api/changes?since=abc").status_code == 400
+    assert admin_client.get("/api/changes?since=0&limit=0").status_code == 400
@@ -0,0 +1,31 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Loaded module registry (to check which optional components were imported).
+import sys
+
+
+#######################################################
+################## CORS TEST CASES ####################
+#######################################################
+
+
+# The default (`*`) origin policy is served without importing Flask-CORS.
+def test_wildcard_cors_does_not_import_flask_cors(admin_client):
+    response = admin_client.get("/api/dogs", headers={"Origin": "http://client.example"})
+    assert response.status_code == 200
+    assert response.headers["Access-Control-Allow-Origin"] == "*"
+    assert response.headers["Access-Control-Expose-Headers"] == "X-Next-After-Id, Link"
+    assert "flask_cors" not in sys.modules
+
+# Preflight requests are allowed the requested method and headers.
+def test_wildcard_cors_answers_preflight(client):
+    response = client.options("/api/dogs", headers={"Origin": "http://client.example",
+                                                    "Access-Control-Request-Method": "PATCH",
+                                                    "Access-Control-Request-Headers": "Content-Type"})
+    assert response.status_code == 200
+    assert response.headers["Access-Control-Allow-Origin"] == "*"
+    assert response.headers["Access-Control-Allow-Methods"] == "PATCH"
+    assert response.headers["Access-Control-Allow-Headers"] == "Content-Type"
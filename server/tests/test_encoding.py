@@ -0,0 +1,50 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Configured application/server instance.
+from app import app
+
+# MessagePack decoding and gzip decompression for response bodies.
+import msgpack
+import gzip
+import json
+
+
+#######################################################
+########### RESPONSE ENCODING TEST CASES ##############
+#######################################################
+
+
+# Clients preferring MessagePack get the same data, with a separate ETag from the JSON variant.
+def test_msgpack_is_negotiated_from_accept(admin_client):
+    as_json = admin_client.get("/api/dogs")
+    as_msgpack = admin_client.get("/api/dogs", headers={"Accept": "application/msgpack"})
+    assert as_msgpack.status_code == 200
+    assert as_msgpack.mimetype == "application/msgpack"
+    assert msgpack.unpackb(as_msgpack.data) == as_json.get_json()
+    assert as_msgpack.headers["ETag"] != as_json.headers["ETag"]
+
+# Browsers (and clients without a preference) get JSON.
+def test_json_is_the_default_media_type(admin_client):
+    response = admin_client.get("/api/dogs", headers={"Accept": "*/*"})
+    assert response.mimetype == "application/json"
+
+# Large enough responses are gzipped when accepted, with a weak ETag; others are left alone.
+def test_gzip_is_negotiated_from_accept_encoding(admin_client, monkeypatch):
+    monkeypatch.setitem(app.config, "COMPRESSION_MIN_SIZE", 0)
+    plain = admin_client.get("/api/dogs")
+    assert "Content-Encoding" not in plain.headers
+
+    compressed = admin_client.get("/api/dogs", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["ETag"].startswith("W/")
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert json.loads(gzip.decompress(compressed.data)) == plain.get_json()
+
+# Responses below `COMPRESSION_MIN_SIZE` are sent uncompressed.
+def test_small_responses_are_not_compressed(admin_client, monkeypatch):
+    monkeypatch.setitem(app.config, "COMPRESSION_MIN_SIZE", 1_000_000)
+    response = admin_client.get("/api/dogs", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
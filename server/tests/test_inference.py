@@ -0,0 +1,71 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Test parametrization tools.
+import pytest
+
+# Micro-batched breed classification service.
+from inference import BreedClassifier, InferenceUnavailable
+
+# Array math and image encoding for a tiny model and photo.
+import numpy as np
+from PIL import Image
+from io import BytesIO
+
+
+#######################################################
+######### TINY BREED MODEL HELPER FUNCTION(S) #########
+#######################################################
+
+
+# Helper function to save a 4x4-pixel linear model that always favours its second label.
+def save_linear_model(directory, labels, classes=2):
+    path = directory / "breeds.npz"
+    bias = np.zeros(classes, dtype=np.float32)
+    bias[1] = 5.0
+    np.savez(path, weights=np.zeros((3 * 4 * 4, classes), dtype=np.float32), bias=bias,
+             input_size=np.array([4, 4]), labels=np.array(labels))
+    return path
+
+# Helper function to encode a small solid-colour JPEG photo.
+def jpeg_photo():
+    buffer = BytesIO()
+    Image.new("RGB", (16, 16), (200, 120, 40)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+#######################################################
+########## BREED CLASSIFICATION TEST CASES ############
+#######################################################
+
+
+# Classifying a dog stores the model's prediction beside the admin-entered breed.
+def test_classify_stores_prediction(admin_client, monkeypatch, tmp_path):
+    classifier = BreedClassifier(model_path=save_linear_model(tmp_path, ["Beagle", "Basenji"]), workers=1)
+    monkeypatch.setattr("app.breed_classifier", classifier)
+
+    response = admin_client.post("/api/dogs/1/classify", data=jpeg_photo(), content_type="image/jpeg")
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()["predicted_breed"] == "Basenji"
+    dog = admin_client.get("/api/dogs/1").get_json()
+    assert (dog["breed"], dog["predicted_breed"]) == ("Beagle", "Basenji")
+
+# A label list that does not match the model's classes fails at startup.
+def test_label_count_mismatch_is_rejected(tmp_path):
+    classifier = BreedClassifier(model_path=save_linear_model(tmp_path, ["Beagle", "Basenji", "Poodle"]), workers=1)
+    with pytest.raises(InferenceUnavailable):
+        classifier.start()
+
+# Errors while describing predictions fail that batch's requests, and the worker keeps serving.
+def test_worker_survives_prediction_errors(monkeypatch, tmp_path):
+    classifier = BreedClassifier(model_path=save_linear_model(tmp_path, ["Beagle", "Basenji"]), workers=1,
+                                 result_timeout=5.0)
+    describe = classifier.describe
+    monkeypatch.setattr(classifier, "describe", lambda probabilities: [][0])
+    with pytest.raises(IndexError):
+        classifier.classify(jpeg_photo())
+
+    monkeypatch.setattr(classifier, "describe", describe)
+    assert classifier.classify(jpeg_photo())["breed"] == "Basenji"
@@ -0,0 +1,36 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Configured application/server instance.
+from app import app
+
+
+#######################################################
+################# METRICS TEST CASES ##################
+#######################################################
+
+
+# `/metrics` does not exist unless `METRICS_ENABLED=true`.
+def test_metrics_are_disabled_by_default(client):
+    assert app.config["METRICS_ENABLED"] is False
+    assert client.get("/metrics").status_code == 404
+
+# Enabled without `METRICS_TOKEN`, metrics are served to any scraper (the proxy restricts access).
+def test_metrics_without_token_are_served(client, monkeypatch):
+    monkeypatch.setitem(app.config, "METRICS_ENABLED", True)
+    monkeypatch.setitem(app.config, "METRICS_TOKEN", None)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert b"http_request_duration_seconds" in response.data
+
+# With `METRICS_TOKEN` set, scrapers must send it as a bearer token.
+def test_metrics_token_is_required(client, monkeypatch):
+    monkeypatch.setitem(app.config, "METRICS_ENABLED", True)
+    monkeypatch.setitem(app.config, "METRICS_TOKEN", "scrape-token")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong-token"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert response.status_code == 200
+    assert b"http_request_sql_queries" in response.data
@@ -0,0 +1,67 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Shared dog photo store.
+from photos import photo_store
+
+# Image encoding and decoding for uploaded photos and thumbnails.
+from PIL import Image
+from io import BytesIO
+
+
+#######################################################
+########### PHOTO STORAGE HELPER FUNCTION(S) ##########
+#######################################################
+
+
+# Helper function to encode a solid-colour photo in the given format.
+def encoded_photo(size=(800, 600), image_format="JPEG"):
+    buffer = BytesIO()
+    Image.new("RGB", size, (90, 160, 220)).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+#######################################################
+############# PHOTO STORAGE TEST CASES ################
+#######################################################
+
+
+# An uploaded photo is served unchanged, with an immutable ETag that revalidates with `304`.
+def test_uploaded_photo_is_served_and_revalidated(admin_client):
+    data = encoded_photo()
+    response = admin_client.put("/api/dogs/1/photo", data=data, content_type="image/jpeg")
+    assert response.status_code == 200, response.get_json()
+    photo_url = response.get_json()["photo_url"]
+    assert admin_client.get("/api/dogs/1").get_json()["photo_url"] == photo_url
+
+    photo = admin_client.get(photo_url)
+    assert photo.status_code == 200
+    assert photo.data == data
+    assert photo.mimetype == "image/jpeg"
+    assert "immutable" in photo.headers["Cache-Control"]
+
+    revalidated = admin_client.get(photo_url, headers={"If-None-Match": photo.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+# The thumbnail is a JPEG no larger than `PHOTO_THUMBNAIL_SIZE` on either side.
+def test_thumbnail_is_generated(admin_client):
+    response = admin_client.put("/api/dogs/1/photo", data=encoded_photo(image_format="PNG"), content_type="image/png")
+    thumbnail = admin_client.get(response.get_json()["thumbnail_url"])
+    assert thumbnail.status_code == 200
+    with Image.open(BytesIO(thumbnail.data)) as image:
+        assert image.format == "JPEG"
+        assert max(image.size) <= photo_store.thumbnail_size
+
+# Undecodable or oversized uploads are rejected before anything is stored.
+def test_invalid_photos_are_rejected(admin_client, monkeypatch):
+    assert admin_client.put("/api/dogs/1/photo", data=b"not an image", content_type="image/jpeg").status_code == 400
+    monkeypatch.setattr(photo_store, "max_pixels", 100)
+    assert admin_client.put("/api/dogs/1/photo", data=encoded_photo(), content_type="image/jpeg").status_code == 400
+    assert admin_client.get("/api/dogs/1").get_json()["photo_url"] is None
+
+# Unknown photo keys are not found.
+def test_unknown_photo_is_not_found(admin_client):
+    assert admin_client.get(f"/api/photos/{'0' * 64}.jpg").status_code == 404
+    assert admin_client.get(f"/api/photos/thumbnails/{'0' * 64}.jpg").status_code == 404
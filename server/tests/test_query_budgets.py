@@ -0,0 +1,66 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Test parametrization tools.
+import pytest
+
+# SQL statement counting for requests.
+from instrumentation import count_queries
+
+
+#######################################################
+########### ROUTE QUERY BUDGET DEFINITIONS ############
+#######################################################
+
+
+# Read routes and the most SQL statements each may issue (matching their `@query_budget`, where declared).
+READ_ROUTE_BUDGETS = [
+    ("/api/dogs", 3),
+    ("/api/dogs?breed=Beagle&is_adoptable=true", 3),
+    ("/api/adopt", 3),
+    ("/api/dogs/1", 4),
+    ("/api/dogs/search?q=odie", 4),
+    ("/api/users/2/dogs", 3),
+    ("/api/stats", 4),
+]
+
+# Most SQL statements one adoption may issue (claim, insert, summaries, change log, versions, response).
+ADOPTION_BUDGET = 10
+
+
+#######################################################
+############### QUERY BUDGET TEST CASES ###############
+#######################################################
+
+
+# Every list and detail route stays within its budget, cold and from the response cache.
+@pytest.mark.parametrize("url, budget", READ_ROUTE_BUDGETS)
+def test_read_route_within_budget(admin_client, url, budget):
+    for _ in range(2):
+        with count_queries() as counter:
+            response = admin_client.get(url)
+        assert response.status_code == 200
+        assert counter.count <= budget, "\n\n".join(counter.statements)
+
+# Adopting a dog stays within its budget.
+def test_adoption_within_budget(admin_client):
+    with count_queries() as counter:
+        response = admin_client.post("/api/users/2/adoptions", json={"dog_id": 1})
+    assert response.status_code == 201
+    assert counter.count <= ADOPTION_BUDGET, "\n\n".join(counter.statements)
+
+# A user's adopted dogs are read in a fixed number of statements, however many they adopted.
+def test_adopted_dogs_query_count_is_constant(admin_client):
+    with count_queries() as counter:
+        admin_client.get("/api/users/2/dogs")
+    without_adoptions = counter.count
+
+    response = admin_client.post("/api/adoptions/bulk", json={"adoptions": [{"user_id": 2, "dog_id": dog_id}
+                                                                            for dog_id in (1, 2, 3, 4)]})
+    assert response.status_code == 200
+    with count_queries() as counter:
+        response = admin_client.get("/api/users/2/dogs")
+    assert len(response.get_json()) == 4
+    assert counter.count == without_adoptions
@@ -0,0 +1,91 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Test fixture tools.
+import pytest
+
+# Configured application/server and database instances.
+from app import app
+from config import db
+# Relative access to the dog model.
+from models import Dog
+# Vectorized recommendation index.
+from recommendations import RecommendationIndex
+# SQLAlchemy statement construction tools.
+from sqlalchemy import update
+
+
+#######################################################
+######## RECOMMENDATION INDEX TEST FIXTURE(S) #########
+#######################################################
+
+
+# Fresh recommendation index for the route, counting its full rebuilds.
+# NOTE: The process-wide index would otherwise carry one test's dogs into the next test's database.
+@pytest.fixture
+def index(database, monkeypatch):
+    index = RecommendationIndex(dimensions=4)
+    index.rebuild_count = 0
+    rebuild = index.rebuild
+
+    def counted_rebuild(session):
+        index.rebuild_count += 1
+        return rebuild(session)
+
+    monkeypatch.setattr(index, "rebuild", counted_rebuild)
+    monkeypatch.setattr("app.recommendation_index", index)
+    return index
+
+# Helper function to list the IDs of the dogs recommended to a user.
+def recommended_ids(test_client, user_id=2):
+    response = test_client.get(f"/api/users/{user_id}/recommendations?limit=100")
+    assert response.status_code == 200, response.get_json()
+    return sorted(dog["id"] for dog in response.get_json())
+
+
+#######################################################
+########### RECOMMENDATION INDEX TEST CASES ###########
+#######################################################
+
+
+# Adopting, adding, and deleting dogs refresh the index incrementally, without rebuilding it.
+def test_index_refreshes_incrementally(admin_client, index):
+    assert recommended_ids(admin_client) == [1, 2, 3, 4]
+    assert index.rebuild_count == 1
+
+    assert admin_client.post("/api/users/2/adoptions", json={"dog_id": 1}).status_code == 201
+    assert recommended_ids(admin_client) == [2, 3, 4]
+
+    response = admin_client.post("/api/dogs", json={"name": "Fifi", "breed": "Beagle"})
+    assert response.status_code == 201
+    assert recommended_ids(admin_client) == [2, 3, 4, response.get_json()["id"]]
+
+    assert admin_client.delete("/api/dogs/3").status_code == 204
+    assert admin_client.patch("/api/dogs/5", json={"is_adoptable": True}).status_code == 200
+    assert recommended_ids(admin_client) == [2, 4, 5, response.get_json()["id"]]
+    assert index.rebuild_count == 1
+
+# Dogs adopted alongside a user's breeds rank above unrelated ones.
+def test_co_adopted_breeds_rank_first(admin_client, index):
+    assert admin_client.post("/api/adoptions/bulk", json={"adoptions": [
+        {"user_id": 1, "dog_id": 1}, {"user_id": 1, "dog_id": 2}, {"user_id": 2, "dog_id": 4},
+    ]}).status_code == 200
+    assert admin_client.post("/api/dogs", json={"name": "Bingo", "breed": "Basenji"}).status_code == 201
+    with app.app_context():
+        index.rebuild(db.session)
+
+    # User 1 adopted a Beagle and a Basenji, so the new Basenji outranks the (never adopted) Husky.
+    response = admin_client.get("/api/users/1/recommendations?limit=1")
+    assert [dog["name"] for dog in response.get_json()] == ["Bingo"]
+
+# A dog write missing from the change log still moves the table version, which rebuilds the index.
+def test_unlogged_write_rebuilds_index(admin_client, index):
+    assert recommended_ids(admin_client) == [1, 2, 3, 4]
+    with app.app_context():
+        db.session.execute(update(Dog).where(Dog.id == 2).values(is_adoptable=False))
+        db.session.commit()
+
+    assert recommended_ids(admin_client) == [1, 3, 4]
+    assert index.rebuild_count == 2
@@ -0,0 +1,55 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Test parametrization tools.
+import pytest
+
+# Search statement helpers (patched to use the fallback without FTS5).
+import search
+
+
+#######################################################
+################## SEARCH TEST CASES ##################
+#######################################################
+
+
+# Helper function to search and return the names of the matching dogs.
+def search_names(test_client, query_string):
+    response = test_client.get(f"/api/dogs/search?{query_string}")
+    assert response.status_code == 200, response.get_json()
+    return [dog["name"] for dog in response.get_json()["results"]]
+
+# `breed` matches breed words, not only the exact stored breed.
+@pytest.mark.parametrize("query_string, expected_names", [
+    ("breed=husky", ["Ghost"]),
+    ("breed=beagle", ["Odie"]),
+    ("breed=Siberian%20Husky", ["Ghost"]),
+    ("q=odie&breed=beagle", ["Odie"]),
+    ("q=odie&breed=husky", []),
+])
+def test_breed_filter_matches_partial_breeds(admin_client, query_string, expected_names):
+    assert search_names(admin_client, query_string) == expected_names
+
+# Prefix matching finds names and breeds from their first letters.
+def test_prefix_search_matches_names_and_breeds(admin_client):
+    assert search_names(admin_client, "q=ben") == ["Benji"]
+    assert search_names(admin_client, "q=rott") == ["Rex"]
+
+# Search still applies the other catalog filters.
+def test_search_applies_adoptability_filter(admin_client):
+    assert search_names(admin_client, "q=pomeranian") == ["Borky"]
+    assert search_names(admin_client, "q=pomeranian&is_adoptable=true") == []
+
+# Databases without FTS5 search with `LIKE`, still applying the breed filter.
+@pytest.mark.parametrize("query_string, expected_names", [
+    ("q=rex&breed=husky", []),
+    ("q=rex&breed=rottweiler", ["Rex"]),
+    ("breed=husky", ["Ghost"]),
+    ("breed=Siberian%20Husky", ["Ghost"]),
+    ("q=ben", ["Benji"]),
+])
+def test_fallback_search_applies_breed_filter(admin_client, monkeypatch, query_string, expected_names):
+    monkeypatch.setattr(search, "has_search_index", lambda session: False)
+    assert search_names(admin_client, query_string) == expected_names
@@ -0,0 +1,44 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Configured application/server instance.
+from app import app
+# Server-side session revocation helpers.
+from sessions import revoke_user_sessions
+
+
+#######################################################
+########## SERVER-SIDE SESSION TEST CASES #############
+#######################################################
+
+
+# Helper function to build a fresh client presenting a copied session cookie.
+def client_with_cookie(cookie):
+    test_client = app.test_client()
+    test_client.set_cookie(cookie.key, cookie.value)
+    return test_client
+
+# Logging out deletes the session itself, so a copy of the old cookie no longer signs anyone in.
+def test_logout_deletes_server_side_session(admin_client):
+    cookie = admin_client.get_cookie(app.config["SESSION_COOKIE_NAME"])
+    assert client_with_cookie(cookie).get("/check_session").status_code == 200
+
+    assert admin_client.delete("/logout").status_code < 400
+    assert client_with_cookie(cookie).get("/check_session").status_code == 401
+
+# Revoking a user's sessions logs them out everywhere, and leaves other users signed in.
+def test_revoked_sessions_are_signed_out(admin_client, other_admin_client, adopter_client):
+    assert revoke_user_sessions([1]) == 2
+
+    assert admin_client.get("/check_session").status_code == 401
+    assert other_admin_client.get("/check_session").status_code == 401
+    assert adopter_client.get("/check_session").status_code == 200
+
+# Changing a user's admin flag updates the principal cached in their existing sessions.
+def test_user_changes_refresh_cached_sessions(admin_client, adopter_client):
+    assert adopter_client.get("/check_session").get_json()["is_admin"] is False
+
+    assert admin_client.patch("/api/users/2", json={"is_admin": True}).status_code == 200
+    assert adopter_client.get("/check_session").get_json()["is_admin"] is True
@@ -0,0 +1,56 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Test parametrization tools.
+import pytest
+
+# Configured application/server and database instances.
+from app import app
+from config import db
+# Relative access to dog and archive models.
+from models import Dog, DogArchive, AdoptionArchive
+# Archival cutoff helper.
+from archive import cutoff_before
+# SQLAlchemy statement construction tools.
+from sqlalchemy import select, update, func
+
+
+#######################################################
+########### SOFT DELETION TEST CASES ##################
+#######################################################
+
+
+# Soft-deleted dogs disappear from every catalog list and search.
+@pytest.mark.parametrize("url", ["/api/dogs", "/api/adopt", "/api/dogs/export"])
+def test_deleted_dog_is_hidden_from_lists(admin_client, url):
+    assert 2 in [dog["id"] for dog in admin_client.get(url).get_json()]
+    assert admin_client.delete("/api/dogs/2").status_code == 204
+    assert 2 not in [dog["id"] for dog in admin_client.get(url).get_json()]
+
+# Soft-deleted dogs are not found by search (in either index), detail, patch, or adoption routes.
+def test_deleted_dog_is_hidden_from_search_and_detail(admin_client):
+    assert admin_client.delete("/api/dogs/2").status_code == 204
+    for mode in ("prefix", "substring", "fuzzy"):
+        assert admin_client.get(f"/api/dogs/search?q=benji&mode={mode}").get_json()["results"] == []
+    assert admin_client.get("/api/dogs/2").status_code == 404
+    assert admin_client.patch("/api/dogs/2", json={"name": "Benji II"}).status_code == 404
+    assert admin_client.post("/api/users/2/adoptions", json={"dog_id": 2}).status_code == 404
+    assert admin_client.delete("/api/dogs/2").status_code == 404
+
+# The row is kept (so adoptions still reference it) until `archive-history` moves it out with its adoptions.
+def test_archive_history_moves_old_deleted_dogs(admin_client):
+    assert admin_client.post("/api/users/2/adoptions", json={"dog_id": 2}).status_code == 201
+    assert admin_client.delete("/api/dogs/2").status_code == 204
+    with app.app_context():
+        assert db.session.get(Dog, 2).deleted_at is not None
+        db.session.execute(update(Dog).where(Dog.id == 2).values(deleted_at=cutoff_before(31)))
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["archive-history"])
+    assert result.exit_code == 0, result.output
+    with app.app_context():
+        assert db.session.get(Dog, 2) is None
+        assert db.session.get(DogArchive, 2).name == "Benji"
+        assert db.session.scalar(select(func.count()).select_from(AdoptionArchive).where(AdoptionArchive.dog_id == 2)) == 1
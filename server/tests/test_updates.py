@@ -0,0 +1,124 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Test parametrization tools.
+import pytest
+
+# Configured application/server and database instances.
+from app import app
+from config import db
+# Relative access to dog and breed summary models.
+from models import Dog, BreedStats
+# Partial update helpers (patched to fail mid-transaction).
+import updates
+# SQL statement counting for requests.
+from instrumentation import count_queries
+# SQLAlchemy query construction tools.
+from sqlalchemy import select, func, case
+
+
+#######################################################
+########## DATABASE STATE HELPER FUNCTION(S) ##########
+#######################################################
+
+
+# Helper function to read every dog as `{id: (name, breed, is_adoptable)}`.
+def dog_rows():
+    with app.app_context():
+        return {row.id: (row.name, row.breed, row.is_adoptable)
+                for row in db.session.execute(select(Dog.id, Dog.name, Dog.breed, Dog.is_adoptable))}
+
+# Helper function to read the incrementally maintained breed summaries (skipping emptied breeds).
+def stored_breed_stats():
+    with app.app_context():
+        return {row.breed: (row.available_count, row.adopted_count)
+                for row in db.session.execute(select(BreedStats.breed, BreedStats.available_count, BreedStats.adopted_count))
+                if row.available_count or row.adopted_count}
+
+# Helper function to count live dogs per breed from scratch, as `flask rebuild-stats` would.
+def recounted_breed_stats():
+    with app.app_context():
+        return {row.breed: (row.available, row.adopted) for row in db.session.execute(
+            select(Dog.breed,
+                   func.sum(case((Dog.is_adoptable.is_(True), 1), else_=0)).label("available"),
+                   func.sum(case((Dog.is_adoptable.is_(True), 0), else_=1)).label("adopted"))
+            .where(Dog.deleted_at.is_(None))
+            .group_by(Dog.breed)
+        )}
+
+
+#######################################################
+############## PARTIAL UPDATE TEST CASES ##############
+#######################################################
+
+
+# A batch with any invalid item is rejected before any item is applied.
+@pytest.mark.parametrize("invalid_item", [
+    {"id": 2, "breed": ""},
+    {"id": 2, "is_adoptable": "yes"},
+    {"id": 2, "owner": "someone"},
+    {"id": 1, "name": "Twice"},
+    {"name": "No ID"},
+])
+def test_partially_invalid_batch_changes_nothing(admin_client, invalid_item):
+    before = dog_rows()
+    response = admin_client.patch("/api/dogs", json={"updates": [{"id": 1, "name": "Renamed"}, invalid_item]})
+    assert response.status_code == 400
+    assert dog_rows() == before
+
+# A batch failing after its `UPDATE` ran (e.g. while logging changes) is rolled back completely.
+def test_batch_failing_mid_transaction_rolls_back(admin_client, monkeypatch):
+    before, stats_before = dog_rows(), stored_breed_stats()
+
+    # Fail after the dogs and breed summaries were updated.
+    def fail_to_record_changes(session, changes):
+        raise RuntimeError("Change log unavailable.")
+
+    monkeypatch.setattr(updates, "record_changes", fail_to_record_changes)
+    with pytest.raises(RuntimeError):
+        admin_client.patch("/api/dogs", json={"updates": [{"id": 1, "breed": "Poodle"}, {"id": 2, "is_adoptable": False}]})
+    assert dog_rows() == before
+    assert stored_breed_stats() == stats_before
+
+# Unknown IDs are reported per item without failing the batch.
+def test_batch_reports_missing_dogs(admin_client):
+    response = admin_client.patch("/api/dogs", json={"updates": [{"id": 1, "name": "Renamed"}, {"id": 99, "name": "Nobody"}]})
+    assert response.status_code == 200
+    assert [result["status"] for result in response.get_json()["results"]] == ["updated", "not_found"]
+    assert dog_rows()[1][0] == "Renamed"
+
+# Breed summaries stay equal to a full recount through breed and adoptability changes.
+def test_breed_stats_follow_breed_changes(admin_client):
+    assert stored_breed_stats() == recounted_breed_stats()
+
+    assert admin_client.patch("/api/dogs/1", json={"breed": "Basenji"}).status_code == 200
+    assert stored_breed_stats() == recounted_breed_stats()
+
+    response = admin_client.patch("/api/dogs", json={"updates": [
+        {"id": 2, "breed": "Poodle", "is_adoptable": False},
+        {"id": 3, "breed": "Poodle"},
+        {"id": 5, "breed": "Beagle", "is_adoptable": True},
+        {"id": 4, "name": "Rex II"},
+    ]})
+    assert response.status_code == 200
+    assert stored_breed_stats() == recounted_breed_stats()
+    assert stored_breed_stats()["Poodle"] == (1, 1)
+
+    assert admin_client.post("/api/users/2/adoptions", json={"dog_id": 3}).status_code == 201
+    assert admin_client.delete("/api/dogs/5").status_code == 204
+    assert stored_breed_stats() == recounted_breed_stats()
+
+    # The stats route serves the same counts (and is not answered from a stale cache).
+    breeds = {entry["breed"]: entry for entry in admin_client.get("/api/stats").get_json()["breeds"]}
+    assert (breeds["Poodle"]["available"], breeds["Poodle"]["adopted"]) == (0, 2)
+
+# A breed's first dog creates its summary row with a single upsert (no `UPDATE`-then-`INSERT` race).
+def test_new_breed_summary_is_upserted(admin_client):
+    with count_queries() as counter:
+        response = admin_client.post("/api/dogs", json={"name": "Fifi", "breed": "Poodle"})
+    assert response.status_code == 201
+    statements = [statement for statement in counter.statements if "breed_stats" in statement.split("(")[0]]
+    assert len(statements) == 1 and "ON CONFLICT" in statements[0]
+    assert stored_breed_stats() == recounted_breed_stats()
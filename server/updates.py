@@ -0,0 +1,216 @@
+#######################################################
+############## IMPORTS AND INSTANTIATIONS #############
+#######################################################
+
+
+# Relative access to user and dog models.
+from models import User, Dog, normalize_username, live_criteria
+# Principal cache invalidation for Core user updates.
+from middleware import invalidate_principal
+# Server-side session refresh for Core user updates.
+from sessions import queue_session_refresh
+# Table version counters backing cached catalog responses.
+from caching import bump_table_versions
+# Incrementally maintained breed summaries.
+from stats import adjust_breed_stats, dog_breed_delta, merge_breed_deltas
+# Change log (outbox) behind the change feed.
+from changes import DOG as DOG_ENTITY, UPDATE, record_changes
+# Shared `IN`-clause chunking helper.
+from adoptions import chunked
+# SQLAlchemy Core statement construction tools.
+from sqlalchemy import case, literal, select, update
+
+
+#######################################################
+######### SINGLE-STATEMENT PARTIAL UPDATES ############
+#######################################################
+
+
+"""
+`PATCH` requests used to load the row as an ORM object, `setattr()` every
+payload key (including keys that are not columns), flush, and re-serialize.
+
+Partial updates are now compiled straight into SQL:
+
+    UPDATE dog_table
+    SET name = CASE id WHEN ? THEN ? WHEN ? THEN ? ELSE name END,
+        is_adoptable = ?
+    WHERE id IN (?, ?)
+    RETURNING id, name, breed, ...
+
+Only whitelisted fields are accepted (anything else is a `400`), values are
+type-checked before any SQL runs, a field set to the same value for every row
+becomes a plain assignment, and a batch of thousands of rows is one statement
+per `MAX_PATCH_BATCH_SIZE` rows. Rows that are not returned did not exist (or
+were soft-deleted).
+
+NOTE: Dog patches touching `breed` or `is_adoptable` first lock and read the
+      previous values (one `SELECT ... FOR UPDATE` per chunk) to move the rows
+      between breed summary counts.
+"""
+
+
+#######################################################
+########## PARTIAL UPDATE CONFIGURATION VALUES ########
+#######################################################
+
+
+# Per-item outcomes reported by batch patches.
+UPDATED = "updated"
+NOT_FOUND = "not_found"
+
+# Maximum number of rows compiled into a single `UPDATE`.
+# NOTE: Each row binds up to two parameters per patched field, so this keeps statements
+#       well under SQLite's bound-parameter limit.
+MAX_PATCH_BATCH_SIZE = 500
+
+
+#######################################################
+###### EXPORTABLE PARTIAL UPDATE UTILITY CLASSES ######
+#######################################################
+
+
+# Error raised when a patch payload names unknown fields or carries invalid values.
+class PatchValidationError(ValueError):
+    pass
+
+
+# Whitelist of patchable fields for a model, with value checks and derived columns.
+# NOTE: `fields` maps each field to `(expected type, description)`; `derived` maps a field to
+#       `{other column: function}` pairs recomputed from the new value (e.g. normalized usernames).
+class PatchableFields:
+    def __init__(self, model, fields, derived=None):
+        self.model = model
+        self.fields = fields
+        self.derived = derived or {}
+
+    # Validate one payload into `{column: value}` assignments.
+    def validate(self, payload):
+        if not isinstance(payload, dict):
+            raise PatchValidationError("Expected a JSON object of fields to update.")
+        unknown_fields = sorted(set(payload) - set(self.fields))
+        if unknown_fields:
+            raise PatchValidationError(f"Unknown or read-only field(s): {', '.join(unknown_fields)}. "
+                                       f"Updatable fields are: {', '.join(self.fields)}.")
+        if not payload:
+            raise PatchValidationError(f"Expected at least one of: {', '.join(self.fields)}.")
+
+        assignments = {}
+        for field, value in payload.items():
+            expected_type, description = self.fields[field]
+            if type(value) is not expected_type or (expected_type is str and not value.strip()):
+                raise PatchValidationError(f"Field `{field}` must be {description}.")
+            assignments[field] = value
+            for column_name, derive in self.derived.get(field, {}).items():
+                assignments[column_name] = derive(value)
+        return assignments
+
+
+# Patchable fields for dogs and users.
+DOG_PATCHABLE_FIELDS = PatchableFields(Dog, {
+    "name": (str, "a non-empty string"),
+    "breed": (str, "a non-empty string"),
+    "is_adoptable": (bool, "a boolean"),
+})
+USER_PATCHABLE_FIELDS = PatchableFields(User, {
+    "username": (str, "a non-empty string"),
+    "is_admin": (bool, "a boolean"),
+}, derived={"username": {"username_normalized": normalize_username}})
+
+
+#######################################################
+##### EXPORTABLE PARTIAL UPDATE UTILITY FUNCTIONS #####
+#######################################################
+
+
+# Helper function to validate a batch payload into `{id: {column: value}}`, in input order.
+# NOTE: Each item is `{"id": ..., <fields>...}`; errors name the offending item's index.
+def parse_patch_items(patchable, items):
+    if not isinstance(items, list) or not items:
+        raise PatchValidationError("Expected `updates` to be a non-empty list.")
+    assignments_by_id = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or type(item.get("id")) is not int:
+            raise PatchValidationError(f"Item {index}: expected an object with an integer `id`.")
+        if item["id"] in assignments_by_id:
+            raise PatchValidationError(f"Item {index}: duplicate `id` {item['id']}.")
+        try:
+            assignments_by_id[item["id"]] = patchable.validate({key: value for key, value in item.items() if key != "id"})
+        except PatchValidationError as error:
+            raise PatchValidationError(f"Item {index}: {error}") from None
+    return assignments_by_id
+
+# Helper function to compile `{id: {column: value}}` into one `UPDATE` over those rows.
+# NOTE: A column given the same value for every row is assigned directly; otherwise a
+#       `CASE id WHEN ... END` picks each row's value and leaves rows that omit it unchanged.
+def compile_patch(model, assignments_by_id):
+    table = model.__table__
+    values = {}
+    for column_name in sorted({name for assignments in assignments_by_id.values() for name in assignments}):
+        column = table.c[column_name]
+        new_values = {row_id: assignments[column_name] for row_id, assignments in assignments_by_id.items()
+                      if column_name in assignments}
+        distinct_values = {(type(value), value) for value in new_values.values()}
+        if len(new_values) == len(assignments_by_id) and len(distinct_values) == 1:
+            values[column_name] = next(iter(new_values.values()))
+        else:
+            values[column_name] = case({row_id: literal(value, column.type) for row_id, value in new_values.items()},
+                                       value=table.c.id, else_=column)
+    return (update(model)
+            .where(table.c.id.in_(list(assignments_by_id)), *live_criteria(model))
+            .values(values)
+            .execution_options(synchronize_session=False))
+
+# Apply validated patches in `MAX_PATCH_BATCH_SIZE` chunks, returning `{id: returned row}` for rows that exist.
+def apply_patches(session, model, assignments_by_id, returning):
+    returned_rows = {}
+    for chunk in chunked(list(assignments_by_id), MAX_PATCH_BATCH_SIZE):
+        statement = compile_patch(model, {row_id: assignments_by_id[row_id] for row_id in chunk})
+        for row in session.execute(statement.returning(model.id, *returning)):
+            returned_rows[row[0]] = row[1:]
+    return returned_rows
+
+# Patch many dogs inside the caller's transaction, keeping breed summaries and cache versions current.
+# NOTE: Returns `{id: serialized dog}` for the dogs that exist; the caller commits.
+def patch_dogs(session, assignments_by_id, serializer):
+    # STEP 1: Lock and read previous breed/availability when the patch can move dogs between summary counts.
+    previous_rows = {}
+    if any("breed" in assignments or "is_adoptable" in assignments for assignments in assignments_by_id.values()):
+        for chunk in chunked(list(assignments_by_id)):
+            previous_rows.update((row.id, row) for row in session.execute(
+                select(Dog.id, Dog.breed, Dog.is_adoptable).where(Dog.id.in_(chunk)).with_for_update()
+            ))
+
+    # STEP 2: Apply every patch with one `UPDATE ... RETURNING` per chunk.
+    returned_rows = apply_patches(session, Dog, assignments_by_id, (Dog.breed, Dog.is_adoptable, *serializer.columns))
+    if not returned_rows:
+        return {}
+
+    # STEP 3: Move patched dogs between breed summary counts, log the changes, and invalidate cached catalog responses.
+    if previous_rows:
+        adjust_breed_stats(session, merge_breed_deltas(*(
+            merge_breed_deltas(dog_breed_delta(previous_rows[dog_id].breed, previous_rows[dog_id].is_adoptable, -1),
+                               dog_breed_delta(row[0], row[1]))
+            for dog_id, row in returned_rows.items()
+        )))
+    record_changes(session, [(DOG_ENTITY, UPDATE, dog_id, {"id": dog_id, **assignments_by_id[dog_id]})
+                             for dog_id in returned_rows])
+    bump_table_versions(session, Dog)
+    return {dog_id: serializer.serialize_row(row[2:]) for dog_id, row in returned_rows.items()}
+
+# Patch many users inside the caller's transaction, refreshing cached principals and sessions on commit.
+# NOTE: Returns `{id: serialized user}` for the users that exist; the caller commits.
+def patch_users(session, assignments_by_id, serializer):
+    returned_rows = apply_patches(session, User, assignments_by_id, (User.username, User.is_admin, *serializer.columns))
+    for user_id, row in returned_rows.items():
+        invalidate_principal(session, user_id)
+        queue_session_refresh(session, user_id, row[0], row[1])
+    if returned_rows:
+        bump_table_versions(session, User)
+    return {user_id: serializer.serialize_row(row[2:]) for user_id, row in returned_rows.items()}
+
+# Helper function to report batch outcomes in input order.
+def patch_results(assignments_by_id, serialized_rows, key):
+    return [{"index": index, "id": row_id, "status": UPDATED if row_id in serialized_rows else NOT_FOUND,
+             **({key: serialized_rows[row_id]} if row_id in serialized_rows else {})}
+            for index, row_id in enumerate(assignments_by_id)]